@@ -0,0 +1,75 @@
+import timeit
+
+import numpy as np
+
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator, EuclideanDistanceField
+
+
+def norm_distance(x, y) -> float:
+    # EuclideanDistanceCalculator.distance before the scalar path was added
+    return np.linalg.norm(np.asarray(x) - np.asarray(y))
+
+
+def norm_distances(state, players) -> list:
+
+    beacons = [beacon for beacon in [state.nw_beacon, state.ne_beacon, state.sw_beacon, state.se_beacon]
+               if beacon is not None]
+
+    return [(norm_distance(player, state.key), norm_distance(player, state.lock),
+             min(norm_distance(player, beacon) for beacon in beacons)) for player in players]
+
+
+def report(name: str, seconds: float, num_calls: int):
+    print("{:<45} {:10.3f} us/call".format(name, 1e6 * seconds / num_calls))
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+    initial_state = GridWorldBuilder.create(params).initial_state
+
+    num_calls = 100000
+
+    report("distance, np.linalg.norm",
+           timeit.timeit(lambda: norm_distance((1, 4), (7, 5)), number=num_calls), num_calls)
+    report("distance, scalar arithmetic",
+           timeit.timeit(lambda: EuclideanDistanceCalculator.distance((1, 4), (7, 5)), number=num_calls), num_calls)
+
+    distance_field = EuclideanDistanceField(initial_state)
+
+    report("key, lock, beacon distances, np.linalg.norm",
+           timeit.timeit(lambda: norm_distances(initial_state, [initial_state.player]), number=num_calls), num_calls)
+    report("key, lock, beacon distances, distance field",
+           timeit.timeit(lambda: distance_field.distances(initial_state), number=num_calls), num_calls)
+
+    players = np.stack([np.arange(10).repeat(10), np.tile(np.arange(10), 10)], axis=1)
+    players = players[[tuple(player) not in [initial_state.key, initial_state.lock] for player in players]]
+    num_batch_calls = 1000
+    key_is_present = np.ones(players.shape[0], dtype=bool)
+
+    print("")
+    print("batches of {} players".format(players.shape[0]))
+
+    report("batch distances, np.linalg.norm per player",
+           timeit.timeit(lambda: norm_distances(initial_state, players), number=num_batch_calls), num_batch_calls)
+    report("batch distances, calculator distances_from",
+           timeit.timeit(lambda: EuclideanDistanceCalculator(initial_state).distances_from(players),
+                         number=num_batch_calls), num_batch_calls)
+    report("batch distances, distance field distances_from",
+           timeit.timeit(lambda: distance_field.distances_from(players, key_is_present, key_is_present),
+                         number=num_batch_calls), num_batch_calls)
+
+    states = TabularTransitionModel.compile(initial_state).states
+    env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+
+    print("")
+    print("{} reachable states".format(len(states)))
+
+    report("uncached distance observation per state",
+           timeit.timeit(lambda: [env_wrapper._calculate_observation(state) for state in states], number=10),
+           10 * len(states))
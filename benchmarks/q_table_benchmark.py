@@ -0,0 +1,72 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldActionSpace
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+from example.agents.q_table import ArrayQTable
+
+
+def create_observations(num_observations: int, seed=0) -> list:
+    # distance observations as produced by DistanceObservationWrapper followed by TupleObservationWrapper
+    random_state = np.random.RandomState(seed)
+    return [tuple(observation) for observation in random_state.uniform(0, 15, size=(num_observations, 17))]
+
+
+def create_agent(q_table=None) -> QLearningAgent:
+    return QLearningAgent(GridWorldActionSpace(), EpsGreedy(0.1), discount_factor=1, q_table=q_table)
+
+
+def measure_memory(q_table_factory, observations: list) -> int:
+
+    tracemalloc.start()
+
+    agent = create_agent(q_table_factory())
+    for observation in observations:
+        agent.init_state(observation)
+
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return memory
+
+
+def measure_update_throughput(q_table_factory, observations: list, num_updates: int, seed=0) -> float:
+
+    agent = create_agent(q_table_factory())
+    for observation in observations:
+        agent.init_state(observation)
+
+    random_state = np.random.RandomState(seed)
+    prev_indices = random_state.randint(0, len(observations), size=num_updates)
+    curr_indices = random_state.randint(0, len(observations), size=num_updates)
+    actions = random_state.randint(0, agent.num_actions, size=num_updates)
+
+    start_time = time.perf_counter()
+
+    for prev_index, curr_index, action in zip(prev_indices, curr_indices, actions):
+        agent.update(observations[prev_index], action, observations[curr_index], -10)
+
+    return num_updates / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+
+    num_observations = 50000
+    num_updates = 200000
+
+    observations = create_observations(num_observations)
+
+    q_table_factories = {
+        "dict": lambda: None,
+        "array": lambda: ArrayQTable(GridWorldActionSpace().n)
+    }
+
+    print("{} observations, {} updates".format(num_observations, num_updates))
+
+    for name, q_table_factory in q_table_factories.items():
+        memory = measure_memory(q_table_factory, observations)
+        throughput = measure_update_throughput(q_table_factory, observations, num_updates)
+        print("{:>6} q table: {:8.2f} MiB {:10.0f} updates/sec".format(name, memory / 2 ** 20, throughput))
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+from clgridworld.visualizer.cached_grid_visualizer import CachedGridVisualizer
+from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
+from clgridworld.visualizer.rgb_grid_visualizer import RgbGridVisualizer, tile_table, CHARS
+
+
+def measure_frames_per_second(render, states) -> float:
+
+    start_time = time.perf_counter()
+
+    for state in states:
+        render(state)
+
+    return len(states) / (time.perf_counter() - start_time)
+
+
+def render_rgb_per_cell(state) -> np.ndarray:
+    """Baseline image drawn cell by cell in python."""
+
+    grid = GridStateVisualizer(state).grid
+    tiles = tile_table()
+    tile_size = tiles.shape[1]
+
+    image = np.empty((grid.shape[0] * tile_size, grid.shape[1] * tile_size, 3), dtype=np.uint8)
+
+    for row in range(grid.shape[0]):
+        for col in range(grid.shape[1]):
+            image[row * tile_size:(row + 1) * tile_size, col * tile_size:(col + 1) * tile_size] = tiles[
+                CHARS[grid[row, col]]]
+
+    return image
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+
+    env = GridWorldBuilder.create(params)
+    actions = np.random.RandomState(0).randint(0, len(GridWorldAction.NAMES), size=20000).tolist()
+
+    states = [env.reset()]
+
+    for action in actions:
+        state, _, done, _ = env.step(action)
+        states.append(env.reset() if done else state)
+
+    # frames written to an in memory stream so terminal speed is not measured
+    stream = io.StringIO()
+
+    with contextlib.redirect_stdout(stream):
+        rebuilt_fps = measure_frames_per_second(GridWorldBuilder.render, states)
+
+    print("GridWorldBuilder.render:                       {:10.0f} frames/sec".format(rebuilt_fps))
+
+    for frames_per_write in [1, 100]:
+        visualizer = CachedGridVisualizer(env.initial_state, stream=stream, frames_per_write=frames_per_write)
+        cached_fps = measure_frames_per_second(visualizer.render, states)
+        print("CachedGridVisualizer, {:3d} frames per write:    {:10.0f} frames/sec".format(frames_per_write,
+                                                                                          cached_fps))
+
+    per_cell_fps = measure_frames_per_second(render_rgb_per_cell, states[:2000])
+    print("rgb_array, per cell python loop:               {:10.0f} frames/sec".format(per_cell_fps))
+
+    rgb_visualizer = RgbGridVisualizer(env.initial_state)
+    rgb_fps = measure_frames_per_second(rgb_visualizer.image, states)
+    print("rgb_array, RgbGridVisualizer.image:            {:10.0f} frames/sec".format(rgb_fps))
+
+    num_envs = 4096
+    batch_state = BatchGridWorldState.from_states(states[:num_envs])
+    out = np.empty((num_envs, 80, 80, 3), dtype=np.uint8)
+
+    start_time = time.perf_counter()
+
+    for _ in range(10):
+        RgbGridVisualizer.batch_images(batch_state, out=out)
+
+    batch_fps = 10 * num_envs / (time.perf_counter() - start_time)
+    print("rgb_array, batch_images of {} states:        {:10.0f} frames/sec".format(num_envs, batch_fps))
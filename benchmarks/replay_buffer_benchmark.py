@@ -0,0 +1,90 @@
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.replay.replay_buffer import ReplayBuffer
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+
+
+def measure(function):
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+
+    result = function()
+
+    seconds = time.perf_counter() - start_time
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, seconds, peak_bytes
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+
+    env = GridWorldBuilder.create(params)
+    encoder = GridWorldStateEncoder(env.initial_state)
+
+    num_transitions = 200000
+    batch_size = 64
+    num_batches = 1000
+
+    actions = np.random.RandomState(0).randint(0, len(GridWorldAction.NAMES), size=num_transitions).tolist()
+    transitions = []
+
+    state = env.reset()
+
+    for action in actions:
+        next_state, reward, done, _ = env.step(action)
+        transitions.append((state, action, next_state, reward, done))
+        state = env.reset() if done else next_state
+
+    def fill_list():
+        # transitions copied to new tuples so the list owns them, as when collected during training
+        return [(s.copy(), a, n.copy(), r, d) for s, a, n, r, d in transitions]
+
+    def fill_buffer():
+        buffer = ReplayBuffer.for_state_ids(num_transitions, encoder.num_states)
+        for s, a, n, r, d in transitions:
+            buffer.add(encoder.encode(s), a, r, encoder.encode(n), d)
+        return buffer
+
+    replay_list, list_seconds, list_bytes = measure(fill_list)
+    buffer, buffer_seconds, buffer_bytes = measure(fill_buffer)
+
+    print("list of tuples: {:8.1f} bytes/transition, {:10.0f} inserts/sec".format(
+        list_bytes / num_transitions, num_transitions / list_seconds))
+    print("ReplayBuffer:   {:8.1f} bytes/transition, {:10.0f} inserts/sec (including encoding)".format(
+        buffer_bytes / num_transitions, num_transitions / buffer_seconds))
+
+    start_time = time.perf_counter()
+    for _ in range(num_batches):
+        batch = random.choices(replay_list, k=batch_size)
+    list_sample_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(num_batches):
+        batch = buffer.sample(batch_size)
+    buffer_sample_seconds = time.perf_counter() - start_time
+
+    print("sampling {} transitions, list: {:8.0f} batches/sec, ReplayBuffer: {:8.0f} batches/sec".format(
+        batch_size, num_batches / list_sample_seconds, num_batches / buffer_sample_seconds))
+
+    prioritized_buffer = ReplayBuffer.for_state_ids(num_transitions, encoder.num_states, priority_exponent=0.6)
+    prioritized_buffer.add_batch(buffer.states, buffer.actions, buffer.rewards, buffer.next_states, buffer.dones)
+
+    start_time = time.perf_counter()
+    for _ in range(num_batches):
+        batch = prioritized_buffer.sample_prioritized(batch_size)
+        prioritized_buffer.update_priorities(batch.indices, np.random.random(batch_size))
+    prioritized_seconds = time.perf_counter() - start_time
+
+    print("prioritized sample + priority update:    {:8.0f} batches/sec".format(num_batches / prioritized_seconds))
@@ -0,0 +1,66 @@
+import time
+import timeit
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.instrumentation.predicate_counter import PredicateCounter
+from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+
+def measure_steps_per_second(env, num_steps: int, seed=0) -> float:
+
+    actions = np.random.RandomState(seed).randint(0, len(GridWorldAction.NAMES), size=num_steps).tolist()
+
+    env.reset()
+    start_time = time.perf_counter()
+
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+
+    return num_steps / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+
+    num_steps = 200000
+
+    # without the transition cache every step runs the dynamics, reward function and terminal state check
+    uncached_env = GridWorldBuilder.create(params, cache_capacity=0)
+    cached_env = GridWorldBuilder.create(params)
+
+    print("uncached GridWorld.step: {:10.0f} steps/sec".format(measure_steps_per_second(uncached_env, num_steps)))
+    print("cached GridWorld.step:   {:10.0f} steps/sec".format(measure_steps_per_second(cached_env, num_steps)))
+
+    state = uncached_env.initial_state
+    num_calls = 200000
+    copy_seconds = timeit.timeit(lambda: state.copy(player=(2, 4)), number=num_calls)
+
+    print("GridWorldState.copy:     {:10.3f} us/call".format(1e6 * copy_seconds / num_calls))
+
+    # done evaluated by the original per state predicates instead of the task's terminal state mask
+    validator_env = GridWorldBuilder.create(params, cache_capacity=0)
+    validator_env.terminal_state_validator = TerminalStateValidator
+
+    print("uncached GridWorld.step with TerminalStateValidator: {:10.0f} steps/sec".format(
+        measure_steps_per_second(validator_env, num_steps)))
+
+    num_counted_steps = 10000
+
+    for name, env in [("GridWorld", uncached_env),
+                      ("DistanceObservationWrapper", DistanceObservationWrapper(uncached_env, cache_capacity=0))]:
+
+        with PredicateCounter() as counter:
+            measure_steps_per_second(env, num_counted_steps)
+
+        print()
+        print("predicate calls, uncached " + name)
+        print(counter.report(num_counted_steps))
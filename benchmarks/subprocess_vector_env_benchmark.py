@@ -0,0 +1,63 @@
+import os
+import time
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.vector.subprocess_vector_env import SubprocessVectorEnv
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+
+def measure_serial_steps_per_second(params_list, actions) -> float:
+
+    envs = [DistanceObservationWrapper(GridWorldBuilder.create(params)) for params in params_list]
+
+    for env in envs:
+        env.reset()
+
+    start_time = time.perf_counter()
+
+    for step_actions in actions:
+        for env, action in zip(envs, step_actions.tolist()):
+            _, _, done, _ = env.step(action)
+            if done:
+                env.reset()
+
+    return actions.size / (time.perf_counter() - start_time)
+
+
+def measure_vector_steps_per_second(params_list, actions, num_workers) -> float:
+
+    with SubprocessVectorEnv(params_list, num_workers=num_workers) as vector_env:
+
+        vector_env.reset()
+        start_time = time.perf_counter()
+
+        for step_actions in actions:
+            vector_env.step(step_actions)
+
+        return actions.size / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+
+    num_steps = 2000
+    num_cpus = os.cpu_count()
+
+    for num_envs in [8, 64, 256]:
+
+        params_list = [params] * num_envs
+        actions = np.random.RandomState(0).randint(0, len(GridWorldAction.NAMES), size=(num_steps, num_envs))
+
+        serial = measure_serial_steps_per_second(params_list, actions)
+        print("{:4d} envs serial:              {:>10,.0f} env steps/sec".format(num_envs, serial))
+
+        for num_workers in sorted({1, num_cpus}):
+            vector = measure_vector_steps_per_second(params_list, actions, num_workers)
+            print("{:4d} envs {:3d} worker processes: {:>10,.0f} env steps/sec ({:.2f}x)".format(
+                num_envs, num_workers, vector, vector / serial))
@@ -0,0 +1,379 @@
+import argparse
+import gc
+import itertools
+import json
+import re
+import sys
+import time
+import tracemalloc
+from typing import NamedTuple, Tuple, List, Dict, Callable, Optional, Sequence
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world import GridWorld
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrapper
+from example.agent_trainer import AgentTrainer
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+
+# target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017, other tasks drop the key or the pit
+_TARGET_TASK = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                  pit_end=(4, 7))
+
+TASKS = {
+    "target": _TARGET_TASK,
+    "no_key": _TARGET_TASK._replace(key=None),
+    "no_pit": _TARGET_TASK._replace(pit_start=None, pit_end=None),
+}
+
+SHAPES = [(5, 5), (10, 10), (50, 50), (500, 500)]
+
+SEED = 0
+
+# random actions cycled through by the step scenarios
+NUM_ACTIONS = 20000
+
+
+def task_params(task: str, shape: Tuple[int, int]) -> InitialStateParams:
+    """The task's 10x10 layout with every coordinate scaled to shape."""
+
+    params = TASKS[task]
+    num_rows, num_cols = shape
+
+    def scale(coords):
+        return None if coords is None else (coords[0] * (num_rows - 1) // 9, coords[1] * (num_cols - 1) // 9)
+
+    return InitialStateParams(shape=shape, player=scale(params.player), key=scale(params.key),
+                              lock=scale(params.lock), pit_start=scale(params.pit_start),
+                              pit_end=scale(params.pit_end))
+
+
+def random_actions(seed: int = SEED, num_actions: int = NUM_ACTIONS) -> List[int]:
+    return np.random.RandomState(seed).randint(0, len(GridWorldAction.NAMES), size=num_actions).tolist()
+
+
+def random_walk(env, num_steps: int, seed: int = SEED) -> List:
+    """Observations of a random walk through env, resetting when done."""
+
+    observations = [env.reset()]
+
+    for action in random_actions(seed, num_steps):
+        observation, _, done, _ = env.step(action)
+        observations.append(env.reset() if done else observation)
+
+    return observations
+
+
+class Scenario(NamedTuple):
+    """A reproducible benchmark.
+
+    setup is called before each measurement and returns a function that runs the given number of operations, so
+    state such as caches starts empty for every measurement.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[int], None]]
+    num_ops: int
+    ops_per_sample: int = 100
+    unit: str = "op"
+
+
+class BenchmarkResult(NamedTuple):
+    """Throughput over all operations, latency percentiles over samples of ops_per_sample operations and the peak
+    memory allocated while running them, on top of what setup allocated."""
+
+    name: str
+    unit: str
+    num_ops: int
+    ops_per_second: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    peak_memory_bytes: int
+
+
+class Regression(NamedTuple):
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def _step_scenario(params: InitialStateParams, cache_capacity: int) -> Callable[[int], None]:
+
+    env = GridWorldBuilder.create(params, cache_capacity=cache_capacity)
+    actions = itertools.cycle(random_actions())
+
+    env.reset()
+
+    def run(num_ops: int) -> None:
+
+        step = env.step
+        reset = env.reset
+
+        for action in itertools.islice(actions, num_ops):
+            if step(action)[2]:
+                reset()
+
+    return run
+
+
+def _distance_observation_scenario(params: InitialStateParams, cache_capacity: int) -> Callable[[int], None]:
+
+    env = DistanceObservationWrapper(GridWorldBuilder.create(params), cache_capacity=cache_capacity)
+    states = itertools.cycle(random_walk(env.env, NUM_ACTIONS))
+
+    def run(num_ops: int) -> None:
+
+        observation = env.observation
+
+        for state in itertools.islice(states, num_ops):
+            observation(state)
+
+    return run
+
+
+def _q_update_scenario(params: InitialStateParams) -> Callable[[int], None]:
+
+    env = TupleObservationWrapper(DistanceObservationWrapper(GridWorldBuilder.create(params)))
+    agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1, seed=SEED)
+
+    observations = random_walk(env, NUM_ACTIONS)
+    transitions = itertools.cycle(list(zip(observations[:-1], random_actions(), observations[1:],
+                                           np.random.RandomState(SEED).choice([-10, 500, 1000, -200], NUM_ACTIONS)
+                                           .tolist())))
+
+    # states are added to the q table on first update, as in training
+    def run(num_ops: int) -> None:
+
+        update = agent.update
+
+        for prev_state, action, curr_state, reward in itertools.islice(transitions, num_ops):
+            agent.init_state(prev_state)
+            update(prev_state, action, curr_state, reward)
+
+    return run
+
+
+def _trainer_scenario(params: InitialStateParams, max_steps_per_episode: int) -> Callable[[int], None]:
+
+    env = TupleObservationWrapper(DistanceObservationWrapper(GridWorldBuilder.create(params)))
+    agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1, seed=SEED)
+    trainer = AgentTrainer(env, agent)
+
+    def run(num_ops: int) -> None:
+        trainer.train(SEED, num_episodes=num_ops, max_steps_per_episode=max_steps_per_episode, headless=True)
+
+    return run
+
+
+def default_scenarios() -> List[Scenario]:
+
+    scenarios = []
+
+    def shape_name(shape):
+        return "%dx%d" % shape
+
+    for task, shape in itertools.product(TASKS, SHAPES):
+
+        params = task_params(task, shape)
+        suffix = "/%s/%s" % (task, shape_name(shape))
+
+        scenarios.append(Scenario("grid_world.step" + suffix,
+                                  lambda params=params: _step_scenario(params, GridWorld.DEFAULT_CACHE_CAPACITY),
+                                  num_ops=50000, unit="step"))
+        scenarios.append(Scenario("distance_observation" + suffix,
+                                  lambda params=params: _distance_observation_scenario(
+                                      params, DistanceObservationWrapper.DEFAULT_CACHE_CAPACITY),
+                                  num_ops=20000, unit="observation"))
+
+    for shape in SHAPES:
+
+        params = task_params("target", shape)
+        suffix = "/target/%s" % shape_name(shape)
+
+        scenarios.append(Scenario("grid_world.step.uncached" + suffix,
+                                  lambda params=params: _step_scenario(params, 0), num_ops=20000, unit="step"))
+        scenarios.append(Scenario("distance_observation.uncached" + suffix,
+                                  lambda params=params: _distance_observation_scenario(params, 0), num_ops=5000,
+                                  unit="observation"))
+        scenarios.append(Scenario("q_learning.update" + suffix, lambda params=params: _q_update_scenario(params),
+                                  num_ops=50000, unit="update"))
+
+    scenarios.append(Scenario("agent_trainer.train/target/10x10",
+                              lambda: _trainer_scenario(task_params("target", (10, 10)), max_steps_per_episode=200),
+                              num_ops=20, ops_per_sample=1, unit="episode"))
+
+    return scenarios
+
+
+def run_scenario(scenario: Scenario, num_ops: int = None, measure_memory: bool = True) -> BenchmarkResult:
+
+    num_ops = scenario.num_ops if num_ops is None else num_ops
+    ops_per_sample = min(scenario.ops_per_sample, num_ops)
+    num_samples = max(num_ops // ops_per_sample, 1)
+    num_ops = num_samples * ops_per_sample
+
+    run = scenario.setup()
+
+    # warm up on its own setup so the measured run starts from empty caches
+    scenario.setup()(ops_per_sample)
+
+    sample_seconds = np.zeros(num_samples)
+    perf_counter = time.perf_counter
+
+    gc.collect()
+
+    for i in range(num_samples):
+        start_time = perf_counter()
+        run(ops_per_sample)
+        sample_seconds[i] = perf_counter() - start_time
+
+    latencies_us = sample_seconds / ops_per_sample * 1e6
+    p50_us, p90_us, p99_us = np.percentile(latencies_us, [50, 90, 99])
+
+    peak_memory_bytes = _measure_peak_memory(scenario, num_ops) if measure_memory else 0
+
+    return BenchmarkResult(scenario.name, scenario.unit, num_ops, num_ops / sample_seconds.sum(), float(p50_us),
+                           float(p90_us), float(p99_us), peak_memory_bytes)
+
+
+def _measure_peak_memory(scenario: Scenario, num_ops: int) -> int:
+    """Measured in a separate run as tracing allocations slows every operation down."""
+
+    run = scenario.setup()
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        run(num_ops)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return max(peak_bytes - start_bytes, 0)
+
+
+def run_scenarios(scenarios: Sequence[Scenario], num_ops: int = None, measure_memory: bool = True,
+                  log: Callable[[BenchmarkResult], None] = None) -> List[BenchmarkResult]:
+
+    results = []
+
+    for scenario in scenarios:
+
+        result = run_scenario(scenario, num_ops, measure_memory)
+        results.append(result)
+
+        if log is not None:
+            log(result)
+
+    return results
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return "{:<50} {:>12,.0f} {:<19} p50 {:>9.2f} us  p90 {:>9.2f} us  p99 {:>9.2f} us  peak {:>10,.0f} KiB".format(
+        result.name, result.ops_per_second, result.unit + "s/sec", result.p50_us, result.p90_us, result.p99_us,
+        result.peak_memory_bytes / 1024)
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str) -> None:
+
+    with open(path, "w") as file:
+        json.dump({"results": [result._asdict() for result in results]}, file, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, BenchmarkResult]:
+
+    with open(path) as file:
+        baseline = json.load(file)
+
+    return {result["name"]: BenchmarkResult(**result) for result in baseline["results"]}
+
+
+# peak memory changes below this are ignored, small allocations vary between runs
+MEMORY_TOLERANCE_BYTES = 64 * 1024
+
+
+def compare(results: Sequence[BenchmarkResult], baseline: Dict[str, BenchmarkResult],
+            threshold: float = 0.1) -> List[Regression]:
+    """Scenarios whose throughput dropped, or whose median latency or peak memory grew, by more than threshold.
+    Scenarios missing from the baseline are skipped."""
+
+    regressions = []
+
+    for result in results:
+
+        base = baseline.get(result.name)
+
+        if base is None:
+            continue
+
+        if result.ops_per_second < base.ops_per_second * (1 - threshold):
+            regressions.append(Regression(result.name, "ops_per_second", base.ops_per_second, result.ops_per_second))
+
+        if result.p50_us > base.p50_us * (1 + threshold):
+            regressions.append(Regression(result.name, "p50_us", base.p50_us, result.p50_us))
+
+        if result.peak_memory_bytes > base.peak_memory_bytes * (1 + threshold) + MEMORY_TOLERANCE_BYTES:
+            regressions.append(Regression(result.name, "peak_memory_bytes", base.peak_memory_bytes,
+                                          result.peak_memory_bytes))
+
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description="Runs the benchmark scenarios, optionally saving the results as a "
+                                                 "baseline or comparing them to one. Exits with 1 on regressions.")
+    parser.add_argument("--filter", default=None, help="only run scenarios whose name matches this regex")
+    parser.add_argument("--num-ops", type=int, default=None, help="operations per scenario, overrides the default")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory run")
+    parser.add_argument("--list", action="store_true", help="list the scenario names and exit")
+    parser.add_argument("--save", default=None, metavar="PATH", help="save the results as a baseline")
+    parser.add_argument("--compare", default=None, metavar="PATH", help="compare the results to a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change counted as a regression, default 0.1")
+
+    args = parser.parse_args(argv)
+
+    scenarios = default_scenarios()
+
+    if args.filter is not None:
+        pattern = re.compile(args.filter)
+        scenarios = [scenario for scenario in scenarios if pattern.search(scenario.name)]
+
+    if args.list:
+        print("\n".join(scenario.name for scenario in scenarios))
+        return 0
+
+    results = run_scenarios(scenarios, args.num_ops, not args.no_memory, lambda result: print(format_result(result)))
+
+    if args.save is not None:
+        save_baseline(results, args.save)
+
+    if args.compare is None:
+        return 0
+
+    regressions = compare(results, load_baseline(args.compare), args.threshold)
+
+    for regression in regressions:
+        print("REGRESSION {:<50} {:<18} {:>14,.2f} -> {:>14,.2f} ({:+.1%})".format(
+            regression.name, regression.metric, regression.baseline, regression.current, regression.change))
+
+    print("{} regressions beyond {:.0%}".format(len(regressions), args.threshold))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
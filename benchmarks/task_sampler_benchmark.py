@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from clgridworld.generator.task_sampler import TaskSampler
+from clgridworld.grid_world_builder import InitialStateParams
+from clgridworld.state.state_factory import GridWorldStateFactory
+
+
+def sample_by_rejection(shape, num_tasks: int, seed=0) -> (list, int):
+    # candidate layouts drawn independently and rejected when GridWorldStateFactory.create raises
+    rng = np.random.RandomState(seed)
+    num_rows, num_cols = shape
+
+    def random_coords():
+        return int(rng.randint(num_rows)), int(rng.randint(num_cols))
+
+    tasks = []
+    num_rejected = 0
+
+    while len(tasks) < num_tasks:
+
+        pit_start = random_coords()
+        pit_end = (int(rng.randint(pit_start[0], num_rows)), int(rng.randint(pit_start[1], num_cols)))
+        params = InitialStateParams(shape, random_coords(), random_coords(), random_coords(), pit_start, pit_end)
+
+        try:
+            GridWorldStateFactory.create(*params)
+            tasks.append(params)
+        except ValueError:
+            num_rejected += 1
+
+    return tasks, num_rejected
+
+
+if __name__ == '__main__':
+
+    shape = (10, 10)
+    num_tasks = 100000
+
+    start_time = time.perf_counter()
+    _, num_rejected = sample_by_rejection(shape, num_tasks)
+    seconds = time.perf_counter() - start_time
+
+    print("exception driven rejection: {:10.0f} tasks/sec, {:8d} rejected".format(num_tasks / seconds, num_rejected))
+
+    sampler = TaskSampler(shape, seed=0)
+
+    for _ in range(10):
+        sampler.sample(num_tasks // 10)
+
+    stats = sampler.stats()
+
+    print("TaskSampler:                {:10.0f} tasks/sec, {:8d} rejected".format(stats.tasks_per_second,
+                                                                                 stats.num_rejected))
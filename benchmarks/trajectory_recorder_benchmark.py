@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.trajectory.trajectory_store import TrajectoryReader
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.trajectory_recorder_wrapper import TrajectoryRecorderWrapper
+from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrapper
+from example.agent_trainer import AgentTrainer
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+
+
+def measure_step_seconds(env, actions) -> float:
+
+    env.reset()
+    start_time = time.perf_counter()
+
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+
+    seconds = time.perf_counter() - start_time
+    env.close()
+
+    return seconds / len(actions)
+
+
+def measure_training_seconds(env, num_episodes=200, max_steps_per_episode=5000) -> float:
+    """Seconds per step of headless q learning on distance observations, as in example.agents.q_learning_agent."""
+
+    env = TupleObservationWrapper(DistanceObservationWrapper(env))
+    agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1)
+
+    start_time = time.perf_counter()
+    stats = AgentTrainer(env, agent).train(num_episodes=num_episodes, max_steps_per_episode=max_steps_per_episode,
+                                           headless=True)
+
+    return (time.perf_counter() - start_time) / stats.episodic_steps.sum()
+
+
+if __name__ == '__main__':
+
+    # target task spec as defined in Source Task Sequencing,,, Narvekar et al 2017
+    params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                pit_end=(4, 7))
+
+    actions = np.random.RandomState(0).randint(0, len(GridWorldAction.NAMES), size=500000).tolist()
+    num_repeats = 10
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def recorder(name):
+            return TrajectoryRecorderWrapper(GridWorldBuilder.create(params), os.path.join(directory, name))
+
+        # best of several runs, plain and recorded runs alternate so both see the same machine load
+        step_seconds = [(measure_step_seconds(GridWorldBuilder.create(params), actions),
+                         measure_step_seconds(recorder(str(i)), actions)) for i in range(num_repeats)]
+        plain_seconds, recorded_seconds = np.min(step_seconds, axis=0)
+
+        print("GridWorld:                 {:6.2f} us/step".format(plain_seconds * 1e6))
+        print("TrajectoryRecorderWrapper: {:6.2f} us/step ({:+.1f}%)".format(
+            recorded_seconds * 1e6, 100 * (recorded_seconds / plain_seconds - 1)))
+
+        training_seconds = [(measure_training_seconds(GridWorldBuilder.create(params)),
+                             measure_training_seconds(recorder(os.path.join("training", str(i)))))
+                            for i in range(num_repeats)]
+        plain_seconds, recorded_seconds = np.min(training_seconds, axis=0)
+
+        print("q learning training step:  {:6.2f} us/step, recorded {:6.2f} us/step ({:+.1f}%)".format(
+            plain_seconds * 1e6, recorded_seconds * 1e6, 100 * (recorded_seconds / plain_seconds - 1)))
+
+        start_time = time.perf_counter()
+        num_episodes = sum(1 for _ in TrajectoryReader(os.path.join(directory, "0")).episodes())
+        read_seconds = time.perf_counter() - start_time
+
+        print("read {} episodes of {} steps in {:.3f} seconds".format(num_episodes, len(actions), read_seconds))
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import NamedTuple, Hashable, Any, Optional
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    capacity: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.
+
+
+class BoundedCache:
+    """Fixed capacity key value cache owned by a single object, evicting by least recently used or insertion order."""
+
+    LRU = "lru"
+    FIFO = "fifo"
+
+    EVICTION_POLICIES = (LRU, FIFO)
+
+    def __init__(self, capacity: int = 4096, eviction_policy: str = LRU):
+
+        if capacity < 0:
+            raise ValueError("cache capacity %s must not be negative" % capacity)
+
+        if eviction_policy not in BoundedCache.EVICTION_POLICIES:
+            raise ValueError("unknown eviction policy %s, expected one of %s" %
+                             (eviction_policy, BoundedCache.EVICTION_POLICIES))
+
+        self.capacity = capacity
+        self.eviction_policy = eviction_policy
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._move_to_end_on_hit = eviction_policy == BoundedCache.LRU
+
+    def get(self, key: Hashable) -> Optional[Any]:
+
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        if self._move_to_end_on_hit:
+            self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+
+        if self.capacity == 0:
+            return
+
+        entries = self._entries
+        entries[key] = value
+
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.capacity, len(self._entries))
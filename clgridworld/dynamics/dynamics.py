@@ -1,13 +1,15 @@
 from clgridworld.action.action import GridWorldAction as ACTIONS
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.state.state import GridWorldState
-from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.state.validator import TerminalStateValidator, ObstacleTerminalStateValidator
 
 
 class GridWorldDynamics:
 
-    def __init__(self, state: GridWorldState):
+    def __init__(self, state: GridWorldState, obstacles: ObstacleLayer = None):
 
         self.state = state
+        self.obstacles = obstacles
         self._immovable_objects = [state.key, state.lock,
                                    state.nw_beacon, state.ne_beacon,
                                    state.sw_beacon, state.se_beacon].copy()
@@ -32,13 +34,18 @@ class GridWorldDynamics:
         return self._translate_player(action)
 
     def _clone_state(self):
-        return self.state.copy()
+        # states are immutable so a transition that changes nothing can return the same state
+        return self.state
 
     def _translate_player(self, action) -> GridWorldState:
 
         player_coords = self.state.player
         new_player_coords = GridWorldDynamics._translate_coords(player_coords, action)
-        return self.state.copy(player=new_player_coords)
+
+        if new_player_coords == player_coords:
+            return self._clone_state()
+
+        return self.state.with_player(new_player_coords)
 
     def _player_moves_into_boundary(self, action) -> bool:
 
@@ -64,6 +71,9 @@ class GridWorldDynamics:
         player_coords = self.state.player
         new_player_coords = GridWorldDynamics._translate_coords(player_coords, action)
 
+        if self.obstacles is not None and self.obstacles.is_wall(new_player_coords):
+            return True
+
         return new_player_coords in self._immovable_objects
 
     @staticmethod
@@ -105,7 +115,7 @@ class GridWorldDynamics:
 
     def _pick_up_key(self) -> GridWorldState:
 
-        return self.state.copy(key=None, has_key=1)
+        return self.state.with_key_picked_up()
 
     def _player_unlocks_lock_from_eligible_state(self, action) -> bool:
 
@@ -123,9 +133,13 @@ class GridWorldDynamics:
 
     def _unlock_lock(self) -> GridWorldState:
 
-        return self.state.copy(lock=None)
+        return self.state.with_lock_unlocked()
 
     def _is_terminal_state(self) -> bool:
+
+        if self.obstacles is not None:
+            return ObstacleTerminalStateValidator(self.obstacles).is_terminal_state(self.state)
+
         return TerminalStateValidator.is_terminal_state(self.state)
 
 
@@ -0,0 +1,102 @@
+from clgridworld.action.action import GridWorldAction as ACTIONS
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.state.validator import TerminalStateMask
+
+_MOVES = {
+    ACTIONS.NORTH: (-1, 0),
+    ACTIONS.EAST: (0, 1),
+    ACTIONS.SOUTH: (1, 0),
+    ACTIONS.WEST: (0, -1)
+}
+
+
+class GridWorldDynamicsEngine:
+    """Same transitions as GridWorldDynamics, built once per task and reused for every step of every state.
+
+    Cells holding an immovable object are precomputed in a flat occupancy grid. The beacons never change, the key
+    and lock only disappear, so before each step the occupancy of just their two cells is brought in line with the
+    state being stepped instead of rebuilding the grid. Walls of an obstacle layer are copied into the grid once.
+    """
+
+    def __init__(self, initial_state: GridWorldState, obstacles: ObstacleLayer = None):
+
+        self._num_rows, self._num_cols = initial_state.grid_shape
+
+        if obstacles is None:
+            self._is_blocked = bytearray(self._num_rows * self._num_cols)
+        else:
+            self._is_blocked = bytearray(obstacles.wall_mask().tobytes())
+
+        self._terminal_state_mask = TerminalStateMask(initial_state, obstacles)
+
+        for beacon in [initial_state.nw_beacon, initial_state.ne_beacon,
+                       initial_state.sw_beacon, initial_state.se_beacon]:
+            if beacon is not None:
+                self._is_blocked[self._cell(beacon)] = 1
+
+        self._key_cell = None if initial_state.key is None else self._cell(initial_state.key)
+        self._lock_cell = None if initial_state.lock is None else self._cell(initial_state.lock)
+
+        self._key_is_blocked = False
+        self._lock_is_blocked = False
+
+        self._update_occupancy(initial_state)
+
+    def _cell(self, coords) -> int:
+        return coords[0] * self._num_cols + coords[1]
+
+    def _update_occupancy(self, state: GridWorldState):
+
+        key_is_present = state.key is not None
+        lock_is_present = state.lock is not None
+
+        if key_is_present != self._key_is_blocked:
+            self._is_blocked[self._key_cell] = key_is_present
+            self._key_is_blocked = key_is_present
+
+        if lock_is_present != self._lock_is_blocked:
+            self._is_blocked[self._lock_cell] = lock_is_present
+            self._lock_is_blocked = lock_is_present
+
+    def step(self, state: GridWorldState, action) -> GridWorldState:
+
+        if self._terminal_state_mask.is_terminal_state(state):
+            raise Exception("state is terminal state. No further actions allowed")
+
+        move = _MOVES.get(action)
+
+        if move is None:
+            return self._interact(state, action)
+
+        row = state.player[0] + move[0]
+        col = state.player[1] + move[1]
+
+        if not (0 <= row < self._num_rows and 0 <= col < self._num_cols):
+            return state
+
+        self._update_occupancy(state)
+
+        if self._is_blocked[row * self._num_cols + col]:
+            return state
+
+        return state.with_player((row, col))
+
+    def _interact(self, state: GridWorldState, action) -> GridWorldState:
+
+        if action == ACTIONS.PICK_UP_KEY:
+
+            if state.key is not None and self._coords_are_next_to_each_other(state.player, state.key):
+                return state.with_key_picked_up()
+
+        elif action == ACTIONS.UNLOCK_LOCK:
+
+            if state.key is None and state.lock is not None and \
+                    self._coords_are_next_to_each_other(state.player, state.lock):
+                return state.with_lock_unlocked()
+
+        return state
+
+    @staticmethod
+    def _coords_are_next_to_each_other(point1: (int, int), point2: (int, int)) -> bool:
+        return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1]) == 1
@@ -0,0 +1,213 @@
+import time
+from typing import NamedTuple, Tuple, List
+
+import numpy as np
+
+from clgridworld.grid_world_builder import InitialStateParams
+from clgridworld.vector.batch_grid_world import ABSENT
+
+
+class TaskBatch(NamedTuple):
+    """Layouts of one grid shape as (num_tasks, 2) coords arrays, absent objects are ABSENT."""
+
+    shape: Tuple[int, int]
+    player: np.ndarray
+    key: np.ndarray
+    lock: np.ndarray
+    pit_start: np.ndarray
+    pit_end: np.ndarray
+
+    def num_tasks(self) -> int:
+        return self.player.shape[0]
+
+    def params(self, i: int) -> InitialStateParams:
+
+        def coords(array: np.ndarray):
+            return None if array[i, 0] == ABSENT else (int(array[i, 0]), int(array[i, 1]))
+
+        return InitialStateParams(shape=self.shape, player=coords(self.player), key=coords(self.key),
+                                  lock=coords(self.lock), pit_start=coords(self.pit_start),
+                                  pit_end=coords(self.pit_end))
+
+    def to_params(self) -> List[InitialStateParams]:
+        return [self.params(i) for i in range(self.num_tasks())]
+
+
+class SamplerStats(NamedTuple):
+
+    num_sampled: int
+    num_rejected: int
+    seconds: float
+
+    @property
+    def tasks_per_second(self) -> float:
+        return self.num_sampled / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        num_attempts = self.num_sampled + self.num_rejected
+        return self.num_rejected / num_attempts if num_attempts > 0 else 0.0
+
+
+class TaskSampler:
+    """Samples random layouts that GridWorldStateFactory.create accepts, in batches.
+
+    The pit and its beacons are sampled first and the cells they cover are masked out, the player, key and lock are
+    then placed on distinct free cells chosen uniformly at random. A layout is only rejected, and resampled, when the
+    pit leaves too few free cells for the objects. Candidates are sampled in chunks of at most MAX_CANDIDATE_CELLS
+    cells in total.
+
+    Each task has a key with probability key_probability, a lock with probability lock_probability and a pit with
+    probability pit_probability. Tasks that would have neither key nor lock are rejected. Pits are between 1 and
+    max_pit_shape cells in each dimension.
+    """
+
+    MAX_ROUNDS = 100
+    MAX_CANDIDATE_CELLS = 1 << 20
+
+    def __init__(self, shape: Tuple[int, int], seed=None, key_probability=1.0, lock_probability=1.0,
+                 pit_probability=1.0, max_pit_shape: Tuple[int, int] = None):
+
+        num_rows, num_cols = shape
+
+        if num_rows * num_cols < 3:
+            raise ValueError("grid shape %s too small for player, key and lock" % (shape,))
+
+        if key_probability == 0 and lock_probability == 0:
+            raise ValueError("key or lock probability required")
+
+        self.shape = (num_rows, num_cols)
+        self.key_probability = key_probability
+        self.lock_probability = lock_probability
+        self.pit_probability = pit_probability
+        self.max_pit_shape = (num_rows, num_cols) if max_pit_shape is None else \
+            (min(max_pit_shape[0], num_rows), min(max_pit_shape[1], num_cols))
+
+        self._rng = np.random.default_rng(seed)
+        self._chunk_size = max(1, TaskSampler.MAX_CANDIDATE_CELLS // (num_rows * num_cols))
+
+        self._row_index = np.arange(num_rows)[np.newaxis, :, np.newaxis]
+        self._col_index = np.arange(num_cols)[np.newaxis, np.newaxis, :]
+
+        self._num_sampled = 0
+        self._num_rejected = 0
+        self._seconds = 0.0
+
+    def sample(self, num_tasks: int) -> TaskBatch:
+
+        if num_tasks < 0:
+            raise ValueError("num_tasks must not be negative, got %d" % num_tasks)
+
+        if num_tasks == 0:
+            return TaskBatch(self.shape, *[np.empty((0, 2), dtype=np.int64) for _ in range(5)])
+
+        start_time = time.perf_counter()
+
+        batches = []
+        num_remaining = num_tasks
+
+        for _ in range(TaskSampler.MAX_ROUNDS):
+
+            num_candidates = num_remaining
+
+            # candidates hold a random key and a mask per cell, sampling them in chunks bounds the memory on large grids
+            for chunk_start in range(0, num_candidates, self._chunk_size):
+
+                chunk_size = min(self._chunk_size, num_candidates - chunk_start)
+                batch, is_valid = self._sample_candidates(chunk_size)
+                num_valid = int(is_valid.sum())
+
+                batches.append(TaskBatch(self.shape, *[array[is_valid] for array in batch[1:]]))
+                self._num_rejected += chunk_size - num_valid
+                num_remaining -= num_valid
+
+            if num_remaining == 0:
+                break
+
+        if num_remaining > 0:
+            raise ValueError("could not sample valid layouts for grid shape %s, max pit shape %s" %
+                             (self.shape, self.max_pit_shape))
+
+        self._num_sampled += num_tasks
+        self._seconds += time.perf_counter() - start_time
+
+        return TaskBatch(self.shape, *[np.concatenate(arrays) for arrays in list(zip(*batches))[1:]])
+
+    def stats(self) -> SamplerStats:
+        return SamplerStats(self._num_sampled, self._num_rejected, self._seconds)
+
+    def _sample_candidates(self, num_tasks: int) -> (TaskBatch, np.ndarray):
+
+        rng = self._rng
+        num_rows, num_cols = self.shape
+
+        has_key = rng.random(num_tasks) < self.key_probability
+        has_lock = rng.random(num_tasks) < self.lock_probability
+        has_pit = rng.random(num_tasks) < self.pit_probability
+
+        pit_start, pit_end = self._sample_pits(num_tasks)
+        pit_start[~has_pit] = ABSENT
+        pit_end[~has_pit] = ABSENT
+
+        is_blocked = self._blocked_cells(pit_start, pit_end, has_pit)
+
+        # the lowest random keys among the free cells are a uniformly random ordered choice of distinct free cells
+        random_keys = rng.random((num_tasks, num_rows * num_cols))
+        random_keys[is_blocked.reshape(num_tasks, num_rows * num_cols)] = np.inf
+
+        chosen = np.argpartition(random_keys, 2, axis=1)[:, :3]
+        chosen_keys = np.take_along_axis(random_keys, chosen, axis=1)
+        chosen = np.take_along_axis(chosen, np.argsort(chosen_keys, axis=1), axis=1)
+        chosen_keys = np.sort(chosen_keys, axis=1)
+
+        coords = np.stack([chosen // num_cols, chosen % num_cols], axis=2)
+
+        player = coords[:, 0]
+        key = np.where(has_key[:, np.newaxis], coords[:, 1], ABSENT)
+        lock = np.where(has_lock[:, np.newaxis], np.where(has_key[:, np.newaxis], coords[:, 2], coords[:, 1]), ABSENT)
+
+        num_objects = 1 + has_key.astype(np.int64) + has_lock
+        has_enough_free_cells = np.isfinite(chosen_keys[np.arange(num_tasks), num_objects - 1])
+
+        is_valid = has_enough_free_cells & (has_key | has_lock)
+
+        return TaskBatch(self.shape, player, key, lock, pit_start, pit_end), is_valid
+
+    def _sample_pits(self, num_tasks: int) -> (np.ndarray, np.ndarray):
+
+        rng = self._rng
+        shape = np.asarray(self.shape)
+
+        pit_shape = rng.integers(1, np.asarray(self.max_pit_shape) + 1, size=(num_tasks, 2))
+        pit_start = rng.integers(0, shape - pit_shape + 1, size=(num_tasks, 2))
+
+        return pit_start, pit_start + pit_shape - 1
+
+    def _blocked_cells(self, pit_start: np.ndarray, pit_end: np.ndarray, has_pit: np.ndarray) -> np.ndarray:
+        """(num_tasks, num_rows, num_cols) mask of the cells covered by each task's pit and beacons."""
+
+        num_tasks = pit_start.shape[0]
+        num_rows, num_cols = self.shape
+
+        pit_row_start = pit_start[:, 0, np.newaxis, np.newaxis]
+        pit_col_start = pit_start[:, 1, np.newaxis, np.newaxis]
+        pit_row_end = pit_end[:, 0, np.newaxis, np.newaxis]
+        pit_col_end = pit_end[:, 1, np.newaxis, np.newaxis]
+
+        is_blocked = (pit_row_start <= self._row_index) & (self._row_index <= pit_row_end) & \
+                     (pit_col_start <= self._col_index) & (self._col_index <= pit_col_end) & \
+                     has_pit[:, np.newaxis, np.newaxis]
+
+        task_index = np.arange(num_tasks)
+
+        for beacon_row, beacon_col in [(pit_start[:, 0] - 1, pit_start[:, 1] - 1),
+                                       (pit_start[:, 0] - 1, pit_end[:, 1] + 1),
+                                       (pit_end[:, 0] + 1, pit_start[:, 1] - 1),
+                                       (pit_end[:, 0] + 1, pit_end[:, 1] + 1)]:
+
+            is_in_bounds = has_pit & (0 <= beacon_row) & (beacon_row < num_rows) & \
+                           (0 <= beacon_col) & (beacon_col < num_cols)
+
+            is_blocked[task_index[is_in_bounds], beacon_row[is_in_bounds], beacon_col[is_in_bounds]] = True
+
+        return is_blocked
@@ -1,14 +1,20 @@
-from functools import lru_cache
-
 import gym
 
+from clgridworld.cache.bounded_cache import BoundedCache, CacheInfo
+from clgridworld.state.obstacle_layer import ObstacleLayer
+
 
 class GridWorld(gym.Env):
 
+    DEFAULT_CACHE_CAPACITY = 4096
+    metadata = {'render.modes': ['human', 'ansi', 'rgb_array']}
+
     def __init__(self, observation_space, action_space, initial_state, reward_function, dynamics,
-                 terminal_state_validator, visualizer):
+                 terminal_state_validator, visualizer, cache_capacity: int = DEFAULT_CACHE_CAPACITY,
+                 cache_eviction_policy: str = BoundedCache.LRU, obstacles: ObstacleLayer = None):
 
         self.initial_state = initial_state
+        self.obstacles = obstacles
         self.observation_space = observation_space
         self.action_space = action_space
         self.dynamics = dynamics
@@ -18,6 +24,8 @@ class GridWorld(gym.Env):
 
         # self.reward_range = reward_function.reward_range
 
+        self._transition_cache = BoundedCache(cache_capacity, cache_eviction_policy)
+
         self.prev_state = self.initial_state
         self.curr_state = self.initial_state
 
@@ -26,21 +34,42 @@ class GridWorld(gym.Env):
         self.curr_state, reward, done, info = self._step(self.prev_state, action)
         return self.curr_state, reward, done, info
 
-    @lru_cache(maxsize=None)
     def _step(self, prev_state, action):
+
+        transition = self._transition_cache.get((prev_state, action))
+
+        if transition is None:
+            transition = self._calculate_transition(prev_state, action)
+            self._transition_cache.put((prev_state, action), transition)
+
+        return transition
+
+    def _calculate_transition(self, prev_state, action):
         curr_state = self.dynamics.step(prev_state, action)
         reward = self.reward_function.calculate(prev_state, action, curr_state)
         done = self.terminal_state_validator.is_terminal_state(curr_state)
         info = {}
         return curr_state, reward, done, info
 
+    def cache_info(self) -> CacheInfo:
+        return self._transition_cache.info()
+
+    def clear_cache(self) -> None:
+        self._transition_cache.clear()
+
     def reset(self):
         self.prev_state = self.initial_state
         self.curr_state = self.initial_state
         return self.initial_state
 
     def render(self, mode='human'):
-        self.visualizer.render(self.curr_state)
+        return self.visualizer.render(self.curr_state, mode)
+
+    def close(self):
+        # frames buffered by the visualizer are written out
+        flush = getattr(self.visualizer, "flush", None)
+        if flush is not None:
+            flush()
 
     def seed(self, seed=None):
         self.observation_space.seed(seed)
@@ -48,7 +77,9 @@ class GridWorld(gym.Env):
 
     def copy(self, seed=None):
         new_grid_world = GridWorld(self.observation_space, self.action_space, self.initial_state, self.reward_function,
-                                   self.dynamics, self.terminal_state_validator, self.visualizer)
+                                   self.dynamics, self.terminal_state_validator, self.visualizer,
+                                   self._transition_cache.capacity, self._transition_cache.eviction_policy,
+                                   self.obstacles)
 
         new_grid_world.prev_state = self.prev_state
         new_grid_world.curr_state = self.curr_state
@@ -1,14 +1,27 @@
+import hashlib
+import json
+import os
+import shutil
+from functools import partial
 from types import SimpleNamespace
-from typing import NamedTuple, Optional, Tuple
+from typing import NamedTuple, Optional, Tuple, Sequence
 
+from clgridworld.cache.bounded_cache import BoundedCache
 from clgridworld.grid_world import GridWorld
 from clgridworld.action.action import GridWorldActionSpace
 from clgridworld.dynamics.dynamics import GridWorldDynamics
-from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.dynamics.dynamics_engine import GridWorldDynamicsEngine
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.validator import TerminalStateMask
+from clgridworld.visualizer.cached_grid_visualizer import CachedGridVisualizer
 from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
 from clgridworld.reward.reward import GridWorldRewardFunction
 from clgridworld.state.state import GridWorldObservationSpace, GridWorldState
 from clgridworld.state.state_factory import GridWorldStateFactory
+from clgridworld.tabular.state_space import ReachableStateSpace
+from clgridworld.tabular.tabular_grid_world import TabularGridWorld
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.vector.batch_grid_world import BatchGridWorld
 
 
 class InitialStateParams(NamedTuple):
@@ -19,41 +32,113 @@ class InitialStateParams(NamedTuple):
     lock: Optional[Tuple[int, int]] = None
     pit_start: Optional[Tuple[int, int]] = None
     pit_end: Optional[Tuple[int, int]] = None
+    obstacles: Optional[ObstacleLayer] = None
 
 
 class GridWorldBuilder:
 
     @staticmethod
-    def create(params: InitialStateParams) -> GridWorld:
+    def create(params: InitialStateParams, cache_capacity: int = GridWorld.DEFAULT_CACHE_CAPACITY,
+               cache_eviction_policy: str = BoundedCache.LRU) -> GridWorld:
 
         initial_state = GridWorldStateFactory.create(params.shape, params.player, params.key,
-                                                     params.lock, params.pit_start, params.pit_end)
+                                                     params.lock, params.pit_start, params.pit_end, params.obstacles)
 
         observation_space = GridWorldObservationSpace(params.shape)
         action_space = GridWorldActionSpace()
 
-        dynamics = SimpleNamespace()
-        dynamics.step = GridWorldBuilder.step
+        dynamics = GridWorldDynamicsEngine(initial_state, params.obstacles)
+        terminal_state_validator = TerminalStateMask(initial_state, params.obstacles)
         reward_function = SimpleNamespace()
-        reward_function.calculate = GridWorldBuilder.reward
-        terminal_state_validator = TerminalStateValidator
-        visualizer = SimpleNamespace()
-        visualizer.render = GridWorldBuilder.render
+        reward_function.calculate = partial(GridWorldBuilder.reward, reward_function=GridWorldRewardFunction(
+            obstacles=params.obstacles, terminal_state_mask=terminal_state_validator))
+        visualizer = CachedGridVisualizer(initial_state, params.obstacles)
 
         return GridWorld(observation_space, action_space, initial_state, reward_function, dynamics,
-                         terminal_state_validator, visualizer)
+                         terminal_state_validator, visualizer, cache_capacity, cache_eviction_policy, params.obstacles)
+
+    @staticmethod
+    def create_batch(params_list: Sequence[InitialStateParams]) -> BatchGridWorld:
+
+        if any(params.obstacles is not None for params in params_list):
+            raise ValueError("obstacle layers not supported by BatchGridWorld")
+
+        initial_states = [GridWorldStateFactory.create(params.shape, params.player, params.key, params.lock,
+                                                       params.pit_start, params.pit_end) for params in params_list]
+
+        return BatchGridWorld(initial_states)
+
+    @staticmethod
+    def create_tabular(params: InitialStateParams) -> TabularGridWorld:
+
+        initial_state = GridWorldStateFactory.create(params.shape, params.player, params.key,
+                                                     params.lock, params.pit_start, params.pit_end, params.obstacles)
+
+        model = TabularTransitionModel.compile(initial_state, obstacles=params.obstacles)
+
+        visualizer = CachedGridVisualizer(initial_state, params.obstacles)
+
+        return TabularGridWorld(model, visualizer)
+
+    @staticmethod
+    def create_state_space(params: InitialStateParams, cache_dir: Optional[str] = None) -> ReachableStateSpace:
+        """Explores the task once per cache_dir, later calls load the saved index memory mapped."""
+
+        initial_state = GridWorldStateFactory.create(params.shape, params.player, params.key,
+                                                     params.lock, params.pit_start, params.pit_end, params.obstacles)
+
+        if cache_dir is None:
+            return ReachableStateSpace.explore(initial_state, params.obstacles)
+
+        directory = os.path.join(cache_dir, GridWorldBuilder.state_space_name(params))
+
+        if os.path.isdir(directory):
+
+            try:
+                state_space = ReachableStateSpace.load(directory)
+            except FileNotFoundError:
+                # an incomplete index is rebuilt
+                shutil.rmtree(directory, ignore_errors=True)
+                state_space = None
+
+            if state_space is not None and state_space.initial_state == initial_state:
+                return state_space
+
+        state_space = ReachableStateSpace.explore(initial_state, params.obstacles)
+
+        if not os.path.isdir(directory):
+            os.makedirs(cache_dir, exist_ok=True)
+            state_space.save(directory)
+
+        return state_space
+
+    @staticmethod
+    def state_space_name(params: InitialStateParams) -> str:
+        # plain ints, coords derived from numpy arrays hold numpy ints which json can not serialize
+        values = [[int(coord) for coord in value] if value is not None else None for value in params[:6]]
+
+        if params.obstacles is not None:
+            values.append(params.obstacles.digest())
+
+        params_json = json.dumps(values)
+        return "state_space-" + hashlib.sha1(params_json.encode("utf-8")).hexdigest()[:16]
 
     @staticmethod
     def step(state: GridWorldState, action) -> GridWorldState:
         return GridWorldDynamics(state).step(action)
 
     @staticmethod
-    def reward(curr_state: GridWorldState, action, next_state: GridWorldState) -> int:
-        return GridWorldRewardFunction().calculate(curr_state, next_state)
+    def reward(curr_state: GridWorldState, action, next_state: GridWorldState, obstacles: ObstacleLayer = None,
+               reward_function: GridWorldRewardFunction = None) -> int:
+
+        if reward_function is None:
+            reward_function = GridWorldRewardFunction(obstacles=obstacles)
+
+        return reward_function.calculate(curr_state, next_state)
 
     @staticmethod
-    def render(curr_state: GridWorldState) -> None:
-        grid_state = GridStateVisualizer(curr_state)
+    def render(curr_state: GridWorldState, obstacles: ObstacleLayer = None) -> None:
+        grid_state = GridStateVisualizer(curr_state, obstacles)
         print(grid_state.grid)
         has_key = "true" if grid_state.state.has_key else "false"
         print("has_key: " + has_key)
@@ -0,0 +1,234 @@
+import time
+from collections import deque
+from typing import NamedTuple, Dict, List, Tuple, Any, Optional
+
+import gym
+import numpy as np
+
+from clgridworld.cache.bounded_cache import CacheInfo
+
+
+class ComponentStats(NamedTuple):
+    """Timings of one instrumented method, percentiles are over the most recent calls only."""
+
+    calls: int
+    total_seconds: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_seconds / self.calls * 1e6 if self.calls > 0 else 0.
+
+
+class InstrumentationSnapshot(NamedTuple):
+    components: Dict[str, ComponentStats]
+    caches: Dict[str, CacheInfo]
+
+    def report(self) -> str:
+
+        lines = ["{:<55} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+            "component", "calls", "total s", "mean us", "p50 us", "p90 us", "p99 us")]
+
+        for name, stats in self.components.items():
+            lines.append("{:<55} {:>10d} {:>10.3f} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f}".format(
+                name, stats.calls, stats.total_seconds, stats.mean_us, stats.p50_us, stats.p90_us, stats.p99_us))
+
+        for name, info in self.caches.items():
+            lines.append("{:<55} {:>10d} hits {:>10d} misses {:>6.1%} hit rate {:>8d}/{:d} entries".format(
+                name, info.hits, info.misses, info.hit_rate, info.size, info.capacity))
+
+        return "\n".join(lines)
+
+
+class _ComponentTimer:
+
+    def __init__(self, max_samples: int):
+        self.calls = 0
+        self.total_seconds = 0.
+        self.samples = deque(maxlen=max_samples)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.total_seconds = 0.
+        self.samples.clear()
+
+    def stats(self) -> ComponentStats:
+
+        if len(self.samples) == 0:
+            return ComponentStats(self.calls, self.total_seconds, 0., 0., 0.)
+
+        p50_us, p90_us, p99_us = np.percentile(np.fromiter(self.samples, dtype=np.float64), [50, 90, 99]) * 1e6
+
+        return ComponentStats(self.calls, self.total_seconds, float(p50_us), float(p90_us), float(p99_us))
+
+
+class Instrumentation:
+    """Times calls to the components of a GridWorld, the wrappers around it and optionally an agent, and tracks the
+    hit rates of their caches.
+
+    Like PredicateCounter, the timed methods are only installed, as instance attributes, while instrumentation is
+    enabled and removed again when it is disabled, so there is no cost when it is off. Timings are inclusive, the
+    time of a wrapper's step includes the step of the env it wraps. Components shared between envs, such as the
+    dynamics of a copied GridWorld, are timed for all of them.
+
+        with Instrumentation(env, agent) as instrumentation:
+            AgentTrainer(env, agent).train(headless=True)
+
+        print(instrumentation.snapshot().report())
+    """
+
+    DEFAULT_MAX_SAMPLES = 100000
+
+    GRID_WORLD_COMPONENTS = [
+        ("dynamics", "step"),
+        ("reward_function", "calculate"),
+        ("terminal_state_validator", "is_terminal_state"),
+    ]
+
+    AGENT_METHODS = ["get_action", "update"]
+
+    def __init__(self, env: gym.Env = None, agent: Any = None, max_samples: int = DEFAULT_MAX_SAMPLES):
+
+        self.max_samples = max_samples
+        self.enabled = False
+
+        # (owner, attribute name, component name) of every method to time
+        self._methods = []  # type: List[Tuple[Any, str, str]]
+        # (env, cache name) of every cache_info to track
+        self._caches = []  # type: List[Tuple[Any, str]]
+
+        self._timers = {}  # type: Dict[str, _ComponentTimer]
+        self._cache_starts = {}  # type: Dict[str, CacheInfo]
+        self._installed = []  # type: List[Tuple[Any, str, Optional[Any]]]
+
+        if env is not None:
+            self.add_env(env)
+
+        if agent is not None:
+            self.add_agent(agent)
+
+    def add_env(self, env: gym.Env) -> None:
+        """Adds every wrapper down to the GridWorld, the step and observation of each and the GridWorld components."""
+
+        while True:
+
+            name = self._unique_name(type(env).__name__)
+
+            self.add_method(env, "step", name + ".step")
+
+            if isinstance(env, gym.ObservationWrapper):
+                self.add_method(env, "observation", name + ".observation")
+
+            # looked up on the class as gym.Wrapper forwards missing attributes to the env it wraps
+            if hasattr(type(env), "cache_info"):
+                self._caches.append((env, name + ".cache"))
+
+            if not isinstance(env, gym.Wrapper):
+                break
+
+            env = env.env
+
+        for component, method in Instrumentation.GRID_WORLD_COMPONENTS:
+            if hasattr(env, component):
+                self.add_method(getattr(env, component), method, name + "." + component + "." + method)
+
+    def add_agent(self, agent: Any) -> None:
+
+        name = self._unique_name(type(agent).__name__)
+
+        for method in Instrumentation.AGENT_METHODS:
+            self.add_method(agent, method, name + "." + method)
+
+    def add_method(self, owner: Any, attribute: str, name: str) -> None:
+
+        if self.enabled:
+            raise ValueError("methods can not be added while instrumentation is enabled")
+
+        self._methods.append((owner, attribute, name))
+        self._timers[name] = _ComponentTimer(self.max_samples)
+
+    def _unique_name(self, name: str) -> str:
+
+        names = {method_name.split(".")[0] for _, _, method_name in self._methods}
+        unique_name = name
+        i = 2
+
+        while unique_name in names:
+            unique_name = "%s#%d" % (name, i)
+            i += 1
+
+        return unique_name
+
+    def enable(self) -> None:
+
+        if self.enabled:
+            return
+
+        for owner, attribute, name in self._methods:
+            # instance attributes are restored on disable, class attributes are shadowed and then deleted again
+            original = owner.__dict__.get(attribute)
+            setattr(owner, attribute, self._timed(getattr(owner, attribute), self._timers[name]))
+            self._installed.append((owner, attribute, original))
+
+        self._cache_starts = {name: env.cache_info() for env, name in self._caches}
+        self.enabled = True
+
+    def disable(self) -> None:
+
+        for owner, attribute, original in reversed(self._installed):
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+
+        self._installed = []
+        self.enabled = False
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    @staticmethod
+    def _timed(function, timer: _ComponentTimer):
+
+        perf_counter = time.perf_counter
+        append = timer.samples.append
+
+        def timed_function(*args, **kwargs):
+
+            start_time = perf_counter()
+            result = function(*args, **kwargs)
+            seconds = perf_counter() - start_time
+
+            timer.calls += 1
+            timer.total_seconds += seconds
+            append(seconds)
+
+            return result
+
+        return timed_function
+
+    def reset(self) -> None:
+
+        for timer in self._timers.values():
+            timer.reset()
+
+        self._cache_starts = {name: env.cache_info() for env, name in self._caches}
+
+    def snapshot(self) -> InstrumentationSnapshot:
+        """Stats since instrumentation was first enabled or last reset, cache hits and misses included."""
+
+        caches = {}
+
+        for env, name in self._caches:
+
+            info = env.cache_info()
+            start = self._cache_starts.get(name, CacheInfo(0, 0, info.capacity, info.size))
+            caches[name] = info._replace(hits=info.hits - start.hits, misses=info.misses - start.misses)
+
+        return InstrumentationSnapshot({name: timer.stats() for name, timer in self._timers.items()}, caches)
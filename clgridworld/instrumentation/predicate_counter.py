@@ -0,0 +1,82 @@
+from collections import Counter
+from functools import wraps
+from typing import Dict, List, Tuple
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.state.validator import TerminalStateValidator, ObstacleTerminalStateValidator, TerminalStateMask
+
+
+class PredicateCounter:
+    """Counts how often the state predicates are called while the counter is active.
+
+    Each predicate is replaced on its class with a counting wrapper on enter and restored on exit, so there is no
+    cost when not counting.
+
+        with PredicateCounter() as counter:
+            env.step(action)
+
+        print(counter.report(num_steps=1))
+    """
+
+    DEFAULT_PREDICATES = [
+        (GridWorldState, "is_in_pit"),
+        (GridWorldState, "player_has_key"),
+        (GridWorldState, "lock_is_unlocked"),
+        (TerminalStateValidator, "is_terminal_state"),
+        (ObstacleTerminalStateValidator, "is_terminal_state"),
+        (TerminalStateMask, "is_terminal_state"),
+        (TerminalStateMask, "is_in_pit"),
+        (ObstacleLayer, "is_wall"),
+        (ObstacleLayer, "is_pit"),
+    ]
+
+    def __init__(self, predicates: List[Tuple[type, str]] = None):
+
+        self.predicates = PredicateCounter.DEFAULT_PREDICATES if predicates is None else predicates
+        self.counts = Counter()
+
+        self._originals = []
+
+    def __enter__(self) -> 'PredicateCounter':
+
+        for owner, name in self.predicates:
+
+            original = owner.__dict__[name]
+            self._originals.append((owner, name, original))
+
+            if isinstance(original, staticmethod):
+                setattr(owner, name, staticmethod(self._counting(owner, name, original.__func__)))
+            else:
+                setattr(owner, name, self._counting(owner, name, original))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+
+        self._originals = []
+
+    def _counting(self, owner: type, name: str, function):
+
+        key = owner.__name__ + "." + name
+        counts = self.counts
+
+        @wraps(function)
+        def counting_function(*args, **kwargs):
+            counts[key] += 1
+            return function(*args, **kwargs)
+
+        return counting_function
+
+    def reset(self) -> None:
+        self.counts.clear()
+
+    def per_step(self, num_steps: int) -> Dict[str, float]:
+        return {key: count / num_steps for key, count in self.counts.items()}
+
+    def report(self, num_steps: int) -> str:
+        return "\n".join("{:<45} {:8.2f} calls/step".format(key, calls)
+                         for key, calls in sorted(self.per_step(num_steps).items()))
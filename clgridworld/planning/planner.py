@@ -0,0 +1,102 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from clgridworld.tabular.transition_model import TabularTransitionModel
+
+
+class PlanningResult(NamedTuple):
+    V: np.ndarray
+    Q: np.ndarray
+    policy: np.ndarray
+    num_iterations: int
+    converged: bool
+
+
+class GridWorldPlanner:
+    """Exact solvers for the deterministic MDP of a compiled task, see TabularTransitionModel.compile.
+
+    Arrays are indexed by the model's state ids, terminal states have a value of 0.
+    """
+
+    @staticmethod
+    def value_iteration(model: TabularTransitionModel, discount_factor=0.95, tolerance=1e-8,
+                        max_iterations=100000) -> PlanningResult:
+
+        GridWorldPlanner._validate_discount_factor(discount_factor)
+
+        V = np.zeros(model.num_states)
+        Q = GridWorldPlanner._q_values(model, V, discount_factor)
+
+        for num_iterations in range(1, max_iterations + 1):
+
+            new_V = Q.max(axis=1)
+            has_converged = np.max(np.abs(new_V - V)) <= tolerance
+            V = new_V
+            Q = GridWorldPlanner._q_values(model, V, discount_factor)
+
+            if has_converged:
+                return PlanningResult(V, Q, Q.argmax(axis=1), num_iterations, True)
+
+        return PlanningResult(V, Q, Q.argmax(axis=1), max_iterations, False)
+
+    @staticmethod
+    def policy_iteration(model: TabularTransitionModel, discount_factor=0.95, tolerance=1e-8,
+                         max_iterations=1000) -> PlanningResult:
+        """Policy iteration with iterative policy evaluation, requires discount_factor < 1 so that evaluating
+        policies which never reach a terminal state converges."""
+
+        if not 0 <= discount_factor < 1:
+            raise ValueError("discount factor %s not in [0, 1) required by policy iteration" % discount_factor)
+
+        state_ids = np.arange(model.num_states)
+        policy = np.zeros(model.num_states, dtype=np.int64)
+        V = np.zeros(model.num_states)
+
+        for num_iterations in range(1, max_iterations + 1):
+
+            V = GridWorldPlanner._evaluate_policy(model, policy, V, discount_factor, tolerance)
+            Q = GridWorldPlanner._q_values(model, V, discount_factor)
+
+            # keep the current action on ties so that the policy cannot cycle between equally good actions
+            new_policy = Q.argmax(axis=1)
+            is_stable = Q[state_ids, policy] >= Q[state_ids, new_policy] - tolerance
+            new_policy[is_stable] = policy[is_stable]
+
+            if np.array_equal(new_policy, policy):
+                return PlanningResult(V, Q, policy, num_iterations, True)
+
+            policy = new_policy
+
+        return PlanningResult(V, Q, policy, max_iterations, False)
+
+    @staticmethod
+    def _evaluate_policy(model: TabularTransitionModel, policy: np.ndarray, V: np.ndarray, discount_factor,
+                         tolerance) -> np.ndarray:
+
+        state_ids = np.arange(model.num_states)
+        next_state = model.next_state[state_ids, policy]
+        reward = np.where(model.done, 0, model.reward[state_ids, policy])
+        is_not_done = ~model.done
+
+        while True:
+            new_V = np.where(is_not_done, reward + discount_factor * V[next_state], 0)
+
+            if np.max(np.abs(new_V - V)) <= tolerance:
+                return new_V
+
+            V = new_V
+
+    @staticmethod
+    def _q_values(model: TabularTransitionModel, V: np.ndarray, discount_factor) -> np.ndarray:
+
+        Q = model.reward + discount_factor * V[model.next_state]
+        Q[model.done] = 0
+
+        return Q
+
+    @staticmethod
+    def _validate_discount_factor(discount_factor):
+
+        if not 0 <= discount_factor <= 1:
+            raise ValueError("discount factor %s not in [0, 1]" % discount_factor)
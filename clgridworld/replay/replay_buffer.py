@@ -0,0 +1,265 @@
+import os
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+
+class TransitionBatch(NamedTuple):
+    """Columns of a sample of transitions, weights are importance sampling weights (all 1 for uniform samples)."""
+
+    indices: np.ndarray
+    states: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    next_states: np.ndarray
+    dones: np.ndarray
+    weights: np.ndarray
+
+
+class SumTree:
+    """Binary tree over capacity leaf priorities in which each node holds the sum of its children.
+
+    Stored as an array with the root at 1 and the children of node i at 2i and 2i + 1. Updating priorities and
+    finding the leaves at given prefix sums take log2(capacity) steps, each vectorized over the batch.
+    """
+
+    def __init__(self, capacity: int):
+
+        self.capacity = capacity
+        self.num_leaves = 1 << max(capacity - 1, 0).bit_length()
+        self.depth = self.num_leaves.bit_length() - 1
+
+        self.tree = np.zeros(2 * self.num_leaves, dtype=np.float64)
+
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def priorities(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[self.num_leaves + np.asarray(indices)]
+
+    def set(self, index: int, priority: float) -> None:
+
+        tree = self.tree
+        node = self.num_leaves + index
+        tree[node] = priority
+
+        while node > 1:
+            node >>= 1
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+
+        tree = self.tree
+        nodes = self.num_leaves + np.asarray(indices, dtype=np.int64)
+        tree[nodes] = priorities
+
+        # parents are recomputed from their children, so repeated indices all write the same sum
+        for _ in range(self.depth):
+            nodes >>= 1
+            tree[nodes] = tree[2 * nodes] + tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Indices of the leaves whose priority range contains each value in [0, total)."""
+
+        tree = self.tree
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(values.shape, dtype=np.int64)
+
+        for _ in range(self.depth):
+
+            left = 2 * nodes
+            left_sums = tree[left]
+            go_right = values >= left_sums
+
+            values -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+
+        # rounding can push a value past the last non empty leaf
+        return np.minimum(nodes - self.num_leaves, self.capacity - 1)
+
+
+class ReplayBuffer:
+    """Fixed capacity ring of transitions stored as preallocated typed columns.
+
+    States are stored with observation_shape and observation_dtype, e.g. encoded state ids (see for_state_ids) or
+    distance observations (see for_distance_observations). Actions are uint8, rewards int32 and dones bool. Once full,
+    each transition added overwrites the oldest.
+
+    With a directory the columns are memory mapped .npy files in it, so the buffer can be larger than RAM.
+
+    With priority_exponent > 0 transitions can also be sampled in proportion to their priority, as in prioritized
+    experience replay. Priorities are kept in a SumTree, new transitions get the largest priority seen so far, so
+    adding costs log2(capacity) steps instead of constant time.
+    """
+
+    PRIORITY_EPSILON = 1e-6
+
+    def __init__(self, capacity: int, observation_shape: Tuple[int, ...] = (), observation_dtype=np.int64,
+                 directory: str = None, priority_exponent: float = 0.0, seed=None):
+
+        if capacity < 1:
+            raise ValueError("capacity must be positive, got %d" % capacity)
+
+        self.capacity = capacity
+        self.observation_shape = tuple(observation_shape)
+        self.directory = directory
+        self.priority_exponent = priority_exponent
+
+        observation_dtype = np.dtype(observation_dtype)
+
+        column_specs = {
+            "states": (self.observation_shape, observation_dtype),
+            "actions": ((), np.uint8),
+            "rewards": ((), np.int32),
+            "next_states": (self.observation_shape, observation_dtype),
+            "dones": ((), np.bool_),
+        }
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self._columns = {name: self._allocate(name, (capacity,) + shape, dtype)
+                         for name, (shape, dtype) in column_specs.items()}
+
+        self.states = self._columns["states"]
+        self.actions = self._columns["actions"]
+        self.rewards = self._columns["rewards"]
+        self.next_states = self._columns["next_states"]
+        self.dones = self._columns["dones"]
+
+        self._priorities = SumTree(capacity) if priority_exponent > 0 else None
+        self._max_priority = 1.0
+
+        self._rng = np.random.default_rng(seed)
+
+        self.position = 0
+        self.size = 0
+
+    @staticmethod
+    def for_state_ids(capacity: int, num_states: int, **kwargs) -> 'ReplayBuffer':
+        """Buffer of state ids in [0, num_states) stored in the smallest unsigned int type that holds them, e.g.
+        GridWorldStateEncoder ids."""
+        return ReplayBuffer(capacity, (), np.min_scalar_type(max(num_states - 1, 0)), **kwargs)
+
+    @staticmethod
+    def for_distance_observations(capacity: int, **kwargs) -> 'ReplayBuffer':
+        """Buffer of the 17 float observations of DistanceObservationWrapper, stored as float32."""
+        return ReplayBuffer(capacity, (17,), np.float32, **kwargs)
+
+    def _allocate(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+
+        if self.directory is None:
+            return np.zeros(shape, dtype=dtype)
+
+        return np.lib.format.open_memmap(os.path.join(self.directory, name + ".npy"), mode="w+", dtype=dtype,
+                                         shape=shape)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def prioritized(self) -> bool:
+        return self._priorities is not None
+
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+    def add(self, state, action: int, reward: int, next_state, done: bool) -> int:
+        """Adds a transition in place of the oldest once full, returns its index."""
+
+        index = self.position
+
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+
+        if self._priorities is not None:
+            self._priorities.set(index, self._max_priority)
+
+        self.position = index + 1 if index + 1 < self.capacity else 0
+        self.size = min(self.size + 1, self.capacity)
+
+        return index
+
+    def add_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+                  dones: np.ndarray) -> np.ndarray:
+        """Adds N transitions as if added one after the other, e.g. one step of a BatchGridWorld, returns the indices
+        of those kept."""
+
+        num_transitions = len(actions)
+
+        # only the last capacity transitions would survive
+        first = max(num_transitions - self.capacity, 0)
+        indices = (self.position + first + np.arange(num_transitions - first)) % self.capacity
+
+        self.states[indices] = states[first:]
+        self.actions[indices] = actions[first:]
+        self.rewards[indices] = rewards[first:]
+        self.next_states[indices] = next_states[first:]
+        self.dones[indices] = dones[first:]
+
+        if self._priorities is not None:
+            self._priorities.update(indices, np.full(indices.shape, self._max_priority))
+
+        self.position = (self.position + num_transitions) % self.capacity
+        self.size = min(self.size + num_transitions, self.capacity)
+
+        return indices
+
+    def transitions(self, indices: np.ndarray, weights: np.ndarray = None) -> TransitionBatch:
+
+        if weights is None:
+            weights = np.ones(indices.shape, dtype=np.float32)
+
+        return TransitionBatch(indices, self.states[indices], self.actions[indices], self.rewards[indices],
+                               self.next_states[indices], self.dones[indices], weights)
+
+    def sample(self, batch_size: int) -> TransitionBatch:
+        """Transitions drawn uniformly with replacement."""
+
+        self._validate_not_empty()
+        return self.transitions(self._rng.integers(0, self.size, size=batch_size))
+
+    def sample_prioritized(self, batch_size: int, importance_exponent: float = 0.4) -> TransitionBatch:
+        """Transitions drawn with replacement with probability priority / total priority, one from each of batch_size
+        equal ranges of total priority. Weights are (size * probability) ** -importance_exponent, divided by the
+        largest weight of the batch."""
+
+        if self._priorities is None:
+            raise ValueError("prioritized sampling requires priority_exponent > 0")
+
+        self._validate_not_empty()
+
+        total = self._priorities.total()
+        values = (np.arange(batch_size) + self._rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self._priorities.find(values), self.size - 1)
+
+        probabilities = self._priorities.priorities(indices) / total
+        weights = (self.size * probabilities) ** -importance_exponent
+
+        return self.transitions(indices, (weights / weights.max()).astype(np.float32))
+
+    def update_priorities(self, indices: np.ndarray, errors: np.ndarray) -> None:
+        """Sets the priorities of sampled transitions to (|error| + PRIORITY_EPSILON) ** priority_exponent, e.g. from
+        their td errors."""
+
+        if self._priorities is None:
+            raise ValueError("prioritized sampling requires priority_exponent > 0")
+
+        priorities = (np.abs(errors) + ReplayBuffer.PRIORITY_EPSILON) ** self.priority_exponent
+
+        self._priorities.update(indices, priorities)
+        self._max_priority = max(self._max_priority, float(np.max(priorities, initial=0.0)))
+
+    def flush(self) -> None:
+        """Writes memory mapped columns to disk."""
+
+        for column in self._columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def _validate_not_empty(self):
+        if self.size == 0:
+            raise ValueError("cannot sample from an empty replay buffer")
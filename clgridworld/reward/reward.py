@@ -1,6 +1,8 @@
 from typing import NamedTuple
 
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.state.state import GridWorldState
+from clgridworld.state.validator import TerminalStateMask
 
 
 class GridWorldReward(NamedTuple):
@@ -12,13 +14,22 @@ class GridWorldReward(NamedTuple):
 
 
 class GridWorldRewardFunction:
+    """Given the TerminalStateMask of a task, which covers the pits of its obstacle layer as well, whether the
+    player is in a pit is a lookup in it, otherwise it is evaluated from each state and the obstacles.
+    """
+
+    def __init__(self, reward: GridWorldReward = GridWorldReward(), obstacles: ObstacleLayer = None,
+                 terminal_state_mask: TerminalStateMask = None):
 
-    def __init__(self, reward: GridWorldReward = GridWorldReward()):
         self.reward = reward
+        self.obstacles = obstacles
+        self.terminal_state_mask = terminal_state_mask
 
     def calculate(self, curr_state: GridWorldState, next_state: GridWorldState) -> int:
 
-        if curr_state.is_in_pit() != next_state.is_in_pit():
+        is_in_pit = self._is_in_pit if self.terminal_state_mask is None else self.terminal_state_mask.is_in_pit
+
+        if is_in_pit(curr_state) != is_in_pit(next_state):
             return self.reward.player_moved_into_pit
 
         if curr_state.player != next_state.player:
@@ -31,3 +42,6 @@ class GridWorldRewardFunction:
             return self.reward.player_unlocked_lock
 
         return self.reward.no_movement
+
+    def _is_in_pit(self, state: GridWorldState) -> bool:
+        return state.is_in_pit() or (self.obstacles is not None and self.obstacles.is_pit(state.player))
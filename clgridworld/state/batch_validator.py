@@ -0,0 +1,152 @@
+from typing import NamedTuple, Sequence, Optional, Tuple
+
+import numpy as np
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.vector.batch_grid_world import ABSENT
+
+
+class BatchValidationResult(NamedTuple):
+    is_valid: np.ndarray
+    reasons: np.ndarray
+
+
+class BatchLayoutValidator:
+    """Checks the same constraints as the validator behind GridWorldStateFactory.create for arrays of layouts.
+
+    Coords are (num_layouts, 2) integer arrays with ABSENT rows for missing objects, shape is either one shape for
+    every layout or a (num_layouts, 2) array. Each invalid layout gets the reason code of the first check that
+    GridWorldStateFactory.create would have failed on, valid layouts get VALID.
+    """
+
+    VALID = 0
+    MISSING_KEY_AND_LOCK = 1
+    UNPAIRED_PIT_COORDS = 2
+    PLAYER_OUT_OF_BOUNDS = 3
+    KEY_OUT_OF_BOUNDS = 4
+    LOCK_OUT_OF_BOUNDS = 5
+    PIT_START_OUT_OF_BOUNDS = 6
+    PIT_END_OUT_OF_BOUNDS = 7
+    PLAYER_ON_KEY = 8
+    PLAYER_ON_LOCK = 9
+    KEY_ON_LOCK = 10
+    PLAYER_IN_PIT = 11
+    LOCK_IN_PIT = 12
+    KEY_IN_PIT = 13
+    PLAYER_ON_BEACON = 14
+    LOCK_ON_BEACON = 15
+    KEY_ON_BEACON = 16
+    PLAYER_ON_OBSTACLE = 17
+    KEY_ON_OBSTACLE = 18
+    LOCK_ON_OBSTACLE = 19
+
+    NAMES = {
+        VALID: "valid",
+        MISSING_KEY_AND_LOCK: "missing key and lock",
+        UNPAIRED_PIT_COORDS: "unpaired pit coords",
+        PLAYER_OUT_OF_BOUNDS: "player out of bounds",
+        KEY_OUT_OF_BOUNDS: "key out of bounds",
+        LOCK_OUT_OF_BOUNDS: "lock out of bounds",
+        PIT_START_OUT_OF_BOUNDS: "pit start out of bounds",
+        PIT_END_OUT_OF_BOUNDS: "pit end out of bounds",
+        PLAYER_ON_KEY: "player on key",
+        PLAYER_ON_LOCK: "player on lock",
+        KEY_ON_LOCK: "key on lock",
+        PLAYER_IN_PIT: "player in pit",
+        LOCK_IN_PIT: "lock in pit",
+        KEY_IN_PIT: "key in pit",
+        PLAYER_ON_BEACON: "player on beacon",
+        LOCK_ON_BEACON: "lock on beacon",
+        KEY_ON_BEACON: "key on beacon",
+        PLAYER_ON_OBSTACLE: "player on obstacle",
+        KEY_ON_OBSTACLE: "key on obstacle",
+        LOCK_ON_OBSTACLE: "lock on obstacle",
+    }
+
+    @staticmethod
+    def validate(shape, player: np.ndarray, key: np.ndarray, lock: np.ndarray, pit_start: np.ndarray,
+                 pit_end: np.ndarray, obstacles: ObstacleLayer = None) -> BatchValidationResult:
+        """The obstacle layer, if any, is shared by every layout, all of which must have its shape."""
+
+        player, key, lock, pit_start, pit_end = [np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+                                                 for coords in [player, key, lock, pit_start, pit_end]]
+
+        shape = np.broadcast_to(np.asarray(shape, dtype=np.int64), player.shape)
+        reasons = np.zeros(player.shape[0], dtype=np.int64)
+
+        def fail(reason: int, is_failed: np.ndarray):
+            reasons[(reasons == BatchLayoutValidator.VALID) & is_failed] = reason
+
+        key_is_present = ~np.all(key == ABSENT, axis=1)
+        lock_is_present = ~np.all(lock == ABSENT, axis=1)
+        pit_start_is_present = ~np.all(pit_start == ABSENT, axis=1)
+        pit_end_is_present = ~np.all(pit_end == ABSENT, axis=1)
+        pit_is_present = pit_start_is_present & pit_end_is_present
+
+        def is_in_bounds(coords: np.ndarray) -> np.ndarray:
+            return np.all((0 <= coords) & (coords < shape), axis=1)
+
+        def is_in_pit(coords: np.ndarray) -> np.ndarray:
+            return pit_is_present & np.all((pit_start <= coords) & (coords <= pit_end), axis=1)
+
+        def coords_equal(coords: np.ndarray, other_coords: np.ndarray) -> np.ndarray:
+            return np.all(coords == other_coords, axis=1)
+
+        fail(BatchLayoutValidator.MISSING_KEY_AND_LOCK, ~key_is_present & ~lock_is_present)
+        fail(BatchLayoutValidator.UNPAIRED_PIT_COORDS, pit_start_is_present != pit_end_is_present)
+
+        fail(BatchLayoutValidator.PLAYER_OUT_OF_BOUNDS, ~is_in_bounds(player))
+        fail(BatchLayoutValidator.KEY_OUT_OF_BOUNDS, key_is_present & ~is_in_bounds(key))
+        fail(BatchLayoutValidator.LOCK_OUT_OF_BOUNDS, lock_is_present & ~is_in_bounds(lock))
+        fail(BatchLayoutValidator.PIT_START_OUT_OF_BOUNDS, pit_start_is_present & ~is_in_bounds(pit_start))
+        fail(BatchLayoutValidator.PIT_END_OUT_OF_BOUNDS, pit_end_is_present & ~is_in_bounds(pit_end))
+
+        fail(BatchLayoutValidator.PLAYER_ON_KEY, key_is_present & coords_equal(player, key))
+        fail(BatchLayoutValidator.PLAYER_ON_LOCK, lock_is_present & coords_equal(player, lock))
+        fail(BatchLayoutValidator.KEY_ON_LOCK, key_is_present & lock_is_present & coords_equal(key, lock))
+
+        fail(BatchLayoutValidator.PLAYER_IN_PIT, is_in_pit(player))
+        fail(BatchLayoutValidator.LOCK_IN_PIT, lock_is_present & is_in_pit(lock))
+        fail(BatchLayoutValidator.KEY_IN_PIT, key_is_present & is_in_pit(key))
+
+        # beacons are checked one at a time in the same order as GridWorldStateFactory, each against every object
+        for beacon in [np.stack([pit_start[:, 0] - 1, pit_end[:, 1] + 1], axis=1),
+                       np.stack([pit_start[:, 0] - 1, pit_start[:, 1] - 1], axis=1),
+                       pit_end + 1,
+                       np.stack([pit_end[:, 0] + 1, pit_start[:, 1] - 1], axis=1)]:
+
+            beacon_is_present = pit_is_present & is_in_bounds(beacon)
+
+            fail(BatchLayoutValidator.PLAYER_ON_BEACON, beacon_is_present & coords_equal(player, beacon))
+            fail(BatchLayoutValidator.LOCK_ON_BEACON, beacon_is_present & lock_is_present & coords_equal(lock, beacon))
+            fail(BatchLayoutValidator.KEY_ON_BEACON, beacon_is_present & key_is_present & coords_equal(key, beacon))
+
+        if obstacles is not None:
+
+            if np.any(shape != obstacles.shape):
+                raise ValueError("obstacle layer shape %s not equal to every grid shape" % (obstacles.shape,))
+
+            is_obstacle = obstacles.wall_mask() | obstacles.pit_mask()
+
+            def is_on_obstacle(coords: np.ndarray) -> np.ndarray:
+                # coords out of bounds have already failed, clipped only to index safely
+                coords = np.clip(coords, 0, np.asarray(obstacles.shape) - 1)
+                return is_obstacle[coords[:, 0], coords[:, 1]]
+
+            fail(BatchLayoutValidator.PLAYER_ON_OBSTACLE, is_on_obstacle(player))
+            fail(BatchLayoutValidator.KEY_ON_OBSTACLE, key_is_present & is_on_obstacle(key))
+            fail(BatchLayoutValidator.LOCK_ON_OBSTACLE, lock_is_present & is_on_obstacle(lock))
+
+        return BatchValidationResult(reasons == BatchLayoutValidator.VALID, reasons)
+
+    @staticmethod
+    def coords_array(coords_list: Sequence[Optional[Tuple[int, int]]]) -> np.ndarray:
+        """(num_layouts, 2) array of optional coords with ABSENT rows for None."""
+
+        array = np.full((len(coords_list), 2), ABSENT, dtype=np.int64)
+
+        for i, coords in enumerate(coords_list):
+            if coords is not None:
+                array[i] = coords
+
+        return array
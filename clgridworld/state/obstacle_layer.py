@@ -0,0 +1,83 @@
+import hashlib
+from typing import Iterable, Tuple
+
+import numpy as np
+
+
+class ObstacleLayer:
+    """Walls and pits of a task, packed eight cells to a byte and shared by every state of the task.
+
+    Walls block the player like the beacons do and entering a pit ends the episode like the pit of a state. Lookups
+    index the packed bytes directly so their cost does not depend on the grid size or the number of obstacles.
+    """
+
+    def __init__(self, shape: Tuple[int, int], walls: np.ndarray = None, pits: np.ndarray = None):
+
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._num_cols = self.shape[1]
+
+        walls = np.zeros(self.shape, dtype=bool) if walls is None else np.asarray(walls, dtype=bool)
+        pits = np.zeros(self.shape, dtype=bool) if pits is None else np.asarray(pits, dtype=bool)
+
+        if walls.shape != self.shape or pits.shape != self.shape:
+            raise ValueError("walls shape %s and pits shape %s not equal to grid shape %s" %
+                             (walls.shape, pits.shape, self.shape))
+
+        if np.any(walls & pits):
+            raise ValueError("walls overlap with pits")
+
+        self._walls = np.packbits(walls.ravel()).tobytes()
+        self._pits = np.packbits(pits.ravel()).tobytes()
+
+    @staticmethod
+    def from_coords(shape: Tuple[int, int], walls: Iterable[Tuple[int, int]] = (),
+                    pits: Iterable[Tuple[int, int]] = ()) -> 'ObstacleLayer':
+
+        wall_mask = np.zeros(shape, dtype=bool)
+        pit_mask = np.zeros(shape, dtype=bool)
+
+        for coords in walls:
+            wall_mask[coords] = True
+
+        for coords in pits:
+            pit_mask[coords] = True
+
+        return ObstacleLayer(shape, wall_mask, pit_mask)
+
+    def is_wall(self, coords: Tuple[int, int]) -> bool:
+        cell = coords[0] * self._num_cols + coords[1]
+        return (self._walls[cell >> 3] >> (7 - (cell & 7))) & 1 == 1
+
+    def is_pit(self, coords: Tuple[int, int]) -> bool:
+        cell = coords[0] * self._num_cols + coords[1]
+        return (self._pits[cell >> 3] >> (7 - (cell & 7))) & 1 == 1
+
+    def wall_mask(self) -> np.ndarray:
+        return self._unpack(self._walls)
+
+    def pit_mask(self) -> np.ndarray:
+        return self._unpack(self._pits)
+
+    def _unpack(self, packed: bytes) -> np.ndarray:
+        num_cells = self.shape[0] * self.shape[1]
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=num_cells)
+        return bits.astype(bool).reshape(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._walls) + len(self._pits)
+
+    def digest(self) -> str:
+        """Content hash, equal for layers with the same shape, walls and pits."""
+        return hashlib.sha1(repr(self.shape).encode("utf-8") + self._walls + self._pits).hexdigest()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ObstacleLayer) and \
+               (self.shape, self._walls, self._pits) == (other.shape, other._walls, other._pits)
+
+    def __hash__(self) -> int:
+        return hash((self.shape, self._walls, self._pits))
+
+    def __repr__(self) -> str:
+        return "ObstacleLayer(shape=%s, num_walls=%s, num_pits=%s)" % \
+               (self.shape, int(self.wall_mask().sum()), int(self.pit_mask().sum()))
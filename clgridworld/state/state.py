@@ -2,7 +2,10 @@ from typing import NamedTuple, Tuple, Optional
 
 from gym import spaces
 
-_NONE = (-1. - 1)
+# sentinel for arguments not passed to GridWorldState.copy, compared by identity
+_NONE = object()
+
+_tuple_new = tuple.__new__
 
 
 class GridWorldState(NamedTuple):
@@ -54,20 +57,30 @@ class GridWorldState(NamedTuple):
              sw_beacon: Tuple[int, int] = _NONE,
              se_beacon: Tuple[int, int] = _NONE,
              has_key: int = _NONE):
-        grid_shape = self.grid_shape if grid_shape == _NONE else grid_shape
-        player = self.player if player == _NONE else player
-        key = self.key if key == _NONE else key
-        lock = self.lock if lock == _NONE else lock
-        pit_start = self.pit_start if pit_start == _NONE else pit_start
-        pit_end = self.pit_end if pit_end == _NONE else pit_end
-        nw_beacon = self.nw_beacon if nw_beacon == _NONE else nw_beacon
-        ne_beacon = self.ne_beacon if ne_beacon == _NONE else ne_beacon
-        sw_beacon = self.sw_beacon if sw_beacon == _NONE else sw_beacon
-        se_beacon = self.se_beacon if se_beacon == _NONE else se_beacon
-        has_key = self.has_key if has_key == _NONE else has_key
-
-        return GridWorldState(grid_shape, player, key, lock, pit_start, pit_end,
-                              nw_beacon, ne_beacon, sw_beacon, se_beacon, has_key)
+
+        return _tuple_new(GridWorldState, (
+            self.grid_shape if grid_shape is _NONE else grid_shape,
+            self.player if player is _NONE else player,
+            self.key if key is _NONE else key,
+            self.lock if lock is _NONE else lock,
+            self.pit_start if pit_start is _NONE else pit_start,
+            self.pit_end if pit_end is _NONE else pit_end,
+            self.nw_beacon if nw_beacon is _NONE else nw_beacon,
+            self.ne_beacon if ne_beacon is _NONE else ne_beacon,
+            self.sw_beacon if sw_beacon is _NONE else sw_beacon,
+            self.se_beacon if se_beacon is _NONE else se_beacon,
+            self.has_key if has_key is _NONE else has_key))
+
+    # targeted updates used on every step, built from slices of the underlying tuple to skip argument handling
+
+    def with_player(self, player: Tuple[int, int]) -> 'GridWorldState':
+        return _tuple_new(GridWorldState, (self[0], player) + self[2:])
+
+    def with_key_picked_up(self) -> 'GridWorldState':
+        return _tuple_new(GridWorldState, self[:2] + (None,) + self[3:10] + (1,))
+
+    def with_lock_unlocked(self) -> 'GridWorldState':
+        return _tuple_new(GridWorldState, self[:3] + (None,) + self[4:])
 
 
 class GridWorldObservationSpace(spaces.Tuple):
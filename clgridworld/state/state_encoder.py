@@ -0,0 +1,87 @@
+import numpy as np
+
+from clgridworld.state.state import GridWorldState
+from clgridworld.vector.batch_grid_world import BatchGridWorldState, ABSENT
+
+
+class GridWorldStateEncoder:
+    """Bijective mapping between the states of a task and the integers [0, num_states).
+
+    Within a task only the player coords, has_key and whether the lock is still present change, the key is
+    present exactly when the player does not have it. A state is encoded as
+
+        ((player_row * num_cols + player_col) * 2 + has_key) * 2 + lock_is_present
+
+    so ids depend only on the grid shape and can index arrays directly. Decoding fills in the fixed coords from
+    the task's initial state.
+    """
+
+    def __init__(self, initial_state: GridWorldState):
+
+        self.initial_state = initial_state
+        self.num_rows, self.num_cols = initial_state.grid_shape
+        self.num_states = self.num_rows * self.num_cols * 4
+
+        self._initial_batch_state = BatchGridWorldState.from_states([initial_state])
+
+    def encode(self, state: GridWorldState) -> int:
+
+        player = state.player
+        lock_is_present = 0 if state.lock is None else 1
+        has_key = 1 if state.has_key else 0
+
+        return ((player[0] * self.num_cols + player[1]) * 2 + has_key) * 2 + lock_is_present
+
+    def decode(self, state_id: int) -> GridWorldState:
+
+        self._validate_state_id(state_id)
+
+        cell, lock_is_present = divmod(state_id, 2)
+        cell, has_key = divmod(cell, 2)
+        player = divmod(cell, self.num_cols)
+
+        initial_state = self.initial_state
+
+        return initial_state.copy(player=player,
+                                  key=None if has_key else initial_state.key,
+                                  lock=initial_state.lock if lock_is_present else None,
+                                  has_key=bool(has_key))
+
+    def encode_batch(self, batch_state: BatchGridWorldState) -> np.ndarray:
+
+        player = batch_state.player
+        has_key = batch_state.has_key.astype(np.int64)
+        lock_is_present = batch_state.lock_is_present().astype(np.int64)
+
+        return ((player[:, 0] * self.num_cols + player[:, 1]) * 2 + has_key) * 2 + lock_is_present
+
+    def decode_batch(self, state_ids: np.ndarray) -> BatchGridWorldState:
+
+        state_ids = np.asarray(state_ids, dtype=np.int64)
+
+        if np.any((state_ids < 0) | (state_ids >= self.num_states)):
+            raise ValueError("state ids not in range [0, %s)" % self.num_states)
+
+        lock_is_present = (state_ids % 2).astype(bool)
+        has_key = ((state_ids // 2) % 2).astype(bool)
+        cell = state_ids // 4
+        player = np.stack([cell // self.num_cols, cell % self.num_cols], axis=1)
+
+        initial_state = self._initial_batch_state
+        num_states = state_ids.shape[0]
+
+        def repeat(coords: np.ndarray) -> np.ndarray:
+            return np.repeat(coords, num_states, axis=0)
+
+        key = np.where(has_key[:, np.newaxis], ABSENT, repeat(initial_state.key))
+        lock = np.where(lock_is_present[:, np.newaxis], repeat(initial_state.lock), ABSENT)
+
+        return BatchGridWorldState(repeat(initial_state.grid_shape), player, key, lock,
+                                   repeat(initial_state.pit_start), repeat(initial_state.pit_end),
+                                   repeat(initial_state.nw_beacon), repeat(initial_state.ne_beacon),
+                                   repeat(initial_state.sw_beacon), repeat(initial_state.se_beacon), has_key)
+
+    def _validate_state_id(self, state_id: int):
+
+        if not 0 <= state_id < self.num_states:
+            raise ValueError("state id %s not in range [0, %s)" % (state_id, self.num_states))
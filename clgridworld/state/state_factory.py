@@ -1,3 +1,7 @@
+import numpy as np
+
+from clgridworld.state.batch_validator import BatchLayoutValidator, BatchValidationResult
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.state.state import GridWorldState
 
 
@@ -5,13 +9,15 @@ class GridWorldStateFactory:
 
     @staticmethod
     def create(shape: (int, int), player_coords: (int, int), key_coords: (int, int)=None, lock_coords: (int, int)=None,
-               pit_start_coords: (int, int)=None, pit_end_coords: (int, int)=None) -> GridWorldState:
+               pit_start_coords: (int, int)=None, pit_end_coords: (int, int)=None,
+               obstacles: ObstacleLayer = None) -> GridWorldState:
 
         ne_beacon_coords, nw_beacon_coords, se_beacon_coords, sw_beacon_coords = \
             GridWorldStateFactory._get_pit_beacon_coords(shape, pit_start_coords, pit_end_coords)
 
         _GridWorldStateValidator(shape, player_coords, key_coords, lock_coords, pit_start_coords, pit_end_coords,
-                                 ne_beacon_coords, nw_beacon_coords, se_beacon_coords, sw_beacon_coords).validate()
+                                 ne_beacon_coords, nw_beacon_coords, se_beacon_coords, sw_beacon_coords,
+                                 obstacles).validate()
 
         has_key = key_coords is None
 
@@ -29,6 +35,13 @@ class GridWorldStateFactory:
             has_key
         )
 
+    @staticmethod
+    def validate_batch(shape, player_coords: np.ndarray, key_coords: np.ndarray, lock_coords: np.ndarray,
+                       pit_start_coords: np.ndarray, pit_end_coords: np.ndarray,
+                       obstacles: ObstacleLayer = None) -> BatchValidationResult:
+        return BatchLayoutValidator.validate(shape, player_coords, key_coords, lock_coords, pit_start_coords,
+                                            pit_end_coords, obstacles)
+
     @staticmethod
     def _get_pit_beacon_coords(shape, pit_start_coords, pit_end_coords):
 
@@ -64,7 +77,7 @@ class _GridWorldStateValidator:
 
     def __init__(self, grid_shape: (int, int), player: (int, int), key: (int, int), lock: (int, int),
                  pit_start: (int, int), pit_end: (int, int), ne_beacon: (int, int), nw_beacon: (int, int),
-                 se_beacon: (int, int), sw_beacon: (int, int)):
+                 se_beacon: (int, int), sw_beacon: (int, int), obstacles: ObstacleLayer = None):
 
         self.grid_shape = grid_shape
         self.player = player
@@ -76,6 +89,7 @@ class _GridWorldStateValidator:
         self.nw_beacon = nw_beacon
         self.se_beacon = se_beacon
         self.sw_beacon = sw_beacon
+        self.obstacles = obstacles
 
     def validate(self):
         self._validate_key_lock_pairing()
@@ -84,6 +98,7 @@ class _GridWorldStateValidator:
         self._validate_basic_coords_dont_overlap()
         self._validate_coords_dont_overlap_with_pit()
         self._validate_coords_dont_overlap_with_beacons()
+        self._validate_coords_dont_overlap_with_obstacles()
 
     def _validate_key_lock_pairing(self):
 
@@ -164,3 +179,20 @@ class _GridWorldStateValidator:
 
             if self.key == beacon:
                 raise ValueError("key coords %s overlap with pit beacon coords %s" % (self.key, beacon))
+
+    def _validate_coords_dont_overlap_with_obstacles(self):
+
+        if self.obstacles is None:
+            return
+
+        if self.obstacles.shape != tuple(self.grid_shape):
+            raise ValueError("obstacle layer shape %s not equal to grid_shape %s" %
+                             (self.obstacles.shape, self.grid_shape))
+
+        for name, coords in [("player", self.player), ("key", self.key), ("lock", self.lock)]:
+
+            if coords is None:
+                continue
+
+            if self.obstacles.is_wall(coords) or self.obstacles.is_pit(coords):
+                raise ValueError("%s coords %s overlap with obstacle layer" % (name, coords))
@@ -1,3 +1,6 @@
+import numpy as np
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.state.state import GridWorldState
 
 
@@ -5,4 +8,56 @@ class TerminalStateValidator:
 
     @staticmethod
     def is_terminal_state(state: GridWorldState) -> bool:
-        return state.is_in_pit() or (state.player_has_key() and state.lock_is_unlocked())
\ No newline at end of file
+        return state.is_in_pit() or (state.player_has_key() and state.lock_is_unlocked())
+
+
+class ObstacleTerminalStateValidator:
+    """TerminalStateValidator for tasks with an obstacle layer, the pits of the layer are terminal as well."""
+
+    def __init__(self, obstacles: ObstacleLayer):
+        self.obstacles = obstacles
+
+    def is_terminal_state(self, state: GridWorldState) -> bool:
+        return TerminalStateValidator.is_terminal_state(state) or self.obstacles.is_pit(state.player)
+
+
+class TerminalStateMask:
+    """TerminalStateValidator precomputed for every state of a task, the check is one lookup in a flat mask.
+
+    The mask is indexed by player cell, has_key and whether the lock is present, the same layout as the ids of
+    GridWorldStateEncoder. Pits of an obstacle layer are terminal as well. Whether the player is in a pit is a
+    lookup in the per cell mask it is built from.
+    """
+
+    def __init__(self, initial_state: GridWorldState, obstacles: ObstacleLayer = None):
+
+        self._num_cols = initial_state.grid_shape[1]
+
+        is_in_pit = np.zeros(initial_state.grid_shape, dtype=bool)
+
+        pit_start = initial_state.pit_start
+        pit_end = initial_state.pit_end
+
+        if pit_start is not None and pit_end is not None:
+            is_in_pit[pit_start[0]:pit_end[0] + 1, pit_start[1]:pit_end[1] + 1] = True
+
+        if obstacles is not None:
+            is_in_pit |= obstacles.pit_mask()
+
+        has_key = np.array([False, True])[:, np.newaxis]
+        lock_is_present = np.array([False, True])[np.newaxis, :]
+
+        is_terminal = is_in_pit[:, :, np.newaxis, np.newaxis] | (has_key & ~lock_is_present)
+
+        self._is_in_pit = bytearray(is_in_pit.astype(np.uint8).tobytes())
+        self._is_terminal = bytearray(is_terminal.astype(np.uint8).tobytes())
+
+    def is_terminal_state(self, state: GridWorldState) -> bool:
+        row, col = state.player
+        return self._is_terminal[(row * self._num_cols + col) * 4 + (2 if state.has_key else 0) +
+                                 (0 if state.lock is None else 1)] == 1
+
+    def is_in_pit(self, state: GridWorldState) -> bool:
+        """Whether the player is in the pit of the task or of its obstacle layer."""
+        row, col = state.player
+        return self._is_in_pit[row * self._num_cols + col] == 1
@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+from collections import deque
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.dynamics.dynamics_engine import GridWorldDynamicsEngine
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.state.validator import TerminalStateMask
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+
+
+class ReachableStateSpace:
+    """Index of every state reachable from an initial state.
+
+    States are numbered in breadth first order from the initial state, which always has id 0, the same numbering as
+    TabularTransitionModel. Each state is stored as its GridWorldStateEncoder id in codes, adjacency holds the id of
+    the next state for every action, terminal states transition to themselves, and distances the minimum number of
+    steps from the initial state.
+
+    The arrays can be saved to a directory of .npy files and loaded back memory mapped without exploring again.
+    States are looked up by binary search of their encoder id over codes in code_order, so nothing the size of the
+    encoder's id space is held in memory.
+    """
+
+    INITIAL_STATE_ID = 0
+    UNREACHABLE = -1
+
+    _INITIAL_STATE_FILE = "initial_state.json"
+    _ARRAY_NAMES = ["codes", "adjacency", "distances", "done", "code_order"]
+
+    def __init__(self, initial_state: GridWorldState, codes: np.ndarray, adjacency: np.ndarray,
+                 distances: np.ndarray, done: np.ndarray, code_order: np.ndarray = None):
+
+        self.initial_state = initial_state
+        self.encoder = GridWorldStateEncoder(initial_state)
+
+        self.codes = codes
+        self.adjacency = adjacency
+        self.distances = distances
+        self.done = done
+
+        self.num_states, self.num_actions = adjacency.shape
+
+        # state ids ordered by their codes
+        self.code_order = np.argsort(codes, kind="stable") if code_order is None else code_order
+
+    def state(self, state_id: int) -> GridWorldState:
+        return self.encoder.decode(int(self.codes[state_id]))
+
+    def state_id(self, state: GridWorldState) -> int:
+
+        state_id = int(self._lookup(np.asarray([self.encoder.encode(state)]))[0])
+
+        if state_id == ReachableStateSpace.UNREACHABLE:
+            raise ValueError("state not reachable from initial state")
+
+        return state_id
+
+    def state_ids(self, batch_state: BatchGridWorldState) -> np.ndarray:
+        """Ids of a batch of states, ReachableStateSpace.UNREACHABLE for states not in the index."""
+        return self._lookup(self.encoder.encode_batch(batch_state))
+
+    def _lookup(self, codes: np.ndarray) -> np.ndarray:
+
+        positions = np.minimum(np.searchsorted(self.codes, codes, sorter=self.code_order), self.num_states - 1)
+        state_ids = np.asarray(self.code_order[positions], dtype=np.int64)
+
+        return np.where(self.codes[state_ids] == codes, state_ids, ReachableStateSpace.UNREACHABLE)
+
+    @staticmethod
+    def explore(initial_state: GridWorldState, obstacles: ObstacleLayer = None) -> 'ReachableStateSpace':
+
+        actions = sorted(GridWorldAction.NAMES)
+        dynamics = GridWorldDynamicsEngine(initial_state, obstacles)
+        terminal_state_mask = TerminalStateMask(initial_state, obstacles)
+        encoder = GridWorldStateEncoder(initial_state)
+
+        states = [initial_state]
+        state_ids = {initial_state: 0}
+        distances = [0]
+        adjacency_rows = []
+        done = []
+
+        queue = deque([initial_state])
+
+        while queue:
+
+            state = queue.popleft()
+            state_id = state_ids[state]
+
+            if terminal_state_mask.is_terminal_state(state):
+                adjacency_rows.append([state_id] * len(actions))
+                done.append(True)
+                continue
+
+            adjacency_row = []
+
+            for action in actions:
+
+                next_state = dynamics.step(state, action)
+
+                if next_state not in state_ids:
+                    state_ids[next_state] = len(states)
+                    states.append(next_state)
+                    distances.append(distances[state_id] + 1)
+                    queue.append(next_state)
+
+                adjacency_row.append(state_ids[next_state])
+
+            adjacency_rows.append(adjacency_row)
+            done.append(False)
+
+        return ReachableStateSpace(initial_state,
+                                   np.asarray([encoder.encode(state) for state in states], dtype=np.int64),
+                                   np.asarray(adjacency_rows, dtype=np.int64),
+                                   np.asarray(distances, dtype=np.int64),
+                                   np.asarray(done, dtype=bool))
+
+    def save(self, directory: str) -> None:
+        """Writes to a temporary directory first so a partially written index is never loaded."""
+
+        temp_directory = "%s.tmp-%s" % (directory, os.getpid())
+        os.makedirs(temp_directory)
+
+        with open(os.path.join(temp_directory, ReachableStateSpace._INITIAL_STATE_FILE), "w") as file:
+            json.dump([_json_field(field) for field in self.initial_state], file)
+
+        for name in ReachableStateSpace._ARRAY_NAMES:
+            np.save(os.path.join(temp_directory, name + ".npy"), getattr(self, name))
+
+        try:
+            os.rename(temp_directory, directory)
+        except OSError:
+            # saved concurrently by another process
+            shutil.rmtree(temp_directory)
+            if not os.path.isdir(directory):
+                raise
+
+    @staticmethod
+    def load(directory: str) -> 'ReachableStateSpace':
+
+        with open(os.path.join(directory, ReachableStateSpace._INITIAL_STATE_FILE)) as file:
+            fields = json.load(file)
+
+        initial_state = GridWorldState(*[tuple(field) if isinstance(field, list) else field for field in fields])
+
+        arrays = [np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+                  for name in ReachableStateSpace._ARRAY_NAMES]
+
+        return ReachableStateSpace(initial_state, *arrays)
+
+
+def _json_field(field):
+    """State field as plain python values, coords may hold numpy ints which json can not serialize."""
+
+    if field is None:
+        return None
+
+    if isinstance(field, tuple):
+        return [int(coord) for coord in field]
+
+    return bool(field)
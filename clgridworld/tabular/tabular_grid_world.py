@@ -0,0 +1,60 @@
+import gym
+from gym import spaces
+
+from clgridworld.action.action import GridWorldActionSpace
+from clgridworld.tabular.transition_model import TabularTransitionModel
+
+
+class TabularGridWorld(gym.Env):
+    """Grid world whose observations are integer state ids and whose steps are table lookups."""
+
+    metadata = {'render.modes': ['human', 'ansi', 'rgb_array']}
+
+    def __init__(self, model: TabularTransitionModel, visualizer):
+
+        self.model = model
+        self.visualizer = visualizer
+
+        self.observation_space = spaces.Discrete(model.num_states)
+        self.action_space = GridWorldActionSpace()
+
+        # python lists index faster than numpy arrays for single elements
+        self._next_state = model.next_state.tolist()
+        self._reward = model.reward.tolist()
+        self._done = model.done.tolist()
+
+        self.initial_state = TabularTransitionModel.INITIAL_STATE_ID
+        self.prev_state = self.initial_state
+        self.curr_state = self.initial_state
+
+    def step(self, action):
+
+        if self._done[self.curr_state]:
+            raise Exception("state is terminal state. No further actions allowed")
+
+        action = int(action)
+
+        self.prev_state = self.curr_state
+        self.curr_state = self._next_state[self.prev_state][action]
+
+        return self.curr_state, self._reward[self.prev_state][action], self._done[self.curr_state], {}
+
+    def reset(self):
+        self.prev_state = self.initial_state
+        self.curr_state = self.initial_state
+        return self.initial_state
+
+    def render(self, mode='human'):
+        return self.visualizer.render(self.model.states[self.curr_state], mode)
+
+    def close(self):
+        flush = getattr(self.visualizer, "flush", None)
+        if flush is not None:
+            flush()
+
+    def seed(self, seed=None):
+        self.observation_space.seed(seed)
+        self.action_space.seed(seed)
+
+    def __str__(self):
+        return "<TabularGridWorld" + str({"num_states": self.model.num_states}) + ">"
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import List
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.dynamics.dynamics import GridWorldDynamics
+from clgridworld.reward.reward import GridWorldRewardFunction
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.state.validator import TerminalStateMask
+
+
+class TabularTransitionModel:
+    """Dense transition tables over every state reachable from an initial state.
+
+    States are numbered in breadth first order from the initial state, which always has id 0. Terminal states
+    transition to themselves with a reward of 0.
+    """
+
+    INITIAL_STATE_ID = 0
+
+    def __init__(self, states: List[GridWorldState], next_state: np.ndarray, reward: np.ndarray, done: np.ndarray):
+
+        self.states = states
+        self.next_state = next_state
+        self.reward = reward
+        self.done = done
+
+        self.num_states, self.num_actions = next_state.shape
+
+        self._state_ids = {state: state_id for state_id, state in enumerate(states)}
+
+    def state_id(self, state: GridWorldState) -> int:
+        return self._state_ids[state]
+
+    @staticmethod
+    def compile(initial_state: GridWorldState, reward_function: GridWorldRewardFunction = None,
+                obstacles: ObstacleLayer = None) -> 'TabularTransitionModel':
+
+        terminal_state_mask = TerminalStateMask(initial_state, obstacles)
+
+        if reward_function is None:
+            reward_function = GridWorldRewardFunction(obstacles=obstacles, terminal_state_mask=terminal_state_mask)
+
+        actions = sorted(GridWorldAction.NAMES)
+
+        states = [initial_state]
+        state_ids = {initial_state: 0}
+        next_state_rows = []
+        reward_rows = []
+        done = []
+
+        queue = deque([initial_state])
+
+        while queue:
+
+            state = queue.popleft()
+            state_id = state_ids[state]
+
+            if terminal_state_mask.is_terminal_state(state):
+                next_state_rows.append([state_id] * len(actions))
+                reward_rows.append([0] * len(actions))
+                done.append(True)
+                continue
+
+            dynamics = GridWorldDynamics(state, obstacles)
+            next_state_row = []
+            reward_row = []
+
+            for action in actions:
+
+                next_state = dynamics.step(action)
+
+                if next_state not in state_ids:
+                    state_ids[next_state] = len(states)
+                    states.append(next_state)
+                    queue.append(next_state)
+
+                next_state_row.append(state_ids[next_state])
+                reward_row.append(reward_function.calculate(state, next_state))
+
+            next_state_rows.append(next_state_row)
+            reward_rows.append(reward_row)
+            done.append(False)
+
+        return TabularTransitionModel(states,
+                                      np.asarray(next_state_rows, dtype=np.int64),
+                                      np.asarray(reward_rows, dtype=np.int64),
+                                      np.asarray(done, dtype=bool))
@@ -0,0 +1,172 @@
+import os
+from typing import NamedTuple, Iterator, List
+
+import numpy as np
+
+
+class TrajectoryChunk(NamedTuple):
+    """One chunk of per step records, a column per field."""
+
+    episode: np.ndarray
+    step: np.ndarray
+    state: np.ndarray
+    action: np.ndarray
+    reward: np.ndarray
+    next_state: np.ndarray
+    done: np.ndarray
+
+    def num_steps(self) -> int:
+        return self.episode.shape[0]
+
+
+class Episode(NamedTuple):
+
+    episode_id: int
+    states: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    next_states: np.ndarray
+    dones: np.ndarray
+
+    def num_steps(self) -> int:
+        return self.actions.shape[0]
+
+    def total_reward(self) -> int:
+        return int(self.rewards.sum())
+
+
+class TrajectoryWriter:
+    """Writes chunks of per step records to a directory, each chunk a directory of one .npy file per column.
+
+    Chunks are append only, each write adds a new one. They are written to a temporary directory and renamed into
+    place so readers never see a partially written chunk. Writing to a directory with chunks appends after them.
+    """
+
+    CHUNK_PREFIX = "chunk_"
+
+    def __init__(self, directory: str, state_dtype=np.int64):
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.dtypes = TrajectoryChunk(episode=np.int64, step=np.int32, state=state_dtype, action=np.uint8,
+                                      reward=np.int32, next_state=state_dtype, done=np.bool_)
+
+        existing_chunks = chunk_directories(directory)
+
+        self.num_chunks = len(existing_chunks)
+        self.next_episode_id = _next_episode_id(existing_chunks)
+
+    def write(self, chunk: TrajectoryChunk) -> None:
+
+        if chunk.num_steps() == 0:
+            return
+
+        chunk_directory = os.path.join(self.directory, "%s%08d" % (TrajectoryWriter.CHUNK_PREFIX, self.num_chunks))
+        temp_directory = chunk_directory + ".tmp-%s" % os.getpid()
+        os.makedirs(temp_directory)
+
+        for name, column, dtype in zip(TrajectoryChunk._fields, chunk, self.dtypes):
+            np.save(os.path.join(temp_directory, name + ".npy"), np.asarray(column, dtype=dtype))
+
+        os.rename(temp_directory, chunk_directory)
+
+        self.num_chunks += 1
+        self.next_episode_id = max(self.next_episode_id, int(chunk.episode[-1]) + 1)
+
+
+class TrajectoryReader:
+    """Reads the chunks written by a TrajectoryWriter as memory mapped columns.
+
+    Episodes are read lazily, one chunk at a time. Episodes within a chunk are views of its memory mapped columns,
+    only episodes spanning chunks are copied.
+    """
+
+    def __init__(self, directory: str):
+
+        self.directory = directory
+        self.chunk_directories = chunk_directories(directory)
+
+    def num_chunks(self) -> int:
+        return len(self.chunk_directories)
+
+    def chunk(self, i: int) -> TrajectoryChunk:
+        return _load_chunk(self.chunk_directories[i])
+
+    def chunks(self) -> Iterator[TrajectoryChunk]:
+        return (self.chunk(i) for i in range(self.num_chunks()))
+
+    def num_steps(self) -> int:
+        return sum(chunk.num_steps() for chunk in self.chunks())
+
+    def column(self, name: str) -> np.ndarray:
+        """A column of every chunk, concatenated into memory."""
+
+        if name not in TrajectoryChunk._fields:
+            raise ValueError("unknown column %s" % name)
+
+        columns = [getattr(chunk, name) for chunk in self.chunks()]
+        return np.concatenate(columns) if columns else np.zeros(0)
+
+    def episodes(self) -> Iterator[Episode]:
+
+        pending = []
+
+        for chunk in self.chunks():
+
+            if chunk.num_steps() == 0:
+                continue
+
+            # start of each run of records of one episode
+            starts = np.flatnonzero(np.diff(chunk.episode)) + 1
+            bounds = [0] + starts.tolist() + [chunk.num_steps()]
+
+            for start, end in zip(bounds[:-1], bounds[1:]):
+
+                piece = TrajectoryChunk(*(column[start:end] for column in chunk))
+
+                if pending and pending[0].episode[0] != piece.episode[0]:
+                    yield _episode(pending)
+                    pending = []
+
+                pending.append(piece)
+
+        if pending:
+            yield _episode(pending)
+
+
+def chunk_directories(directory: str) -> List[str]:
+
+    if not os.path.isdir(directory):
+        return []
+
+    # temporary chunk directories have a suffix after the chunk number
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith(TrajectoryWriter.CHUNK_PREFIX) and name[len(TrajectoryWriter.CHUNK_PREFIX):]
+                   .isdigit())
+
+    return [os.path.join(directory, name) for name in names]
+
+
+def _load_chunk(chunk_directory: str) -> TrajectoryChunk:
+    return TrajectoryChunk(*(np.load(os.path.join(chunk_directory, name + ".npy"), mmap_mode="r")
+                             for name in TrajectoryChunk._fields))
+
+
+def _next_episode_id(chunk_dirs: List[str]) -> int:
+
+    if not chunk_dirs:
+        return 0
+
+    episode = _load_chunk(chunk_dirs[-1]).episode
+    return int(episode[-1]) + 1 if episode.shape[0] > 0 else 0
+
+
+def _episode(pieces: List[TrajectoryChunk]) -> Episode:
+
+    if len(pieces) == 1:
+        piece = pieces[0]
+    else:
+        piece = TrajectoryChunk(*(np.concatenate(columns) for columns in zip(*pieces)))
+
+    return Episode(int(piece.episode[0]), piece.state, piece.action, piece.reward, piece.next_state, piece.done)
@@ -0,0 +1,215 @@
+from typing import NamedTuple, Sequence, List
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction, GridWorldActionSpace
+from clgridworld.reward.reward import GridWorldReward
+from clgridworld.state.state import GridWorldState
+
+ABSENT = -1
+
+# row/col translation for each action, indexed by action id
+_ACTION_DELTAS = np.asarray([
+    (-1, 0),  # north
+    (0, 1),  # east
+    (1, 0),  # south
+    (0, -1),  # west
+    (0, 0),  # pick up key
+    (0, 0)  # unlock lock
+], dtype=np.int64)
+
+
+class BatchGridWorldState(NamedTuple):
+    """Struct-of-arrays form of N GridWorldStates.
+
+    Each coords field is an (N, 2) int64 array, absent coords (None in GridWorldState) are stored as ABSENT.
+    """
+    grid_shape: np.ndarray
+    player: np.ndarray
+    key: np.ndarray
+    lock: np.ndarray
+    pit_start: np.ndarray
+    pit_end: np.ndarray
+    nw_beacon: np.ndarray
+    ne_beacon: np.ndarray
+    sw_beacon: np.ndarray
+    se_beacon: np.ndarray
+    has_key: np.ndarray
+
+    @staticmethod
+    def from_states(states: Sequence[GridWorldState]) -> 'BatchGridWorldState':
+
+        columns = list(zip(*states))
+
+        coords_fields = [np.asarray([_coords_or_absent(coords) for coords in column], dtype=np.int64).reshape(-1, 2)
+                         for column in columns[:-1]]
+        has_key = np.asarray(columns[-1], dtype=bool)
+
+        return BatchGridWorldState(*coords_fields, has_key)
+
+    def num_states(self) -> int:
+        return self.player.shape[0]
+
+    def state(self, i: int) -> GridWorldState:
+
+        coords_fields = [_absent_or_coords(field[i]) for field in self[:-1]]
+        return GridWorldState(*coords_fields, bool(self.has_key[i]))
+
+    def to_states(self) -> List[GridWorldState]:
+        return [self.state(i) for i in range(self.num_states())]
+
+    def key_is_present(self) -> np.ndarray:
+        return self.key[:, 0] != ABSENT
+
+    def lock_is_present(self) -> np.ndarray:
+        return self.lock[:, 0] != ABSENT
+
+    def is_in_pit(self) -> np.ndarray:
+        return is_in_pit(self.player, self.pit_start, self.pit_end)
+
+    def is_terminal_state(self) -> np.ndarray:
+        return self.is_in_pit() | (self.has_key & ~self.lock_is_present())
+
+
+def _coords_or_absent(coords):
+    return (ABSENT, ABSENT) if coords is None else coords
+
+
+def _absent_or_coords(coords: np.ndarray):
+    return None if coords[0] == ABSENT else (int(coords[0]), int(coords[1]))
+
+
+def is_in_pit(player: np.ndarray, pit_start: np.ndarray, pit_end: np.ndarray) -> np.ndarray:
+
+    has_pit = pit_start[:, 0] != ABSENT
+
+    return has_pit & \
+        (pit_start[:, 0] <= player[:, 0]) & (player[:, 0] <= pit_end[:, 0]) & \
+        (pit_start[:, 1] <= player[:, 1]) & (player[:, 1] <= pit_end[:, 1])
+
+
+def step_states(state: BatchGridWorldState, actions: np.ndarray) -> BatchGridWorldState:
+    """Vectorized equivalent of GridWorldDynamics.step applied to every state in the batch."""
+
+    if np.any(state.is_terminal_state()):
+        raise Exception("state is terminal state. No further actions allowed")
+
+    actions = np.asarray(actions).astype(np.int64)
+    player = state.player
+
+    # pick up and unlock actions never move the player so are never blocked
+    new_player = move_players(state, actions)
+
+    key_is_present = state.key_is_present()
+
+    picks_up_key = (actions == GridWorldAction.PICK_UP_KEY) & key_is_present & \
+        _coords_are_next_to_each_other(player, state.key)
+
+    unlocks_lock = (actions == GridWorldAction.UNLOCK_LOCK) & ~key_is_present & \
+        state.lock_is_present() & _coords_are_next_to_each_other(player, state.lock)
+
+    new_key = np.where(picks_up_key[:, np.newaxis], ABSENT, state.key)
+    new_lock = np.where(unlocks_lock[:, np.newaxis], ABSENT, state.lock)
+    new_has_key = state.has_key | picks_up_key
+
+    return state._replace(player=new_player, key=new_key, lock=new_lock, has_key=new_has_key)
+
+
+def move_players(state: BatchGridWorldState, actions: np.ndarray) -> np.ndarray:
+    """Player coords after each action, players moving into a boundary or an immovable object stay in place."""
+
+    actions = np.asarray(actions).astype(np.int64)
+    player = state.player
+
+    new_player = player + _ACTION_DELTAS[actions]
+
+    moves_into_boundary = np.any((new_player < 0) | (new_player >= state.grid_shape), axis=1)
+
+    moves_into_immovable_object = _coords_equal(new_player, state.key) | _coords_equal(new_player, state.lock) | \
+        _coords_equal(new_player, state.nw_beacon) | _coords_equal(new_player, state.ne_beacon) | \
+        _coords_equal(new_player, state.sw_beacon) | _coords_equal(new_player, state.se_beacon)
+
+    is_blocked = moves_into_boundary | moves_into_immovable_object
+
+    return np.where(is_blocked[:, np.newaxis], player, new_player)
+
+
+def calculate_rewards(curr_state: BatchGridWorldState, next_state: BatchGridWorldState,
+                      reward: GridWorldReward = GridWorldReward()) -> np.ndarray:
+    """Vectorized equivalent of GridWorldRewardFunction.calculate applied to every transition in the batch."""
+
+    conditions = [
+        curr_state.is_in_pit() != next_state.is_in_pit(),
+        ~_coords_equal(curr_state.player, next_state.player),
+        curr_state.has_key != next_state.has_key,
+        ~_coords_equal(curr_state.lock, next_state.lock)
+    ]
+    choices = [
+        reward.player_moved_into_pit,
+        reward.player_moved_into_empty_space,
+        reward.player_picked_up_key,
+        reward.player_unlocked_lock
+    ]
+
+    return np.select(conditions, choices, default=reward.no_movement)
+
+
+def _coords_equal(coords1: np.ndarray, coords2: np.ndarray) -> np.ndarray:
+    return (coords1[:, 0] == coords2[:, 0]) & (coords1[:, 1] == coords2[:, 1])
+
+
+def _coords_are_next_to_each_other(coords1: np.ndarray, coords2: np.ndarray) -> np.ndarray:
+    return np.abs(coords1 - coords2).sum(axis=1) == 1
+
+
+class BatchGridWorld:
+    """N independent grid worlds stepped together with array operations.
+
+    Finished worlds are reset to their initial state automatically, the states they finished in are returned
+    in the info dict under "terminal_states".
+    """
+
+    def __init__(self, initial_states: Sequence[GridWorldState], reward: GridWorldReward = GridWorldReward()):
+
+        self.initial_state = BatchGridWorldState.from_states(initial_states)
+        self.reward = reward
+        self.num_envs = self.initial_state.num_states()
+        self.action_space = GridWorldActionSpace()
+
+        self.curr_state = self.initial_state
+
+    def step(self, actions: np.ndarray):
+
+        prev_state = self.curr_state
+        next_state = step_states(prev_state, actions)
+        rewards = calculate_rewards(prev_state, next_state, self.reward)
+        dones = next_state.is_terminal_state()
+
+        self.curr_state = self._reset_done(next_state, dones)
+        info = {"terminal_states": next_state}
+
+        return self.curr_state, rewards, dones, info
+
+    def _reset_done(self, state: BatchGridWorldState, dones: np.ndarray) -> BatchGridWorldState:
+
+        if not np.any(dones):
+            return state
+
+        initial_state = self.initial_state
+
+        return state._replace(
+            player=np.where(dones[:, np.newaxis], initial_state.player, state.player),
+            key=np.where(dones[:, np.newaxis], initial_state.key, state.key),
+            lock=np.where(dones[:, np.newaxis], initial_state.lock, state.lock),
+            has_key=np.where(dones, initial_state.has_key, state.has_key)
+        )
+
+    def reset(self) -> BatchGridWorldState:
+        self.curr_state = self.initial_state
+        return self.curr_state
+
+    def seed(self, seed=None):
+        self.action_space.seed(seed)
+
+    def __str__(self):
+        return "<BatchGridWorld" + str({"num_envs": self.num_envs}) + ">"
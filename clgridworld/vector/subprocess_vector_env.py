@@ -0,0 +1,315 @@
+import multiprocessing
+import os
+import traceback
+from typing import NamedTuple, Sequence, Callable, Optional, Tuple
+
+import gym
+import numpy as np
+
+from clgridworld.action.action import GridWorldActionSpace
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+_STEP = 0
+_RESET = 1
+_CLOSE = 2
+
+
+class _SharedArrays(NamedTuple):
+    """Raw shared memory of the arrays exchanged with the workers, picklable so it can be passed to them."""
+
+    observations: object
+    terminal_observations: object
+    actions: object
+    rewards: object
+    dones: object
+    num_envs: int
+    observation_shape: Tuple[int, ...]
+    observation_dtype: str
+
+    @staticmethod
+    def create(context, num_envs: int, observation_shape: Tuple[int, ...], observation_dtype) -> '_SharedArrays':
+
+        observation_dtype = np.dtype(observation_dtype)
+        observation_nbytes = num_envs * int(np.prod(observation_shape, dtype=np.int64)) * observation_dtype.itemsize
+
+        return _SharedArrays(context.RawArray("b", max(observation_nbytes, 1)),
+                             context.RawArray("b", max(observation_nbytes, 1)),
+                             context.RawArray("b", num_envs * 8), context.RawArray("b", num_envs * 8),
+                             context.RawArray("b", num_envs), num_envs, tuple(observation_shape),
+                             observation_dtype.str)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """observations, terminal observations, actions, rewards and dones as numpy views of the shared memory."""
+
+        observation_shape = (self.num_envs,) + self.observation_shape
+        observation_count = int(np.prod(observation_shape, dtype=np.int64))
+
+        return (np.frombuffer(self.observations, self.observation_dtype, observation_count).reshape(observation_shape),
+                np.frombuffer(self.terminal_observations, self.observation_dtype, observation_count)
+                .reshape(observation_shape),
+                np.frombuffer(self.actions, np.int64, self.num_envs),
+                np.frombuffer(self.rewards, np.int64, self.num_envs),
+                np.frombuffer(self.dones, np.bool_, self.num_envs))
+
+
+def _create_env(params: InitialStateParams, observation_wrapper: Optional[Callable[[gym.Env], gym.Env]]):
+    """Env of one task and the function mapping its observations to rows of the observation array."""
+
+    env = GridWorldBuilder.create(params)
+
+    if observation_wrapper is None:
+        return env, GridWorldStateEncoder(env.initial_state).encode
+
+    return observation_wrapper(env), None
+
+
+def _run_worker(connection, shared_arrays: _SharedArrays, start: int, params_list: Sequence[InitialStateParams],
+                observation_wrapper: Optional[Callable[[gym.Env], gym.Env]]) -> None:
+    """Steps the envs [start, start + len(params_list)) on each command, writing their results to shared memory.
+
+    Finished envs are reset, the observations they finished in are written to the terminal observations.
+    """
+
+    try:
+        envs = [_create_env(params, observation_wrapper) for params in params_list]
+    except Exception:
+        connection.send(traceback.format_exc())
+        return
+
+    observations, terminal_observations, actions, rewards, dones = shared_arrays.arrays()
+    end = start + len(envs)
+    indices = range(start, end)
+
+    connection.send(None)
+
+    while True:
+
+        try:
+            command = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if command == _CLOSE:
+            break
+
+        try:
+            if command == _STEP:
+
+                step_rewards = []
+                step_dones = []
+
+                # actions are read and rewards and dones written once per group, element access to arrays is slow
+                for i, (env, encode), action in zip(indices, envs, actions[start:end].tolist()):
+
+                    observation, reward, done, _ = env.step(action)
+
+                    if done:
+                        terminal_observations[i] = observation if encode is None else encode(observation)
+                        observation = env.reset()
+
+                    observations[i] = observation if encode is None else encode(observation)
+                    step_rewards.append(reward)
+                    step_dones.append(done)
+
+                rewards[start:end] = step_rewards
+                dones[start:end] = step_dones
+
+            elif command == _RESET:
+
+                for i, (env, encode) in zip(indices, envs):
+                    observation = env.reset()
+                    observations[i] = observation if encode is None else encode(observation)
+
+            connection.send(None)
+
+        except Exception:
+            connection.send(traceback.format_exc())
+
+    connection.close()
+
+
+class SubprocessVectorEnv:
+    """N GridWorlds, one per InitialStateParams, stepped in groups by worker processes.
+
+    Actions, observations, rewards and dones are exchanged through arrays in shared memory, only single command
+    ints go through the pipes to the workers. Observations are those of observation_wrapper applied to each
+    GridWorld, by default distance observations, or GridWorldStateEncoder ids when observation_wrapper is None. Ids
+    depend only on the grid shape, so without an observation wrapper every task must have the same shape.
+    observation_wrapper must be picklable, a class or module level function, and give observations of the same
+    shape for every task.
+
+    As in BatchGridWorld, finished envs are reset automatically and the observations they finished in are returned
+    in the info dict under "terminal_observations", rows of envs that did not finish are stale. Returned arrays are
+    copies, the shared arrays are overwritten by the next step.
+
+    step can be split into step_async, which sends the actions and returns immediately, and step_wait, so the
+    caller can work while the workers step.
+    """
+
+    def __init__(self, params_list: Sequence[InitialStateParams], num_workers: Optional[int] = None,
+                 observation_wrapper: Optional[Callable[[gym.Env], gym.Env]] = DistanceObservationWrapper,
+                 start_method: Optional[str] = None):
+
+        if len(params_list) == 0:
+            raise ValueError("params_list must not be empty")
+
+        num_workers = os.cpu_count() if num_workers is None else num_workers
+
+        if num_workers < 1:
+            raise ValueError("num_workers must be positive, got %d" % num_workers)
+
+        if observation_wrapper is None and len({tuple(params.shape) for params in params_list}) > 1:
+            raise ValueError("state ids of tasks with different grid shapes are not comparable, got shapes %s" %
+                             sorted({tuple(params.shape) for params in params_list}))
+
+        self.num_envs = len(params_list)
+        self.num_workers = min(num_workers, self.num_envs)
+        self.action_space = GridWorldActionSpace()
+
+        env, encode = _create_env(params_list[0], observation_wrapper)
+
+        if encode is None:
+            self.observation_space = env.observation_space
+            observation = np.asarray(env.reset())
+            observation_shape, observation_dtype = observation.shape, observation.dtype
+        else:
+            self.observation_space = gym.spaces.Discrete(GridWorldStateEncoder(env.initial_state).num_states)
+            observation_shape, observation_dtype = (), np.int64
+
+        context = multiprocessing.get_context(start_method)
+
+        shared_arrays = _SharedArrays.create(context, self.num_envs, observation_shape, observation_dtype)
+        self._observations, self._terminal_observations, self._actions, self._rewards, self._dones = \
+            shared_arrays.arrays()
+
+        self._connections = []
+        self._processes = []
+        self._waiting = False
+        self.closed = False
+
+        starts = np.cumsum([0] + [len(group) for group in np.array_split(np.arange(self.num_envs), self.num_workers)])
+
+        for start, end in zip(starts[:-1].tolist(), starts[1:].tolist()):
+
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=_run_worker, daemon=True,
+                                      args=(worker_connection, shared_arrays, start, list(params_list[start:end]),
+                                            observation_wrapper))
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        try:
+            self._receive()
+        except Exception:
+            self.close()
+            raise
+
+    def _send(self, command: int) -> None:
+
+        if self.closed:
+            raise ValueError("the vector env is closed")
+
+        for worker, connection in enumerate(self._connections):
+            try:
+                connection.send(command)
+            except (BrokenPipeError, EOFError):
+                raise RuntimeError("worker %d exited" % worker)
+
+    def _receive(self) -> None:
+        """Waits for every worker, raises the first error a worker reported."""
+
+        errors = []
+
+        for worker, connection in enumerate(self._connections):
+            try:
+                errors.append(connection.recv())
+            except EOFError:
+                errors.append("worker %d exited" % worker)
+
+        errors = [error for error in errors if error is not None]
+
+        if len(errors) > 0:
+            raise RuntimeError("worker failed:\n" + errors[0])
+
+    def reset(self) -> np.ndarray:
+
+        if self._waiting:
+            raise ValueError("step_wait must be called before reset")
+
+        self._send(_RESET)
+        self._receive()
+
+        return self._observations.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+
+        if self._waiting:
+            raise ValueError("step_wait must be called before stepping again")
+
+        actions = np.asarray(actions)
+
+        if actions.shape != (self.num_envs,):
+            raise ValueError("expected %d actions, got shape %s" % (self.num_envs, actions.shape))
+
+        self._actions[:] = actions
+        self._send(_STEP)
+        self._waiting = True
+
+    def step_wait(self):
+
+        if not self._waiting:
+            raise ValueError("step_async must be called before step_wait")
+
+        self._waiting = False
+        self._receive()
+
+        dones = self._dones.copy()
+        info = {"terminal_observations": self._terminal_observations.copy()}
+
+        return self._observations.copy(), self._rewards.copy(), dones, info
+
+    def step(self, actions: np.ndarray):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+
+        if self.closed:
+            return
+
+        self.closed = True
+
+        for connection in self._connections:
+            try:
+                if self._waiting:
+                    connection.recv()
+                connection.send(_CLOSE)
+            except (BrokenPipeError, EOFError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+        for connection in self._connections:
+            connection.close()
+
+        self._waiting = False
+
+    def seed(self, seed=None):
+        self.action_space.seed(seed)
+
+    def __enter__(self) -> 'SubprocessVectorEnv':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __str__(self):
+        return "<SubprocessVectorEnv" + str({"num_envs": self.num_envs, "num_workers": self.num_workers}) + ">"
@@ -0,0 +1,124 @@
+import sys
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
+from clgridworld.visualizer.rgb_grid_visualizer import RgbGridVisualizer
+
+_EMPTY = ord(GridStateVisualizer.EMPTY)
+_PLAYER = ord(GridStateVisualizer.PLAYER)
+_KEY = ord(GridStateVisualizer.KEY)
+_LOCK = ord(GridStateVisualizer.LOCK)
+
+
+class BufferedTextWriter:
+    """Collects text and writes it to the stream in bulk, every frames_per_write writes and on flush."""
+
+    def __init__(self, stream=None, frames_per_write: int = 1):
+
+        self.stream = stream
+        self.frames_per_write = frames_per_write
+
+        self._buffer = []
+
+    def write(self, text: str) -> None:
+
+        self._buffer.append(text)
+
+        if len(self._buffer) >= self.frames_per_write:
+            self.flush()
+
+    def flush(self) -> None:
+
+        if not self._buffer:
+            return
+
+        # sys.stdout looked up on every write so redirected output is respected
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write("".join(self._buffer))
+        self._buffer.clear()
+
+
+class CachedGridVisualizer:
+    """Text frames of the states of one task, in the same layout as printing a GridStateVisualizer grid.
+
+    The pit, beacons and obstacle layer never change within a task so they are drawn once into a background. Each
+    frame only restores the cells patched for the previous frame and patches in the player, key and lock. Rows are not
+    wrapped or summarised for wide grids as numpy would.
+
+    In 'human' mode frames are written to a BufferedTextWriter, in 'ansi' mode they are returned. In 'rgb_array' mode
+    an image is returned instead, drawn by an RgbGridVisualizer created on first use.
+    """
+
+    def __init__(self, initial_state: GridWorldState, obstacles: ObstacleLayer = None, stream=None,
+                 frames_per_write: int = 1):
+
+        self.initial_state = initial_state
+        self.obstacles = obstacles
+
+        num_rows, num_cols = initial_state.grid_shape
+
+        static_state = initial_state.copy(player=None, key=None, lock=None)
+        grid = GridStateVisualizer(static_state, obstacles).grid
+
+        lines = [("[[" if row == 0 else " [") + " ".join("'%s'" % char for char in grid[row]) + "]"
+                 for row in range(num_rows)]
+
+        self._background = bytearray(("\n".join(lines) + "]\n").encode("ascii"))
+        self._frame = bytearray(self._background)
+        self._patched_offsets = []
+
+        self._num_cols = num_cols
+        self._line_length = 4 * num_cols + 3
+
+        self.writer = BufferedTextWriter(stream, frames_per_write)
+        self.rgb_visualizer = None
+
+    def _offset(self, coords: (int, int)) -> int:
+        return coords[0] * self._line_length + 4 * coords[1] + 3
+
+    def frame(self, state: GridWorldState) -> str:
+
+        frame = self._frame
+        background = self._background
+
+        for offset in self._patched_offsets:
+            frame[offset] = background[offset]
+
+        self._patched_offsets = []
+
+        for coords, char in [(state.player, _PLAYER), (state.key, _KEY), (state.lock, _LOCK)]:
+
+            if coords is None:
+                continue
+
+            offset = self._offset(coords)
+
+            # the pit and beacons are drawn over the objects, as in GridStateVisualizer
+            if background[offset] == _EMPTY:
+                frame[offset] = char
+                self._patched_offsets.append(offset)
+
+        return frame.decode("ascii") + ("has_key: true\n" if state.has_key else "has_key: false\n")
+
+    def render(self, state: GridWorldState, mode: str = 'human'):
+
+        if mode == 'ansi':
+            return self.frame(state)
+
+        if mode == 'human':
+            self.writer.write(self.frame(state))
+            return None
+
+        if mode == 'rgb_array':
+
+            if self.rgb_visualizer is None:
+                self.rgb_visualizer = RgbGridVisualizer(self.initial_state, self.obstacles)
+
+            return self.rgb_visualizer.image(state)
+
+        raise ValueError("render mode %s not supported" % mode)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
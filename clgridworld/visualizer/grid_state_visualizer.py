@@ -1,5 +1,6 @@
 import numpy as np
 
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.state.state import GridWorldState
 
 
@@ -11,17 +12,18 @@ class GridStateVisualizer:
     LOCK = 'L'
     PIT = 'X'
     BEACON = 'B'
+    WALL = '#'
 
-    def __init__(self, state: GridWorldState):
+    def __init__(self, state: GridWorldState, obstacles: ObstacleLayer = None):
 
         self.state = state
+        self.obstacles = obstacles
 
         self.grid = self._create_grid()
 
     def _create_grid(self) -> np.ndarray:
 
-        grid = np.chararray(self.state.grid_shape, unicode=True)
-        grid[:] = GridStateVisualizer.EMPTY
+        grid = np.full(self.state.grid_shape, GridStateVisualizer.EMPTY, dtype='<U1')
 
         GridStateVisualizer._plot_if_not_null(grid, self.state.player, GridStateVisualizer.PLAYER)
         GridStateVisualizer._plot_if_not_null(grid, self.state.key, GridStateVisualizer.KEY)
@@ -30,6 +32,10 @@ class GridStateVisualizer:
         if self.state.pit_start is not None and self.state.pit_end is not None:
             grid[self.state.pit_start[0]:self.state.pit_end[0] + 1, self.state.pit_start[1]:self.state.pit_end[1] + 1] = GridStateVisualizer.PIT
 
+        if self.obstacles is not None:
+            grid[self.obstacles.pit_mask()] = GridStateVisualizer.PIT
+            grid[self.obstacles.wall_mask()] = GridStateVisualizer.WALL
+
         GridStateVisualizer._plot_if_not_null(grid, self.state.nw_beacon, GridStateVisualizer.BEACON)
         GridStateVisualizer._plot_if_not_null(grid, self.state.ne_beacon, GridStateVisualizer.BEACON)
         GridStateVisualizer._plot_if_not_null(grid, self.state.sw_beacon, GridStateVisualizer.BEACON)
@@ -0,0 +1,207 @@
+from functools import lru_cache
+
+import numpy as np
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state import GridWorldState
+from clgridworld.vector.batch_grid_world import ABSENT, BatchGridWorldState
+from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
+
+# tile codes, indexes into the tile lookup table
+EMPTY = 0
+PLAYER = 1
+KEY = 2
+LOCK = 3
+PIT = 4
+BEACON = 5
+WALL = 6
+
+CHARS = {
+    GridStateVisualizer.EMPTY: EMPTY,
+    GridStateVisualizer.PLAYER: PLAYER,
+    GridStateVisualizer.KEY: KEY,
+    GridStateVisualizer.LOCK: LOCK,
+    GridStateVisualizer.PIT: PIT,
+    GridStateVisualizer.BEACON: BEACON,
+    GridStateVisualizer.WALL: WALL,
+}
+
+BACKGROUND_COLOR = (255, 255, 255)
+GRID_LINE_COLOR = (200, 200, 200)
+
+# (colour, shape drawn on the background colour)
+TILE_STYLES = {
+    EMPTY: (BACKGROUND_COLOR, "full"),
+    PLAYER: ((31, 119, 180), "disc"),
+    KEY: ((255, 191, 0), "square"),
+    LOCK: ((140, 86, 75), "square"),
+    PIT: ((40, 40, 40), "full"),
+    BEACON: ((44, 160, 44), "disc"),
+    WALL: ((127, 127, 127), "full"),
+}
+
+DEFAULT_TILE_SIZE = 8
+
+
+@lru_cache(maxsize=None)
+def tile_table(tile_size: int = DEFAULT_TILE_SIZE) -> np.ndarray:
+    """(num tile codes, tile_size, tile_size, 3) uint8 lookup table of the image of each tile code."""
+
+    if tile_size < 1:
+        raise ValueError("tile_size must be positive, got %d" % tile_size)
+
+    ys, xs = np.mgrid[0:tile_size, 0:tile_size]
+    centre = (tile_size - 1) / 2
+    margin = tile_size // 4
+
+    shapes = {
+        "full": np.ones((tile_size, tile_size), dtype=bool),
+        "disc": (ys - centre) ** 2 + (xs - centre) ** 2 <= (0.35 * tile_size) ** 2,
+        "square": ((ys >= margin) & (ys < tile_size - margin) & (xs >= margin) & (xs < tile_size - margin)),
+    }
+
+    tiles = np.empty((len(TILE_STYLES), tile_size, tile_size, 3), dtype=np.uint8)
+    tiles[:] = BACKGROUND_COLOR
+
+    for code, (color, shape) in TILE_STYLES.items():
+        tiles[code][shapes[shape]] = color
+
+    # grid lines on the bottom and right edge of every tile, skipped when tiles are too small to see them
+    if tile_size >= 4:
+        tiles[:, -1, :] = GRID_LINE_COLOR
+        tiles[:, :, -1] = GRID_LINE_COLOR
+
+    # shared between callers through the cache
+    tiles.flags.writeable = False
+
+    return tiles
+
+
+def tiles_to_images(codes: np.ndarray, tiles: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Looks up the tile of every code of a (..., rows, cols) code array, giving a (..., rows * tile_size,
+    cols * tile_size, 3) uint8 image array. out, if given, must be a C contiguous uint8 array of that shape."""
+
+    tile_size = tiles.shape[1]
+    num_rows, num_cols = codes.shape[-2:]
+    leading_shape = codes.shape[:-2]
+
+    shape = leading_shape + (num_rows * tile_size, num_cols * tile_size, 3)
+
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    elif out.shape != shape or out.dtype != np.uint8 or not out.flags.c_contiguous:
+        raise ValueError("out must be a C contiguous uint8 array of shape %s, got %s %s" % (shape, out.dtype,
+                                                                                            out.shape))
+
+    # each tile row (tile_size pixels) is copied as a single element, taken in output order: pixel row i of the tiles
+    # of grid row r is row code * tile_size + i of the table
+    tile_row = np.dtype((np.void, 3 * tile_size))
+    tile_rows = tiles.reshape(-1, 3 * tile_size).view(tile_row)[:, 0]
+    indices = codes[..., np.newaxis, :].astype(np.intp) * tile_size + np.arange(tile_size)[:, np.newaxis]
+
+    # mode='clip' skips the buffered bounds check, codes always index the table
+    np.take(tile_rows, indices, mode='clip',
+            out=out.reshape(leading_shape + (num_rows, tile_size, num_cols * tile_size * 3)).view(tile_row))
+
+    return out
+
+
+class RgbGridVisualizer:
+    """HxWx3 uint8 images of the states of one task, one tile_size x tile_size tile per cell.
+
+    Cells are drawn as in GridStateVisualizer. The image of the pit, beacons and obstacle layer is drawn once,
+    each image is a copy of it with the player, key and lock tiles patched in.
+    """
+
+    def __init__(self, initial_state: GridWorldState, obstacles: ObstacleLayer = None,
+                 tile_size: int = DEFAULT_TILE_SIZE):
+
+        static_state = initial_state.copy(player=None, key=None, lock=None)
+
+        self.tile_size = tile_size
+        self.tiles = tile_table(tile_size)
+
+        self._background_codes = RgbGridVisualizer.tile_codes(GridStateVisualizer(static_state, obstacles).grid)
+        self._background = tiles_to_images(self._background_codes, self.tiles)
+
+    @staticmethod
+    def tile_codes(grid: np.ndarray) -> np.ndarray:
+        """Tile codes of a GridStateVisualizer grid."""
+
+        codes = np.zeros(grid.shape, dtype=np.uint8)
+
+        for char, code in CHARS.items():
+            codes[grid == char] = code
+
+        return codes
+
+    def image(self, state: GridWorldState, out: np.ndarray = None) -> np.ndarray:
+
+        if out is None:
+            out = self._background.copy()
+        else:
+            out[...] = self._background
+
+        tile_size = self.tile_size
+
+        for coords, code in [(state.player, PLAYER), (state.key, KEY), (state.lock, LOCK)]:
+
+            # the pit and beacons are drawn over the objects, as in GridStateVisualizer
+            if coords is None or self._background_codes[coords] != EMPTY:
+                continue
+
+            row, col = coords[0] * tile_size, coords[1] * tile_size
+            out[row:row + tile_size, col:col + tile_size] = self.tiles[code]
+
+        return out
+
+    @staticmethod
+    def batch_tile_codes(batch_state: BatchGridWorldState, obstacles: ObstacleLayer = None) -> np.ndarray:
+        """(N, rows, cols) tile codes of N states of the same grid shape, drawn as in GridStateVisualizer."""
+
+        grid_shape = batch_state.grid_shape
+
+        if grid_shape.shape[0] > 0 and np.any(grid_shape != grid_shape[0]):
+            raise ValueError("all states of the batch must have the same grid shape")
+
+        num_states = batch_state.num_states()
+        num_rows, num_cols = grid_shape[0] if num_states > 0 else (0, 0)
+
+        codes = np.full((num_states, num_rows, num_cols), EMPTY, dtype=np.uint8)
+        indices = np.arange(num_states)
+
+        def plot_if_present(coords: np.ndarray, code: int):
+            present = coords[:, 0] != ABSENT
+            codes[indices[present], coords[present, 0], coords[present, 1]] = code
+
+        plot_if_present(batch_state.player, PLAYER)
+        plot_if_present(batch_state.key, KEY)
+        plot_if_present(batch_state.lock, LOCK)
+
+        pit_start, pit_end = batch_state.pit_start, batch_state.pit_end
+        has_pit = (pit_start[:, 0] != ABSENT) & (pit_end[:, 0] != ABSENT)
+
+        rows, cols = np.arange(num_rows), np.arange(num_cols)
+        pit_rows = (rows >= pit_start[:, 0, np.newaxis]) & (rows <= pit_end[:, 0, np.newaxis])
+        pit_cols = (cols >= pit_start[:, 1, np.newaxis]) & (cols <= pit_end[:, 1, np.newaxis])
+
+        codes[pit_rows[:, :, np.newaxis] & pit_cols[:, np.newaxis, :] & has_pit[:, np.newaxis, np.newaxis]] = PIT
+
+        if obstacles is not None:
+            codes[:, obstacles.pit_mask()] = PIT
+            codes[:, obstacles.wall_mask()] = WALL
+
+        plot_if_present(batch_state.nw_beacon, BEACON)
+        plot_if_present(batch_state.ne_beacon, BEACON)
+        plot_if_present(batch_state.sw_beacon, BEACON)
+        plot_if_present(batch_state.se_beacon, BEACON)
+
+        return codes
+
+    @staticmethod
+    def batch_images(batch_state: BatchGridWorldState, obstacles: ObstacleLayer = None,
+                     tile_size: int = DEFAULT_TILE_SIZE, out: np.ndarray = None) -> np.ndarray:
+        """(N, H, W, 3) uint8 images of N states of the same grid shape, written into out when given."""
+
+        codes = RgbGridVisualizer.batch_tile_codes(batch_state, obstacles)
+        return tiles_to_images(codes, tile_table(tile_size), out)
@@ -0,0 +1,76 @@
+import numpy as np
+from gym import spaces
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.vector.batch_grid_world import BatchGridWorld, BatchGridWorldState, move_players, is_in_pit, ABSENT
+from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator
+
+_DIRECTIONAL_ACTIONS = [GridWorldAction.NORTH, GridWorldAction.EAST, GridWorldAction.SOUTH, GridWorldAction.WEST]
+
+
+def distance_observations(batch_state: BatchGridWorldState) -> np.ndarray:
+    """Vectorized equivalent of DistanceObservationWrapper.observation, returns one row of 17 features per state."""
+
+    num_states = batch_state.num_states()
+    is_terminal_state = batch_state.is_terminal_state()
+
+    # player coords after stepping north, east, south and west, shape (N, 4, 2)
+    step_players = np.stack([move_players(batch_state, np.full(num_states, action))
+                             for action in _DIRECTIONAL_ACTIONS], axis=1)
+    step_players = np.where(is_terminal_state[:, np.newaxis, np.newaxis], batch_state.player[:, np.newaxis],
+                            step_players)
+
+    beacons = np.stack([batch_state.nw_beacon, batch_state.ne_beacon, batch_state.sw_beacon, batch_state.se_beacon],
+                       axis=1)
+    beacon_distances = EuclideanDistanceCalculator.distances(step_players[:, :, np.newaxis], beacons[:, np.newaxis])
+    beacon_distances = np.where(beacons[:, np.newaxis, :, 0] == ABSENT, np.inf, beacon_distances)
+    closest_beacon_distances = beacon_distances.min(axis=2)
+    closest_beacon_distances[np.isinf(closest_beacon_distances)] = 0
+
+    step_is_in_pit = np.stack([is_in_pit(step_players[:, i], batch_state.pit_start, batch_state.pit_end)
+                               for i in range(len(_DIRECTIONAL_ACTIONS))], axis=1)
+
+    observations = np.empty((num_states, 17))
+    observations[:, 0:4] = _distances_to_item(step_players, batch_state.key)
+    observations[:, 4:8] = _distances_to_item(step_players, batch_state.lock)
+    observations[:, 8:12] = closest_beacon_distances
+    observations[:, 12:16] = step_is_in_pit
+    observations[:, 16] = batch_state.has_key
+
+    return observations
+
+
+def _distances_to_item(players: np.ndarray, item: np.ndarray) -> np.ndarray:
+
+    distances = EuclideanDistanceCalculator.distances(players, item[:, np.newaxis])
+    return np.where(item[:, np.newaxis, 0] == ABSENT, 0, distances)
+
+
+class BatchDistanceObservationWrapper:
+    """BatchGridWorld wrapper transforming the batch states into rows of distance observations."""
+
+    def __init__(self, env: BatchGridWorld):
+
+        self.env = env
+        self.num_envs = env.num_envs
+        self.action_space = env.action_space
+
+        max_coords = env.initial_state.grid_shape.max(axis=0)
+        max_dist = np.sqrt(np.sum(max_coords.astype(np.float64) ** 2))
+
+        observation_space_low = np.zeros(shape=(17,))
+        observation_space_high = np.zeros(shape=(17,))
+        observation_space_high[0:12] = max_dist
+        observation_space_high[12:17] = 1
+
+        self.observation_space = spaces.Box(low=observation_space_low, high=observation_space_high)
+
+    def step(self, actions: np.ndarray):
+        state, rewards, dones, info = self.env.step(actions)
+        return distance_observations(state), rewards, dones, info
+
+    def reset(self) -> np.ndarray:
+        return distance_observations(self.env.reset())
+
+    def seed(self, seed=None):
+        self.env.seed(seed)
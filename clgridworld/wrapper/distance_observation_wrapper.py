@@ -1,20 +1,27 @@
-from functools import lru_cache
+from typing import Sequence, List, Tuple
 
 import gym as gym
 import numpy as np
 from gym import spaces
 
 from clgridworld.action.action import GridWorldAction
-from clgridworld.dynamics.dynamics import GridWorldDynamics
+from clgridworld.cache.bounded_cache import BoundedCache, CacheInfo
+from clgridworld.dynamics.dynamics_engine import GridWorldDynamicsEngine
 from clgridworld.grid_world import GridWorld
 from clgridworld.state.state import GridWorldState
-from clgridworld.state.validator import TerminalStateValidator
-from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator
+from clgridworld.state.validator import TerminalStateMask
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+from clgridworld.wrapper.batch_distance_observation_wrapper import distance_observations
+from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator, EuclideanDistanceField
 
 
 class DistanceObservationWrapper(gym.ObservationWrapper):
 
-    def __init__(self, env: GridWorld):
+    DEFAULT_CACHE_CAPACITY = 4096
+
+    def __init__(self, env: GridWorld, cache_capacity: int = DEFAULT_CACHE_CAPACITY,
+                 cache_eviction_policy: str = BoundedCache.LRU):
 
         super(DistanceObservationWrapper, self).__init__(env)
 
@@ -28,10 +35,51 @@ class DistanceObservationWrapper(gym.ObservationWrapper):
 
         self.observation_space = spaces.Box(low=observation_space_low, high=observation_space_high)
 
-    @lru_cache(maxsize=None)
+        # look ahead steps walk into walls and pits of the env's obstacle layer like its own steps do, euclidean
+        # distances do not depend on it
+        self._obstacles = getattr(env, "obstacles", None)
+
+        self._initial_state = env.initial_state
+        self._observation_cache = BoundedCache(cache_capacity, cache_eviction_policy)
+        # built on the first observation that misses the cache, wrappers that only batch observe never need it
+        self._distance_field = None
+        self._dynamics = GridWorldDynamicsEngine(env.initial_state, self._obstacles)
+        self._terminal_state_mask = TerminalStateMask(env.initial_state, self._obstacles)
+
     def observation(self, observation: GridWorldState) -> np.ndarray:
+        """Distance observation of the state, returned arrays are read only as they are shared between callers.
+
+        States of the env's task are observed with its distance field, dynamics and obstacle layer. States of other
+        layouts, such as other tasks of the same grid shape, fall back to the batch path, which depends only on the
+        state and knows nothing of obstacle layers.
+        """
+
+        distance_observation = self._observation_cache.get(observation)
+
+        if distance_observation is None:
+
+            if self._is_task_state(observation):
+                distance_observation = self._calculate_observation(observation)
+            else:
+                distance_observation = self.observation_batch([observation])[0]
+
+            distance_observation.flags.writeable = False
+            self._observation_cache.put(observation, distance_observation)
 
-        is_terminal_state = TerminalStateValidator.is_terminal_state(observation)
+        return distance_observation
+
+    def _is_task_state(self, state: GridWorldState) -> bool:
+        """Whether the state has the grid, pit and, while present, key and lock of the env's initial state."""
+
+        initial_state = self._initial_state
+
+        return state.grid_shape == initial_state.grid_shape and state.pit_start == initial_state.pit_start and \
+            state.pit_end == initial_state.pit_end and (state.key is None or state.key == initial_state.key) and \
+            (state.lock is None or state.lock == initial_state.lock)
+
+    def _calculate_observation(self, observation: GridWorldState) -> np.ndarray:
+
+        is_terminal_state = self._terminal_state_mask.is_terminal_state(observation)
 
         if is_terminal_state:
 
@@ -42,38 +90,80 @@ class DistanceObservationWrapper(gym.ObservationWrapper):
 
         else:
 
-            dynamics = GridWorldDynamics(observation)
+            dynamics = self._dynamics
+
+            north_step = dynamics.step(observation, GridWorldAction.NORTH)
+            east_step = dynamics.step(observation, GridWorldAction.EAST)
+            south_step = dynamics.step(observation, GridWorldAction.SOUTH)
+            west_step = dynamics.step(observation, GridWorldAction.WEST)
+
+        distance_field = self._distance_field
 
-            north_step = dynamics.step(GridWorldAction.NORTH)
-            east_step = dynamics.step(GridWorldAction.EAST)
-            south_step = dynamics.step(GridWorldAction.SOUTH)
-            west_step = dynamics.step(GridWorldAction.WEST)
+        if distance_field is None:
+            distance_field = self._distance_field = EuclideanDistanceField.shared(self.env.initial_state)
 
-        north_step_distance_calculator = EuclideanDistanceCalculator(north_step)
-        east_step_distance_calculator = EuclideanDistanceCalculator(east_step)
-        south_step_distance_calculator = EuclideanDistanceCalculator(south_step)
-        west_step_distance_calculator = EuclideanDistanceCalculator(west_step)
+        is_in_pit = self._terminal_state_mask.is_in_pit
+
+        north_step_distances = distance_field.distances(north_step)
+        east_step_distances = distance_field.distances(east_step)
+        south_step_distances = distance_field.distances(south_step)
+        west_step_distances = distance_field.distances(west_step)
 
         return np.asarray([
-            north_step_distance_calculator.distance_to_key(),
-            east_step_distance_calculator.distance_to_key(),
-            south_step_distance_calculator.distance_to_key(),
-            west_step_distance_calculator.distance_to_key(),
-
-            north_step_distance_calculator.distance_to_lock(),
-            east_step_distance_calculator.distance_to_lock(),
-            south_step_distance_calculator.distance_to_lock(),
-            west_step_distance_calculator.distance_to_lock(),
-
-            north_step_distance_calculator.distance_to_closest_beacon(),
-            east_step_distance_calculator.distance_to_closest_beacon(),
-            south_step_distance_calculator.distance_to_closest_beacon(),
-            west_step_distance_calculator.distance_to_closest_beacon(),
-
-            1 if north_step.is_in_pit() else 0,
-            1 if east_step.is_in_pit() else 0,
-            1 if south_step.is_in_pit() else 0,
-            1 if west_step.is_in_pit() else 0,
+            north_step_distances.key,
+            east_step_distances.key,
+            south_step_distances.key,
+            west_step_distances.key,
+
+            north_step_distances.lock,
+            east_step_distances.lock,
+            south_step_distances.lock,
+            west_step_distances.lock,
+
+            north_step_distances.closest_beacon,
+            east_step_distances.closest_beacon,
+            south_step_distances.closest_beacon,
+            west_step_distances.closest_beacon,
+
+            1 if is_in_pit(north_step) else 0,
+            1 if is_in_pit(east_step) else 0,
+            1 if is_in_pit(south_step) else 0,
+            1 if is_in_pit(west_step) else 0,
 
             1 if observation.player_has_key() else 0
         ])
+
+
+    @staticmethod
+    def observation_batch(observations: Sequence[GridWorldState]) -> np.ndarray:
+        return distance_observations(BatchGridWorldState.from_states(observations))
+
+    def reachable_observations(self) -> Tuple[List[GridWorldState], np.ndarray]:
+        """Every state reachable from the initial state and its observation row."""
+
+        states = TabularTransitionModel.compile(self.env.initial_state, obstacles=self._obstacles).states
+
+        # batch observations know nothing of obstacle layers
+        if self._obstacles is not None:
+            return states, np.stack([self._calculate_observation(state) for state in states])
+
+        return states, self.observation_batch(states)
+
+    def prewarm_cache(self) -> int:
+        """Caches the observations of every reachable state, up to the cache capacity, returns the number cached."""
+
+        states, observations = self.reachable_observations()
+        observations.flags.writeable = False
+
+        num_cached = min(len(states), self._observation_cache.capacity)
+
+        for i in range(num_cached):
+            self._observation_cache.put(states[i], observations[i])
+
+        return num_cached
+
+    def cache_info(self) -> CacheInfo:
+        return self._observation_cache.info()
+
+    def clear_cache(self) -> None:
+        self._observation_cache.clear()
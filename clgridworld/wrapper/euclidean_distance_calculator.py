@@ -1,10 +1,18 @@
-from typing import Tuple
+import math
+import weakref
+from typing import Tuple, NamedTuple
 
 import numpy as np
 
 from clgridworld.state.state import GridWorldState
 
 
+class Distances(NamedTuple):
+    key: float
+    lock: float
+    closest_beacon: float
+
+
 class EuclideanDistanceCalculator:
 
     def __init__(self, state: GridWorldState):
@@ -34,7 +42,109 @@ class EuclideanDistanceCalculator:
 
         return EuclideanDistanceCalculator.distance(self.state.player, item)
 
+    def distances_from(self, players: np.ndarray) -> np.ndarray:
+        """Distances from each of the (N, 2) player coords to the key, lock and closest beacon of the state.
+
+        Returns an (N, 3) array, distances to absent items are 0.
+        """
+
+        players = np.asarray(players)
+        state = self.state
+
+        beacons = [beacon for beacon in [state.nw_beacon, state.ne_beacon, state.sw_beacon, state.se_beacon]
+                   if beacon is not None]
+
+        distances = np.zeros((players.shape[0], 3))
+        distances[:, 0] = EuclideanDistanceCalculator._distances_to_item(players, state.key)
+        distances[:, 1] = EuclideanDistanceCalculator._distances_to_item(players, state.lock)
+
+        if len(beacons) > 0:
+            beacon_distances = EuclideanDistanceCalculator.distances(players[:, np.newaxis], np.asarray(beacons))
+            distances[:, 2] = beacon_distances.min(axis=1)
+
+        return distances
+
+    @staticmethod
+    def _distances_to_item(players: np.ndarray, item) -> np.ndarray:
+
+        if item is None:
+            return np.zeros(players.shape[0])
+
+        return EuclideanDistanceCalculator.distances(players, np.asarray(item))
+
     @staticmethod
     def distance(x: Tuple[int, int], y: Tuple[int, int])->float:
-        return np.linalg.norm(np.asarray(x) - np.asarray(y))
+        # plain arithmetic gives the same result as np.linalg.norm, the squared distance of integer coords is exact
+        row_distance = x[0] - y[0]
+        col_distance = x[1] - y[1]
+        return math.sqrt(row_distance * row_distance + col_distance * col_distance)
+
+    @staticmethod
+    def distances(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Distances between broadcastable arrays of coords with the coords in the last axis."""
+
+        difference = (np.asarray(x) - np.asarray(y)).astype(np.float64)
+        return np.sqrt(difference[..., 0] * difference[..., 0] + difference[..., 1] * difference[..., 1])
+
+
+class EuclideanDistanceField:
+    """Distances from every cell of a task's grid to its key, lock and closest beacon, precomputed once.
+
+    Looking up the distances of a state is then array indexing. The key and lock never move within a task, only
+    disappear, so the state decides whether the distance to them is looked up or 0.
+
+    A field holds 3 floats per cell, shared returns the field of tasks with the same grid, key, lock and beacons to
+    every caller while any of them holds it.
+    """
+
+    _shared_fields = weakref.WeakValueDictionary()
+
+    def __init__(self, initial_state: GridWorldState):
+
+        rows, cols = np.indices(initial_state.grid_shape)
+        cells = np.stack([rows.ravel(), cols.ravel()], axis=1)
+
+        distances = EuclideanDistanceCalculator(initial_state).distances_from(cells)
+        distances = distances.reshape(initial_state.grid_shape + (3,))
+
+        self.key_distances = np.ascontiguousarray(distances[:, :, 0])
+        self.lock_distances = np.ascontiguousarray(distances[:, :, 1])
+        self.closest_beacon_distances = np.ascontiguousarray(distances[:, :, 2])
+
+    @staticmethod
+    def shared(initial_state: GridWorldState) -> 'EuclideanDistanceField':
+
+        # the player start does not change any distance
+        key = (initial_state.grid_shape, initial_state.key, initial_state.lock, initial_state.nw_beacon,
+               initial_state.ne_beacon, initial_state.sw_beacon, initial_state.se_beacon)
+
+        distance_field = EuclideanDistanceField._shared_fields.get(key)
+
+        if distance_field is None:
+            distance_field = EuclideanDistanceField(initial_state)
+            EuclideanDistanceField._shared_fields[key] = distance_field
+
+        return distance_field
+
+    def distances(self, state: GridWorldState) -> Distances:
+
+        player = state.player
+
+        key_distance = 0 if state.key is None else self.key_distances.item(player)
+        lock_distance = 0 if state.lock is None else self.lock_distances.item(player)
+
+        return Distances(key_distance, lock_distance, self.closest_beacon_distances.item(player))
+
+    def distances_from(self, players: np.ndarray, key_is_present: np.ndarray, lock_is_present: np.ndarray) \
+            -> np.ndarray:
+        """Distances of the (N, 2) player coords to the key, lock and closest beacon, as an (N, 3) array."""
+
+        rows = players[:, 0]
+        cols = players[:, 1]
+
+        distances = np.empty((players.shape[0], 3))
+        distances[:, 0] = np.where(key_is_present, self.key_distances[rows, cols], 0)
+        distances[:, 1] = np.where(lock_is_present, self.lock_distances[rows, cols], 0)
+        distances[:, 2] = self.closest_beacon_distances[rows, cols]
 
+        return distances
@@ -0,0 +1,132 @@
+import gym
+import numpy as np
+
+from clgridworld.grid_world import GridWorld
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.trajectory.trajectory_store import TrajectoryWriter, TrajectoryChunk
+
+
+class _StepBuffer:
+    """Next state ids, actions, rewards and dones of up to chunk_size steps, in columns allocated once.
+
+    Kept out of the wrapper as attribute lookups on a gym.Wrapper, which defines __getattr__, are slow.
+    """
+
+    def __init__(self, chunk_size: int, dtypes: TrajectoryChunk, encode):
+
+        self.next_state_ids = np.empty(chunk_size, dtype=dtypes.next_state)
+        self.actions = np.empty(chunk_size, dtype=dtypes.action)
+        self.rewards = np.empty(chunk_size, dtype=dtypes.reward)
+        self.dones = np.empty(chunk_size, dtype=dtypes.done)
+
+        self.chunk_size = chunk_size
+        self.num_steps = 0
+        self.encode = encode
+
+
+class TrajectoryRecorderWrapper(gym.Wrapper):
+    """Records every step of a GridWorld to a TrajectoryWriter, states as GridWorldStateEncoder ids.
+
+    Must wrap the GridWorld itself, observation wrappers go on top of it. Episodes are numbered on reset, continuing
+    after those already in the directory, and must be started with reset.
+
+    Steps are buffered in columns preallocated for chunk_size steps, and written as a chunk when they are full and
+    on flush and close. Per step only the next state id, action, reward and done are buffered. The episode, step and
+    state columns are derived from where each episode starts when the chunk is written.
+    """
+
+    DEFAULT_CHUNK_SIZE = 65536
+
+    def __init__(self, env: GridWorld, directory: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+
+        super(TrajectoryRecorderWrapper, self).__init__(env)
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive, got %d" % chunk_size)
+
+        encoder = GridWorldStateEncoder(env.initial_state)
+
+        self.writer = TrajectoryWriter(directory, np.min_scalar_type(encoder.num_states - 1))
+        self.chunk_size = chunk_size
+        self.episode_id = self.writer.next_episode_id - 1
+
+        self._encode = encoder.encode
+
+        # None until the first reset
+        self._buffer = None
+
+        # (index of its first buffered step, episode id, number of steps before it, id of the state before it) of
+        # each episode in the buffer
+        self._episode_starts = []
+
+    def reset(self, **kwargs):
+
+        state = self.env.reset(**kwargs)
+
+        if self._buffer is None:
+            self._buffer = _StepBuffer(self.chunk_size, self.writer.dtypes, self._encode)
+
+        self.episode_id += 1
+        self._episode_starts.append((self._buffer.num_steps, self.episode_id, 0, self._encode(state)))
+
+        return state
+
+    def step(self, action):
+
+        buffer = self._buffer
+
+        if buffer is None:
+            raise ValueError("reset must be called before step")
+
+        transition = self.env.step(action)
+        i = buffer.num_steps
+
+        buffer.next_state_ids[i] = buffer.encode(transition[0])
+        buffer.actions[i] = action
+        buffer.rewards[i] = transition[1]
+        buffer.dones[i] = transition[2]
+        buffer.num_steps = i + 1
+
+        if i + 1 == buffer.chunk_size:
+            self.flush()
+
+        return transition
+
+    def flush(self) -> None:
+
+        buffer = self._buffer
+
+        if buffer is None or buffer.num_steps == 0:
+            return
+
+        num_steps = buffer.num_steps
+        next_state_ids = buffer.next_state_ids[:num_steps]
+
+        starts, episode_ids, steps_before, first_state_ids = (np.asarray(column, dtype=np.int64)
+                                                              for column in zip(*self._episode_starts))
+        lengths = np.diff(np.append(starts, num_steps))
+
+        # the state of each step is the next state of the step before, except for the first step of an episode
+        state_ids = np.empty_like(next_state_ids)
+        state_ids[1:] = next_state_ids[:-1]
+        state_ids[starts[lengths > 0]] = first_state_ids[lengths > 0]
+
+        step = np.arange(num_steps) + np.repeat(steps_before - starts, lengths)
+
+        self.writer.write(TrajectoryChunk(np.repeat(episode_ids, lengths), step, state_ids,
+                                          buffer.actions[:num_steps], buffer.rewards[:num_steps], next_state_ids,
+                                          buffer.dones[:num_steps]))
+
+        # the last episode continues in the next chunk
+        _, episode_id, num_steps_before, state_id = self._episode_starts[-1]
+
+        if lengths[-1] > 0:
+            num_steps_before += int(lengths[-1])
+            state_id = int(next_state_ids[-1])
+
+        self._episode_starts = [(0, episode_id, num_steps_before, state_id)]
+        buffer.num_steps = 0
+
+    def close(self):
+        self.flush()
+        return self.env.close()
@@ -1,11 +1,49 @@
+import itertools
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Callable, Optional, List, Sequence, Tuple, Dict, Hashable
 
 import gym
 import numpy as np
 
 from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.instrumentation.instrumentation import Instrumentation
+from clgridworld.visualizer.cached_grid_visualizer import BufferedTextWriter
 from example.agents.agent import Agent
-import matplotlib.pyplot as plt
+
+
+class EpisodicStats(NamedTuple):
+    episodic_rewards: np.ndarray
+    episodic_steps: np.ndarray
+
+
+class TrainingRun(NamedTuple):
+    """Spec of one independent training run, must be picklable to be sent to a worker process.
+
+    agent_factory is called with the env and the run seed and env_wrapper, if given, with the GridWorld built from
+    params. Both should be module level functions or functools.partial objects of them.
+    """
+    params: InitialStateParams
+    agent_factory: Callable[[gym.Env, int], Agent]
+    seed: int = 0
+    num_episodes: int = 5000
+    max_steps_per_episode: int = 10000
+    env_wrapper: Optional[Callable[[gym.Env], gym.Env]] = None
+
+
+class TrainingResult(NamedTuple):
+    run: TrainingRun
+    episodic_rewards: np.ndarray
+    episodic_steps: np.ndarray
+
+
+class AggregatedResult(NamedTuple):
+    num_runs: int
+    mean_episodic_rewards: np.ndarray
+    std_episodic_rewards: np.ndarray
+    mean_episodic_steps: np.ndarray
 
 
 class AgentTrainer:
@@ -14,67 +52,207 @@ class AgentTrainer:
         self.env = env
         self.agent = agent
 
-    def train(self, seed=0, num_episodes=5000, max_steps_per_episode=-1, episode_log_interval=100, should_render=False):
+    def train(self, seed=0, num_episodes=5000, max_steps_per_episode=-1, episode_log_interval=100, should_render=False,
+              headless=False, render_frames_per_write=1,
+              instrumentation: Optional[Instrumentation] = None) -> EpisodicStats:
+        """Trains the agent and returns the reward and number of steps of every episode.
+
+        In headless mode nothing is rendered, printed or plotted and matplotlib is never imported. Rendered steps are
+        written render_frames_per_write at a time, with more than one per write they are written in bulk without
+        pausing between steps.
+
+        instrumentation, if given, is enabled while training and its report printed with the episode log, it is left
+        enabled if it already was.
+        """
 
         start_time = time.time()
 
         env = self.env
-        agent = self.agent
 
         env.seed(seed)
 
-        print("Environment initial state: ")
-        env.render()
-        print("")
+        if not headless:
+            print("Environment initial state: ")
+            env.render()
+            print("")
 
-        episodic_rewards = []
-        episodic_steps = []
+        render_writer = BufferedTextWriter(frames_per_write=render_frames_per_write) \
+            if should_render and not headless else None
 
-        for i in range(num_episodes):
+        episodic_rewards = np.zeros(num_episodes, dtype=np.int64)
+        episodic_steps = np.zeros(num_episodes, dtype=np.int64)
 
-            curr_state = env.reset()
-            step_count = 0
-            accum_reward = 0
+        rolling_reward_sum = 0
+        rolling_step_sum = 0
 
-            while True:
+        disable_instrumentation = instrumentation is not None and not instrumentation.enabled
 
-                prev_state = curr_state
-                action = agent.get_action(curr_state)
-                curr_state, reward, done, _ = env.step(action)
-                agent.update(prev_state, action, curr_state, reward)
+        if disable_instrumentation:
+            instrumentation.enable()
 
-                step_count += 1
-                accum_reward += reward
+        try:
+            for i in range(num_episodes):
 
-                if should_render:
-                    env.render()
-                    print("episode: " + str(i) + "." + str(step_count))
-                    print("action: " + GridWorldAction.NAMES[action])
-                    print("reward: " + str(reward))
-                    print("accum reward: " + str(accum_reward))
-                    print("\n")
-                    time.sleep(0.5)
+                accum_reward, step_count = self._run_episode(i, max_steps_per_episode, render_writer)
+
+                episodic_rewards[i] = accum_reward
+                episodic_steps[i] = step_count
+
+                if headless:
+                    continue
+
+                # sums over the last episode_log_interval episodes, updated incrementally
+                rolling_reward_sum += accum_reward
+                rolling_step_sum += step_count
 
-                if done or step_count >= max_steps_per_episode:
-                    break
+                if i >= episode_log_interval:
+                    rolling_reward_sum -= episodic_rewards[i - episode_log_interval]
+                    rolling_step_sum -= episodic_steps[i - episode_log_interval]
 
-            agent.inc_episode()
+                if i % episode_log_interval == 0:
+                    num_rolling_episodes = min(i + 1, episode_log_interval)
+                    avg_reward = rolling_reward_sum / num_rolling_episodes
+                    avg_num_steps = rolling_step_sum / num_rolling_episodes
 
-            episodic_rewards.append(accum_reward)
-            episodic_steps.append(step_count)
+                    if render_writer is not None:
+                        render_writer.flush()
 
-            if i % episode_log_interval == 0:
-                avg_reward = np.average(episodic_rewards[-episode_log_interval:])
-                avg_num_steps = np.average(episodic_steps[-episode_log_interval:])
-                print("episode {} avg reward: {} avg steps {}".format(i, avg_reward, avg_num_steps))
+                    print("episode {} avg reward: {} avg steps {}".format(i, avg_reward, avg_num_steps))
+
+                    if instrumentation is not None:
+                        print(instrumentation.snapshot().report())
+
+            if render_writer is not None:
+                render_writer.flush()
+
+        finally:
+            if disable_instrumentation:
+                instrumentation.disable()
+
+        if not headless:
+            AgentTrainer.plot_episodic_rewards(episodic_rewards)
+
+        env.close()
+
+        end_time = time.time()
+
+        if not headless:
+            print("time taken: {} seconds".format(end_time - start_time))
+
+        return EpisodicStats(episodic_rewards, episodic_steps)
+
+    @staticmethod
+    def plot_episodic_rewards(episodic_rewards: np.ndarray, block=True):
+
+        import matplotlib.pyplot as plt  # imported lazily, only needed when a plot is requested
 
         plt.plot(episodic_rewards)
         plt.ylabel('Episodic Reward')
         plt.xlabel('Episode')
-        plt.show()
+        plt.show(block=block)
 
-        env.close()
+    def _run_episode(self, episode, max_steps_per_episode,
+                     render_writer: Optional[BufferedTextWriter] = None) -> Tuple[int, int]:
 
-        end_time = time.time()
+        env = self.env
+        agent = self.agent
+
+        curr_state = env.reset()
+        step_count = 0
+        accum_reward = 0
+
+        while True:
+
+            prev_state = curr_state
+            action = agent.get_action(curr_state)
+            curr_state, reward, done, _ = env.step(action)
+            agent.update(prev_state, action, curr_state, reward)
+
+            step_count += 1
+            accum_reward += reward
+
+            if render_writer is not None:
+                render_writer.write(env.render(mode='ansi') +
+                                    "episode: " + str(episode) + "." + str(step_count) + "\n" +
+                                    "action: " + GridWorldAction.NAMES[action] + "\n" +
+                                    "reward: " + str(reward) + "\n" +
+                                    "accum reward: " + str(accum_reward) + "\n" +
+                                    "\n\n")
+
+                if render_writer.frames_per_write == 1:
+                    time.sleep(0.5)
+
+            if done or step_count >= max_steps_per_episode:
+                break
+
+        agent.inc_episode()
+
+        return accum_reward, step_count
+
+    @staticmethod
+    def create_runs(params_list: Sequence[InitialStateParams],
+                    agent_factories: Sequence[Callable[[gym.Env, int], Agent]], num_seeds: int, base_seed=0,
+                    num_episodes=5000, max_steps_per_episode=10000, env_wrapper=None) -> List[TrainingRun]:
+        """Creates a run for every (task, agent factory, seed) combination with seeds derived from base_seed."""
+
+        seeds = np.random.SeedSequence(base_seed).generate_state(num_seeds).tolist()
+
+        return [TrainingRun(params, agent_factory, seed, num_episodes, max_steps_per_episode, env_wrapper)
+                for params, agent_factory, seed in itertools.product(params_list, agent_factories, seeds)]
+
+    @staticmethod
+    def train_parallel(runs: Sequence[TrainingRun], num_workers: Optional[int] = None) -> List[TrainingResult]:
+        """Trains every run in its own worker process, results are returned in the order of runs.
+
+        Workers neither print nor plot. num_workers defaults to the number of cpus, a single worker trains the
+        runs serially in this process.
+        """
+
+        num_workers = os.cpu_count() if num_workers is None else num_workers
+
+        if num_workers == 1:
+            episodic_results = [_train_run(run) for run in runs]
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                episodic_results = list(executor.map(_train_run, runs))
+
+        return [TrainingResult(run, episodic_rewards, episodic_steps)
+                for run, (episodic_rewards, episodic_steps) in zip(runs, episodic_results)]
+
+    @staticmethod
+    def aggregate(results: Sequence[TrainingResult],
+                  key: Callable[[TrainingRun], Hashable] = None) -> Dict[Hashable, AggregatedResult]:
+        """Averages the episodic rewards and steps of runs with the same key, by default runs differing only in seed."""
+
+        key = _run_without_seed if key is None else key
+
+        groups = {}
+        for result in results:
+            groups.setdefault(key(result.run), []).append(result)
+
+        aggregated_results = {}
+        for group_key, group in groups.items():
+            episodic_rewards = np.stack([result.episodic_rewards for result in group])
+            episodic_steps = np.stack([result.episodic_steps for result in group])
+            aggregated_results[group_key] = AggregatedResult(len(group), episodic_rewards.mean(axis=0),
+                                                             episodic_rewards.std(axis=0), episodic_steps.mean(axis=0))
+
+        return aggregated_results
+
+
+def _run_without_seed(run: TrainingRun) -> TrainingRun:
+    return run._replace(seed=None)
+
+
+def _train_run(run: TrainingRun) -> EpisodicStats:
+
+    env = GridWorldBuilder.create(run.params)
+
+    if run.env_wrapper is not None:
+        env = run.env_wrapper(env)
+
+    np.random.seed(run.seed)
+
+    trainer = AgentTrainer(env, run.agent_factory(env, run.seed))
 
-        print("time taken: {} seconds".format(end_time - start_time))
+    return trainer.train(run.seed, run.num_episodes, run.max_steps_per_episode, headless=True)
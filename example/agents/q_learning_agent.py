@@ -6,11 +6,12 @@ from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrappe
 from example.agent_trainer import AgentTrainer
 from example.agents.agent import Agent
 from example.agents.policy import Policy, EpsGreedy, EpsAnnealed
+from example.agents.q_table import ArrayQTable
 
 
 class QLearningAgent(Agent):
 
-    def __init__(self, action_space, policy: Policy, discount_factor=0.95, learning_rate=0.01, seed=0):
+    def __init__(self, action_space, policy: Policy, discount_factor=0.95, learning_rate=0.01, seed=0, q_table=None):
 
         self.num_actions = action_space.n
         self.policy = policy
@@ -18,7 +19,7 @@ class QLearningAgent(Agent):
 
         np.random.seed(seed)
 
-        self.Q = {}
+        self.Q = {} if q_table is None else q_table
         self.action_space = action_space
 
         self.gamma = discount_factor
@@ -66,5 +67,7 @@ if __name__ == '__main__':
     # policy = EpsAnnealed(250)  # uncomment for annealed policy
 
     agent = QLearningAgent(env.action_space, policy, discount_factor=1, seed=seed)
+    # agent = QLearningAgent(env.action_space, policy, discount_factor=1, seed=seed,
+    #                        q_table=ArrayQTable(env.action_space.n))  # uncomment for array backed q table
 
     AgentTrainer(env, agent).train(seed, num_episodes=5000, max_steps_per_episode=10000, episode_log_interval=100)
@@ -0,0 +1,69 @@
+from typing import Hashable
+
+import numpy as np
+
+
+class ArrayQTable:
+    """Q-table storing the action values of every observation as a row of one contiguous 2-D array.
+
+    Observations are interned to row indices on first use and the array doubles in size when full. Supports the
+    dict operations the agents use (``in``, ``[]`` and ``[]=``) so it can replace the default dict Q-table. Rows
+    returned by ``[]`` are views that become stale once the table grows, so do not hold on to them across inserts.
+    """
+
+    def __init__(self, num_actions: int, initial_capacity: int = 1024, dtype=np.float64):
+
+        if initial_capacity < 1:
+            raise ValueError("initial capacity %s must be positive" % initial_capacity)
+
+        self.num_actions = num_actions
+
+        self._values = np.zeros((initial_capacity, num_actions), dtype=dtype)
+        self._row_indices = {}
+
+    def row_index(self, observation: Hashable) -> int:
+
+        row_index = self._row_indices.get(observation)
+
+        if row_index is None:
+            row_index = self._add_row(observation)
+
+        return row_index
+
+    def _add_row(self, observation: Hashable) -> int:
+
+        row_index = len(self._row_indices)
+
+        if row_index == self._values.shape[0]:
+            self._grow()
+
+        self._row_indices[observation] = row_index
+
+        return row_index
+
+    def _grow(self):
+
+        values = np.zeros((2 * self._values.shape[0], self.num_actions), dtype=self._values.dtype)
+        values[:self._values.shape[0]] = self._values
+        self._values = values
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:len(self._row_indices)]
+
+    @property
+    def capacity(self) -> int:
+        return self._values.shape[0]
+
+    def __contains__(self, observation: Hashable) -> bool:
+        return observation in self._row_indices
+
+    def __getitem__(self, observation: Hashable) -> np.ndarray:
+        return self._values[self._row_indices[observation]]
+
+    def __setitem__(self, observation: Hashable, action_values: np.ndarray):
+        row_index = self.row_index(observation)  # may grow the table, so look up before indexing the values
+        self._values[row_index] = action_values
+
+    def __len__(self) -> int:
+        return len(self._row_indices)
@@ -8,7 +8,7 @@ from example.agents.policy import Policy, EpsGreedy, EpsAnnealed
 
 class SarsaAgent(Agent):
 
-    def __init__(self, action_space, policy: Policy, discount_factor=0.95, learning_rate=0.01, seed=0):
+    def __init__(self, action_space, policy: Policy, discount_factor=0.95, learning_rate=0.01, seed=0, q_table=None):
 
         self.num_actions = action_space.n
         self.policy = policy
@@ -16,7 +16,7 @@ class SarsaAgent(Agent):
 
         np.random.seed(seed)
 
-        self.Q = {}
+        self.Q = {} if q_table is None else q_table
         self.action_space = action_space
 
         self.gamma = discount_factor
@@ -3,8 +3,11 @@ from setuptools import setup
 setup(
     name='gym_clgridworld',
     version='1.0.0',
-    packages=['clgridworld', 'clgridworld.action', 'clgridworld.dynamics', 'clgridworld.reward', 'clgridworld.state',
-              'clgridworld.visualizer', 'clgridworld.wrapper', 'example', 'example.agents', 'tests', ],
+    packages=['clgridworld', 'clgridworld.action', 'clgridworld.cache', 'clgridworld.dynamics',
+              'clgridworld.generator', 'clgridworld.instrumentation', 'clgridworld.planning', 'clgridworld.replay',
+              'clgridworld.reward', 'clgridworld.state', 'clgridworld.tabular', 'clgridworld.trajectory',
+              'clgridworld.vector', 'clgridworld.visualizer', 'clgridworld.wrapper', 'example', 'example.agents',
+              'tests', 'benchmarks', ],
     url='https://github.com/LeroyChristopherDunn/CurriculumLearningGridWorld',
     license='GNU GPLv3',
     author='Leroy Christopher Dunn',
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.suite import TASKS, SHAPES, BenchmarkResult, Scenario, task_params, default_scenarios, \
+    run_scenario, save_baseline, load_baseline, compare
+from clgridworld.grid_world_builder import GridWorldBuilder
+
+
+def result(name, ops_per_second=1000.0, p50_us=1.0, peak_memory_bytes=1024) -> BenchmarkResult:
+    return BenchmarkResult(name, "step", 100, ops_per_second, p50_us, 2.0, 3.0, peak_memory_bytes)
+
+
+class TestSuite(TestCase):
+
+    def test_task_params_should_create_valid_tasks_of_every_shape(self):
+
+        for task in TASKS:
+            for shape in SHAPES:
+                with self.subTest(task=task, shape=shape):
+
+                    env = GridWorldBuilder.create(task_params(task, shape))
+
+                    self.assertEqual(shape, env.initial_state.grid_shape)
+                    self.assertFalse(env.reset().is_in_pit())
+
+        self.assertEqual(TASKS["target"], task_params("target", (10, 10)))
+
+    def test_scenario_names_should_be_unique(self):
+
+        names = [scenario.name for scenario in default_scenarios()]
+
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_run_scenario_should_measure_every_operation(self):
+
+        scenario = next(scenario for scenario in default_scenarios()
+                        if scenario.name == "grid_world.step/target/5x5")
+
+        benchmark_result = run_scenario(scenario, num_ops=250)
+
+        self.assertEqual(200, benchmark_result.num_ops)
+        self.assertGreater(benchmark_result.ops_per_second, 0)
+        self.assertLessEqual(benchmark_result.p50_us, benchmark_result.p90_us)
+        self.assertLessEqual(benchmark_result.p90_us, benchmark_result.p99_us)
+
+        num_runs = []
+        scenario = Scenario("allocate", lambda: lambda num_ops: num_runs.append(bytearray(1 << 20)), num_ops=3,
+                            ops_per_sample=1)
+
+        benchmark_result = run_scenario(scenario)
+
+        self.assertEqual(3 + 1 + 1, len(num_runs))
+        self.assertGreaterEqual(benchmark_result.peak_memory_bytes, 1 << 20)
+
+    def test_compare_should_flag_changes_beyond_threshold(self):
+
+        baseline = [result("a"), result("b"), result("c")]
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "baseline.json")
+            save_baseline(baseline, path)
+            loaded = load_baseline(path)
+
+        self.assertEqual({r.name: r for r in baseline}, loaded)
+
+        results = [result("a", ops_per_second=950.0, p50_us=1.05),
+                   result("b", ops_per_second=800.0, p50_us=1.25),
+                   result("c", peak_memory_bytes=1024 * 1024),
+                   result("new", ops_per_second=1.0)]
+
+        regressions = compare(results, loaded, threshold=0.1)
+
+        self.assertEqual([("b", "ops_per_second"), ("b", "p50_us"), ("c", "peak_memory_bytes")],
+                         [(regression.name, regression.metric) for regression in regressions])
+        self.assertAlmostEqual(-0.2, regressions[0].change)
+        self.assertEqual(["c"], [regression.name for regression in compare(results, loaded, threshold=0.5)])
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from clgridworld.cache.bounded_cache import BoundedCache
+
+
+class TestBoundedCache(TestCase):
+
+    def test_lru_should_evict_least_recently_used_entry(self):
+
+        cache = BoundedCache(capacity=2, eviction_policy=BoundedCache.LRU)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_fifo_should_evict_oldest_entry(self):
+
+        cache = BoundedCache(capacity=2, eviction_policy=BoundedCache.FIFO)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_info_should_count_hits_and_misses(self):
+
+        cache = BoundedCache(capacity=10)
+        cache.get("a")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+
+        info = cache.info()
+
+        self.assertEqual(2, info.hits)
+        self.assertEqual(1, info.misses)
+        self.assertEqual(10, info.capacity)
+        self.assertEqual(1, info.size)
+        self.assertAlmostEqual(2 / 3, info.hit_rate)
+
+    def test_clear_should_remove_entries_and_reset_stats(self):
+
+        cache = BoundedCache(capacity=10)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+
+        self.assertEqual((0, 0, 10, 0), tuple(cache.info()))
+
+    def test_zero_capacity_should_not_store_entries(self):
+
+        cache = BoundedCache(capacity=0)
+        cache.put("a", 1)
+
+        self.assertEqual(0, len(cache))
+
+    def test_given_invalid_parameters_should_throw_error(self):
+
+        self.assertRaises(ValueError, BoundedCache, capacity=-1)
+        self.assertRaises(ValueError, BoundedCache, eviction_policy="random")
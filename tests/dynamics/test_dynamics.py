@@ -23,10 +23,19 @@ class TestGridWorldDynamics(TestCase):
         player_coords = (0, 0)
         state = GridWorldStateBuilder.create_state_with_spec(player_coords=player_coords)
 
-        new_state = GridWorldDynamics(state).step(GridWorldAction.NORTH)
+        new_state = GridWorldDynamics(state).step(GridWorldAction.SOUTH)
 
         self.assertFalse(state is new_state)
 
+    def test_when_nothing_changes_should_return_same_object(self):
+
+        player_coords = (0, 0)
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=player_coords)
+
+        for action in [GridWorldAction.NORTH, GridWorldAction.PICK_UP_KEY, GridWorldAction.UNLOCK_LOCK]:
+            with self.subTest(action=GridWorldAction.NAMES[action]):
+                self.assertTrue(state is GridWorldDynamics(state).step(action))
+
     def test_when_player_moves_into_boundary_should_remain_in_same_state(self):
 
         grid_shape = (10, 10)
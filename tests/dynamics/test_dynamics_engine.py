@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.dynamics.dynamics import GridWorldDynamics
+from clgridworld.dynamics.dynamics_engine import GridWorldDynamicsEngine
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestGridWorldDynamicsEngine(TestCase):
+
+    def setUp(self):
+
+        self.initial_states = [
+            GridWorldStateBuilder.create_state_with_spec(),
+            GridWorldStateBuilder.create_state_with_spec(shape=(7, 6), player_coords=(0, 2), key_coords=None,
+                                                         lock_coords=(0, 1), pit_start_coords=(3, 2),
+                                                         pit_end_coords=(3, 5)),
+            GridWorldStateBuilder.create_state_with_spec(shape=(5, 5), player_coords=(4, 4), key_coords=(0, 0),
+                                                         lock_coords=None, pit_start_coords=None,
+                                                         pit_end_coords=None),
+            GridWorldStateBuilder.create_state_with_spec(shape=(4, 4), player_coords=(0, 0), key_coords=(0, 2),
+                                                         lock_coords=(2, 0), pit_start_coords=None,
+                                                         pit_end_coords=None),
+        ]
+
+    def test_step_should_match_dynamics_for_reachable_states_in_any_order(self):
+
+        random_state = np.random.RandomState(0)
+
+        for initial_state in self.initial_states:
+            with self.subTest(initial_state=initial_state):
+
+                model = TabularTransitionModel.compile(initial_state)
+                engine = GridWorldDynamicsEngine(initial_state)
+
+                # shuffled so states with and without the key and lock are stepped alternately
+                states = [model.states[i] for i in random_state.permutation(model.num_states) if not model.done[i]]
+
+                for state in states:
+                    for action in range(len(GridWorldAction.NAMES)):
+                        self.assertEqual(GridWorldDynamics(state).step(action), engine.step(state, action))
+
+    def test_player_moves_into_former_key_coords_after_key_picked_up(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0), key_coords=(0, 1))
+        engine = GridWorldDynamicsEngine(state)
+
+        self.assertEqual(state, engine.step(state, GridWorldAction.EAST))
+
+        state = engine.step(state, GridWorldAction.PICK_UP_KEY)
+        new_state = engine.step(state, GridWorldAction.EAST)
+
+        self.assertEqual((0, 1), new_state.player)
+
+    def test_when_nothing_changes_should_return_same_object(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0))
+        engine = GridWorldDynamicsEngine(state)
+
+        for action in [GridWorldAction.NORTH, GridWorldAction.WEST, GridWorldAction.PICK_UP_KEY]:
+            with self.subTest(action=GridWorldAction.NAMES[action]):
+                self.assertTrue(state is engine.step(state, action))
+
+    def test_given_terminal_state_should_throw_terminal_state_error(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0), key_coords=(0, 1), lock_coords=None)
+        engine = GridWorldDynamicsEngine(state)
+        terminal_state = engine.step(state, GridWorldAction.PICK_UP_KEY)
+
+        self.assertRaises(Exception, engine.step, terminal_state, GridWorldAction.NORTH)
+
+    def test_step_should_match_dynamics_with_obstacle_layer(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(0, 4), (2, 4), (7, 6), (8, 0), (8, 1), (8, 2)],
+                                              pits=[(1, 6), (9, 9)])
+
+        model = TabularTransitionModel.compile(initial_state, obstacles=obstacles)
+        engine = GridWorldDynamicsEngine(initial_state, obstacles)
+
+        for state_id, state in enumerate(model.states):
+
+            if model.done[state_id]:
+                self.assertRaises(Exception, engine.step, state, GridWorldAction.NORTH)
+                continue
+
+            self.assertFalse(obstacles.is_wall(state.player))
+
+            for action in range(len(GridWorldAction.NAMES)):
+                self.assertEqual(GridWorldDynamics(state, obstacles).step(action), engine.step(state, action))
+
+    def test_player_should_not_move_into_wall_and_should_end_in_layer_pit(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=(1, 4))
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(1, 5)], pits=[(2, 4)])
+        engine = GridWorldDynamicsEngine(state, obstacles)
+
+        self.assertTrue(state is engine.step(state, GridWorldAction.EAST))
+
+        pit_state = engine.step(state, GridWorldAction.SOUTH)
+
+        self.assertEqual((2, 4), pit_state.player)
+        self.assertRaises(Exception, engine.step, pit_state, GridWorldAction.NORTH)
@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrapper
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+from example.agents.q_table import ArrayQTable
+
+
+class TestArrayQTable(TestCase):
+
+    def test_should_intern_observations_to_rows(self):
+
+        q_table = ArrayQTable(num_actions=3)
+
+        self.assertEqual(0, q_table.row_index("a"))
+        self.assertEqual(1, q_table.row_index(("b", 1)))
+        self.assertEqual(0, q_table.row_index("a"))
+
+        self.assertIn("a", q_table)
+        self.assertNotIn("c", q_table)
+        self.assertEqual(2, len(q_table))
+        self.assertEqual((2, 3), q_table.values.shape)
+
+        q_table["a"] = [1, 2, 3]
+        q_table["a"][1] += 10
+
+        self.assertEqual([1, 12, 3], q_table["a"].tolist())
+        self.assertEqual([0, 0, 0], q_table[("b", 1)].tolist())
+        self.assertRaises(KeyError, q_table.__getitem__, "c")
+        self.assertRaises(ValueError, ArrayQTable, 3, 0)
+
+    def test_growth_should_keep_existing_values(self):
+
+        q_table = ArrayQTable(num_actions=2, initial_capacity=2)
+
+        for i in range(5):
+            q_table[i] = [i, -i]
+
+        self.assertEqual(8, q_table.capacity)
+        self.assertEqual(5, len(q_table))
+        np.testing.assert_array_equal([[i, -i] for i in range(5)], q_table.values)
+
+    def test_setitem_should_write_to_the_grown_table(self):
+
+        q_table = ArrayQTable(num_actions=2, initial_capacity=1)
+        q_table["a"] = [1, 1]
+
+        # the new row does not fit and the table grows before the row is written
+        q_table["b"] = [2, 2]
+
+        self.assertEqual(2, q_table.capacity)
+        self.assertEqual([[1, 1], [2, 2]], q_table.values.tolist())
+
+    def test_q_learning_should_match_dict_q_table_update_for_update(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env = TupleObservationWrapper(DistanceObservationWrapper(GridWorldBuilder.create(params)))
+
+        dict_agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=0.9, learning_rate=0.5)
+        array_agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=0.9, learning_rate=0.5,
+                                     q_table=ArrayQTable(env.action_space.n, initial_capacity=4))
+
+        rng = np.random.RandomState(0)
+        curr_state = env.reset()
+
+        for _ in range(500):
+
+            prev_state = curr_state
+            action = int(rng.randint(env.action_space.n))
+            curr_state, reward, done, _ = env.step(action)
+
+            for agent in [dict_agent, array_agent]:
+                agent.init_state(prev_state)
+                agent.update(prev_state, action, curr_state, reward)
+
+            np.testing.assert_array_equal(dict_agent.Q[prev_state], array_agent.Q[prev_state])
+
+            if done:
+                curr_state = env.reset()
+
+        self.assertGreater(array_agent.Q.capacity, 4)
+        self.assertEqual(len(dict_agent.Q), len(array_agent.Q))
+
+        for state, action_values in dict_agent.Q.items():
+            np.testing.assert_array_equal(action_values, array_agent.Q[state])
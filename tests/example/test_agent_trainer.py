@@ -0,0 +1,171 @@
+import io
+import os
+import re
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from clgridworld.grid_world_builder import InitialStateParams, GridWorldBuilder
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrapper
+from example.agent_trainer import AgentTrainer, TrainingRun, TrainingResult
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+
+
+# agent factories and env wrappers are sent to worker processes, so they are module level functions
+
+def create_q_learning_agent(env, seed):
+    return QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1, seed=seed)
+
+
+def create_fast_q_learning_agent(env, seed):
+    return QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1, learning_rate=0.5, seed=seed)
+
+
+def wrap_distance_observations(env):
+    return TupleObservationWrapper(DistanceObservationWrapper(env))
+
+
+class TestAgentTrainer(TestCase):
+
+    def setUp(self):
+
+        self.params_list = [
+            #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+            InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                               pit_end=(4, 7)),
+            InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0), lock=(0, 4)),
+        ]
+
+    def test_create_runs_should_derive_one_seed_per_run_from_base_seed(self):
+
+        runs = AgentTrainer.create_runs(self.params_list, [create_q_learning_agent, create_fast_q_learning_agent],
+                                        num_seeds=3, base_seed=7, num_episodes=10, max_steps_per_episode=20,
+                                        env_wrapper=wrap_distance_observations)
+
+        self.assertEqual(2 * 2 * 3, len(runs))
+
+        seeds = [run.seed for run in runs]
+        self.assertEqual(3, len(set(seeds)))
+        self.assertEqual(seeds[:3] * 4, seeds)
+        self.assertEqual(np.random.SeedSequence(7).generate_state(3).tolist(), seeds[:3])
+
+        self.assertEqual(seeds, [run.seed for run in AgentTrainer.create_runs(
+            self.params_list, [create_q_learning_agent, create_fast_q_learning_agent], num_seeds=3, base_seed=7)])
+        self.assertNotEqual(seeds[:3], [run.seed for run in AgentTrainer.create_runs(
+            self.params_list, [create_q_learning_agent], num_seeds=3, base_seed=8)])
+
+        self.assertEqual((self.params_list[1], create_fast_q_learning_agent), runs[-1][:2])
+        self.assertTrue(all(run.num_episodes == 10 and run.max_steps_per_episode == 20 and
+                            run.env_wrapper is wrap_distance_observations for run in runs))
+
+    def test_train_parallel_should_match_serial_training(self):
+
+        runs = AgentTrainer.create_runs(self.params_list, [create_q_learning_agent, create_fast_q_learning_agent],
+                                        num_seeds=2, num_episodes=5, max_steps_per_episode=50,
+                                        env_wrapper=wrap_distance_observations)
+
+        serial_results = AgentTrainer.train_parallel(runs, num_workers=1)
+        parallel_results = AgentTrainer.train_parallel(runs, num_workers=2)
+
+        self.assertEqual(runs, [result.run for result in parallel_results])
+
+        for serial_result, parallel_result in zip(serial_results, parallel_results):
+            np.testing.assert_array_equal(serial_result.episodic_rewards, parallel_result.episodic_rewards)
+            np.testing.assert_array_equal(serial_result.episodic_steps, parallel_result.episodic_steps)
+            self.assertEqual((5,), parallel_result.episodic_steps.shape)
+
+    def test_aggregate_should_average_runs_differing_only_in_seed(self):
+
+        def result(params, seed, rewards, steps):
+            return TrainingResult(TrainingRun(params, create_q_learning_agent, seed), np.asarray(rewards),
+                                  np.asarray(steps))
+
+        results = [result(self.params_list[0], 1, [0, 10], [4, 2]),
+                   result(self.params_list[0], 2, [20, 30], [6, 2]),
+                   result(self.params_list[1], 1, [5, 5], [1, 1])]
+
+        aggregated = AgentTrainer.aggregate(results)
+
+        self.assertEqual(2, len(aggregated))
+
+        first_task = aggregated[TrainingRun(self.params_list[0], create_q_learning_agent, None)]
+
+        self.assertEqual(2, first_task.num_runs)
+        np.testing.assert_array_equal([10, 20], first_task.mean_episodic_rewards)
+        np.testing.assert_array_equal([10, 10], first_task.std_episodic_rewards)
+        np.testing.assert_array_equal([5, 2], first_task.mean_episodic_steps)
+
+        second_task = aggregated[TrainingRun(self.params_list[1], create_q_learning_agent, None)]
+
+        self.assertEqual(1, second_task.num_runs)
+        np.testing.assert_array_equal([0, 0], second_task.std_episodic_rewards)
+
+        by_seed = AgentTrainer.aggregate(results, key=lambda run: run.seed)
+
+        self.assertEqual({1: 2, 2: 1}, {seed: group.num_runs for seed, group in by_seed.items()})
+
+    def train(self, headless, num_episodes=25, episode_log_interval=10):
+        """Trains a fresh agent on the target task and returns its stats and everything printed."""
+
+        env = wrap_distance_observations(GridWorldBuilder.create(self.params_list[0]))
+        trainer = AgentTrainer(env, create_fast_q_learning_agent(env, 0))
+
+        output = io.StringIO()
+
+        with redirect_stdout(output), patch.object(AgentTrainer, "plot_episodic_rewards") as plot:
+            stats = trainer.train(num_episodes=num_episodes, max_steps_per_episode=30,
+                                  episode_log_interval=episode_log_interval, headless=headless)
+
+        self.assertEqual(not headless, plot.called)
+
+        return stats, output.getvalue()
+
+    def test_headless_training_should_not_print(self):
+
+        stats, output = self.train(headless=True)
+
+        self.assertEqual("", output)
+        self.assertEqual((25,), stats.episodic_rewards.shape)
+
+    def test_headless_training_should_not_import_matplotlib(self):
+
+        code = "\n".join([
+            "import sys",
+            "from tests.example.test_agent_trainer import TestAgentTrainer",
+            "test = TestAgentTrainer()",
+            "test.setUp()",
+            "test.train(headless=True)",
+            "print('matplotlib' in sys.modules)",
+        ])
+
+        repository_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        completed = subprocess.run([sys.executable, "-c", code], cwd=repository_directory, capture_output=True,
+                                   text=True, check=True)
+
+        self.assertEqual("False", completed.stdout.strip())
+
+    def test_logged_rolling_averages_should_match_slice_averages(self):
+
+        interval = 10
+        headless_stats, _ = self.train(headless=True, episode_log_interval=interval)
+        stats, output = self.train(headless=False, episode_log_interval=interval)
+
+        np.testing.assert_array_equal(headless_stats.episodic_rewards, stats.episodic_rewards)
+        np.testing.assert_array_equal(headless_stats.episodic_steps, stats.episodic_steps)
+
+        logged = re.findall(r"episode (\d+) avg reward: (\S+) avg steps (\S+)", output)
+
+        self.assertEqual([0, 10, 20], [int(episode) for episode, _, _ in logged])
+
+        for episode, avg_reward, avg_steps in logged:
+
+            episodes = slice(max(int(episode) - interval + 1, 0), int(episode) + 1)
+
+            self.assertAlmostEqual(stats.episodic_rewards[episodes].mean(), float(avg_reward))
+            self.assertAlmostEqual(stats.episodic_steps[episodes].mean(), float(avg_steps))
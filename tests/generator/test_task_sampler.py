@@ -0,0 +1,114 @@
+import tracemalloc
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.generator.task_sampler import TaskSampler
+from clgridworld.state.state_factory import GridWorldStateFactory
+from clgridworld.vector.batch_grid_world import ABSENT
+
+
+class TestTaskSampler(TestCase):
+
+    def test_sampled_layouts_should_be_valid(self):
+
+        samplers = [
+            TaskSampler((10, 10), seed=0),
+            TaskSampler((10, 10), seed=0, key_probability=0.5, lock_probability=0.5, pit_probability=0.5),
+            TaskSampler((3, 3), seed=0),
+            TaskSampler((1, 7), seed=0, max_pit_shape=(1, 2)),
+        ]
+
+        for sampler in samplers:
+            with self.subTest(shape=sampler.shape, key_probability=sampler.key_probability):
+
+                batch = sampler.sample(2000)
+
+                self.assertEqual(2000, batch.num_tasks())
+
+                for params in batch.to_params():
+                    GridWorldStateFactory.create(params.shape, params.player, params.key, params.lock,
+                                                 params.pit_start, params.pit_end)
+
+    def test_large_grid_should_be_sampled_in_bounded_memory(self):
+
+        sampler = TaskSampler((1000, 1000), seed=0, max_pit_shape=(100, 100))
+
+        tracemalloc.start()
+        try:
+            batch = sampler.sample(16)
+            _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(16, batch.num_tasks())
+        # a random key and a blocked flag per cell of a single chunk, not of all 16 tasks
+        self.assertLess(peak_memory_bytes, 4 * 9 * TaskSampler.MAX_CANDIDATE_CELLS)
+
+        for params in batch.to_params():
+            GridWorldStateFactory.create(params.shape, params.player, params.key, params.lock, params.pit_start,
+                                         params.pit_end)
+
+    def test_given_no_tasks_should_return_empty_batch(self):
+
+        batch = TaskSampler((10, 10), seed=0).sample(0)
+
+        self.assertEqual(0, batch.num_tasks())
+        self.assertEqual([], batch.to_params())
+
+        for array in batch[1:]:
+            self.assertEqual((0, 2), array.shape)
+
+        self.assertRaises(ValueError, TaskSampler((10, 10), seed=0).sample, -1)
+
+    def test_same_seed_should_sample_same_layouts(self):
+
+        batch = TaskSampler((10, 10), seed=42).sample(100)
+        same_seed_batch = TaskSampler((10, 10), seed=42).sample(100)
+        other_seed_batch = TaskSampler((10, 10), seed=43).sample(100)
+
+        self.assertEqual(batch.to_params(), same_seed_batch.to_params())
+        self.assertNotEqual(batch.to_params(), other_seed_batch.to_params())
+
+    def test_objects_should_respect_probabilities_and_max_pit_shape(self):
+
+        batch = TaskSampler((10, 10), seed=0, key_probability=0, pit_probability=0).sample(100)
+
+        self.assertTrue(np.all(batch.key == ABSENT))
+        self.assertTrue(np.all(batch.pit_start == ABSENT))
+        self.assertTrue(np.all(batch.lock != ABSENT))
+
+        batch = TaskSampler((10, 10), seed=0, max_pit_shape=(2, 3)).sample(1000)
+        pit_shape = batch.pit_end - batch.pit_start + 1
+
+        self.assertTrue(np.all((1 <= pit_shape) & (pit_shape <= (2, 3))))
+
+    def test_player_should_be_placed_on_every_free_cell(self):
+
+        batch = TaskSampler((4, 4), seed=0, pit_probability=0).sample(5000)
+        counts = np.bincount(batch.player[:, 0] * 4 + batch.player[:, 1], minlength=16)
+
+        self.assertTrue(np.all(counts > 5000 / 16 * 0.7))
+
+    def test_stats_should_count_sampled_and_rejected_layouts(self):
+
+        sampler = TaskSampler((10, 10), seed=0, key_probability=0.5, lock_probability=0.5)
+        sampler.sample(1000)
+        sampler.sample(500)
+
+        stats = sampler.stats()
+
+        self.assertEqual(1500, stats.num_sampled)
+        self.assertGreater(stats.num_rejected, 0)
+        self.assertAlmostEqual(stats.num_rejected / (stats.num_sampled + stats.num_rejected), stats.rejection_rate)
+        self.assertGreater(stats.tasks_per_second, 0)
+
+    def test_given_impossible_constraints_should_throw_value_error(self):
+
+        self.assertRaises(ValueError, TaskSampler, (1, 2))
+        self.assertRaises(ValueError, TaskSampler, (10, 10), key_probability=0, lock_probability=0)
+
+        # every pit leaves two free cells for the player, key and lock
+        sampler = TaskSampler((3, 1), seed=0, max_pit_shape=(1, 1))
+
+        self.assertRaises(ValueError, sampler.sample, 10)
@@ -0,0 +1,177 @@
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world import GridWorld
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.instrumentation.instrumentation import Instrumentation
+from clgridworld.trajectory.trajectory_store import TrajectoryReader
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.trajectory_recorder_wrapper import TrajectoryRecorderWrapper
+from clgridworld.wrapper.tuple_observation_wrapper import TupleObservationWrapper
+from example.agent_trainer import AgentTrainer
+from example.agents.policy import EpsGreedy
+from example.agents.q_learning_agent import QLearningAgent
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+    def test_should_count_calls_and_cache_hits_per_component(self):
+
+        grid_world = GridWorldBuilder.create(self.params)
+        env = DistanceObservationWrapper(grid_world)
+        env.reset()
+
+        with Instrumentation(env) as instrumentation:
+            for _ in range(5):
+                env.step(GridWorldAction.EAST)
+                env.step(GridWorldAction.WEST)
+
+        snapshot = instrumentation.snapshot()
+        components = snapshot.components
+
+        self.assertEqual(10, components["DistanceObservationWrapper.step"].calls)
+        self.assertEqual(10, components["DistanceObservationWrapper.observation"].calls)
+        self.assertEqual(10, components["GridWorld.step"].calls)
+
+        # only the two transitions missing from the transition cache are calculated
+        self.assertEqual(2, components["GridWorld.dynamics.step"].calls)
+        self.assertEqual(2, components["GridWorld.reward_function.calculate"].calls)
+        self.assertEqual(2, components["GridWorld.terminal_state_validator.is_terminal_state"].calls)
+
+        stats = components["GridWorld.step"]
+        self.assertGreater(stats.total_seconds, 0)
+        self.assertLessEqual(stats.p50_us, stats.p99_us)
+
+        self.assertEqual((8, 2), snapshot.caches["GridWorld.cache"][:2])
+        # the observation of the initial state was cached on reset
+        self.assertEqual((9, 1), snapshot.caches["DistanceObservationWrapper.cache"][:2])
+        self.assertAlmostEqual(0.8, snapshot.caches["GridWorld.cache"].hit_rate)
+
+        self.assertIn("GridWorld.dynamics.step", snapshot.report())
+
+    def test_should_remove_timed_methods_when_disabled(self):
+
+        grid_world = GridWorldBuilder.create(self.params)
+        env = TupleObservationWrapper(DistanceObservationWrapper(grid_world))
+        reward_function = grid_world.reward_function.calculate
+
+        instrumentation = Instrumentation(env)
+        instrumentation.enable()
+
+        self.assertIn("step", env.__dict__)
+        self.assertRaises(ValueError, instrumentation.add_method, grid_world, "reset", "GridWorld.reset")
+
+        instrumentation.disable()
+        env.reset()
+        env.step(GridWorldAction.EAST)
+
+        self.assertNotIn("step", env.__dict__)
+        self.assertNotIn("step", grid_world.dynamics.__dict__)
+        self.assertIs(reward_function, grid_world.reward_function.calculate)
+        self.assertEqual(GridWorld.step, type(grid_world).step)
+        self.assertEqual(0, instrumentation.snapshot().components["GridWorld.step"].calls)
+
+        # the tuple wrapper has no cache of its own
+        self.assertEqual({"DistanceObservationWrapper.cache", "GridWorld.cache"},
+                         set(instrumentation.snapshot().caches))
+
+    def test_should_restore_step_overridden_per_instance(self):
+
+        grid_world = GridWorldBuilder.create(self.params)
+        env = TupleObservationWrapper(grid_world)
+        step = env.step
+        # an instance attribute, like the step gym.Wrapper installs for wrappers with a deprecated _step
+        env.step = step
+
+        with Instrumentation(env) as instrumentation:
+            env.reset()
+            env.step(GridWorldAction.EAST)
+            self.assertIsNot(step, env.__dict__["step"])
+
+        self.assertIs(step, env.__dict__["step"])
+        self.assertEqual(1, instrumentation.snapshot().components["TupleObservationWrapper.step"].calls)
+        self.assertEqual(1, instrumentation.snapshot().components["GridWorld.step"].calls)
+
+    def test_trainer_should_record_trajectories_while_instrumented(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            directory = os.path.join(directory, "trajectories")
+            recorder = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), directory)
+            env = TupleObservationWrapper(DistanceObservationWrapper(recorder))
+            agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1)
+
+            with Instrumentation(env, agent) as instrumentation:
+                stats = AgentTrainer(env, agent).train(num_episodes=3, max_steps_per_episode=20, headless=True)
+
+            self.assertNotIn("step", recorder.__dict__)
+
+            components = instrumentation.snapshot().components
+            num_steps = stats.episodic_steps.sum()
+
+            self.assertEqual(num_steps, components["TrajectoryRecorderWrapper.step"].calls)
+            self.assertEqual(num_steps, components["GridWorld.step"].calls)
+            self.assertEqual(stats.episodic_steps.tolist(),
+                             [episode.num_steps() for episode in TrajectoryReader(directory).episodes()])
+
+    def test_trainer_should_disable_instrumentation_when_training_fails(self):
+
+        env = TupleObservationWrapper(DistanceObservationWrapper(GridWorldBuilder.create(self.params)))
+        agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1)
+        instrumentation = Instrumentation(env, agent)
+
+        with patch.object(QLearningAgent, "update", side_effect=RuntimeError("update failed")):
+            self.assertRaises(RuntimeError, AgentTrainer(env, agent).train, num_episodes=2,
+                              max_steps_per_episode=20, headless=True, instrumentation=instrumentation)
+
+        self.assertFalse(instrumentation.enabled)
+        self.assertNotIn("step", env.__dict__)
+        self.assertNotIn("update", agent.__dict__)
+
+    def test_reset_should_clear_stats(self):
+
+        env = GridWorldBuilder.create(self.params)
+        env.reset()
+
+        with Instrumentation(env) as instrumentation:
+
+            env.step(GridWorldAction.EAST)
+            instrumentation.reset()
+            env.step(GridWorldAction.EAST)
+
+        snapshot = instrumentation.snapshot()
+
+        self.assertEqual(1, snapshot.components["GridWorld.step"].calls)
+        self.assertEqual((0, 1), snapshot.caches["GridWorld.cache"][:2])
+
+    def test_trainer_should_print_report_at_log_intervals(self):
+
+        env = TupleObservationWrapper(DistanceObservationWrapper(GridWorldBuilder.create(self.params)))
+        agent = QLearningAgent(env.action_space, EpsGreedy(0), discount_factor=1)
+        instrumentation = Instrumentation(env, agent)
+
+        trainer = AgentTrainer(env, agent)
+        output = io.StringIO()
+
+        with redirect_stdout(output), patch.object(AgentTrainer, "plot_episodic_rewards"):
+            stats = trainer.train(num_episodes=4, max_steps_per_episode=20, episode_log_interval=2,
+                                  instrumentation=instrumentation)
+
+        self.assertFalse(instrumentation.enabled)
+        self.assertEqual(2, output.getvalue().count("QLearningAgent.update"))
+
+        components = instrumentation.snapshot().components
+
+        self.assertEqual(stats.episodic_steps.sum(), components["QLearningAgent.update"].calls)
+        self.assertEqual(stats.episodic_steps.sum(), components["TupleObservationWrapper.step"].calls)
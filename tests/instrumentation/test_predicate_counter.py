@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.instrumentation.predicate_counter import PredicateCounter
+from clgridworld.state.state import GridWorldState
+from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestPredicateCounter(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+    def test_should_count_predicate_calls_per_step(self):
+
+        env = GridWorldBuilder.create(self.params, cache_capacity=0)
+        env.reset()
+
+        num_steps = 10
+
+        with PredicateCounter() as counter:
+            for _ in range(num_steps // 2):
+                env.step(GridWorldAction.EAST)
+                env.step(GridWorldAction.WEST)
+
+        per_step = counter.per_step(num_steps)
+
+        # once in the dynamics engine and once for done
+        self.assertEqual(2, per_step["TerminalStateMask.is_terminal_state"])
+        # current and next state in the reward function, looked up in the cells of the terminal state mask
+        self.assertEqual(2, per_step["TerminalStateMask.is_in_pit"])
+        self.assertNotIn("GridWorldState.is_in_pit", per_step)
+        self.assertNotIn("TerminalStateValidator.is_terminal_state", per_step)
+        self.assertIn("TerminalStateMask.is_terminal_state", counter.report(num_steps))
+
+    def test_distance_observations_should_look_up_pits_in_the_terminal_state_mask(self):
+
+        env = DistanceObservationWrapper(GridWorldBuilder.create(self.params, cache_capacity=0), cache_capacity=0)
+        env.reset()
+
+        with PredicateCounter() as counter:
+            env.step(GridWorldAction.EAST)
+
+        # current and next state in the reward function and the state after each of the four look ahead steps
+        self.assertEqual(6, counter.counts["TerminalStateMask.is_in_pit"])
+        self.assertNotIn("GridWorldState.is_in_pit", counter.counts)
+
+    def test_should_count_static_predicates_and_restore_predicates_on_exit(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec()
+        is_in_pit = GridWorldState.is_in_pit
+
+        with PredicateCounter() as counter:
+            TerminalStateValidator.is_terminal_state(state)
+            state.is_in_pit()
+
+        self.assertEqual(1, counter.counts["TerminalStateValidator.is_terminal_state"])
+        self.assertEqual(2, counter.counts["GridWorldState.is_in_pit"])
+
+        self.assertIs(is_in_pit, GridWorldState.is_in_pit)
+        self.assertIsInstance(TerminalStateValidator.__dict__["is_terminal_state"], staticmethod)
+
+        state.is_in_pit()
+        self.assertEqual(2, counter.counts["GridWorldState.is_in_pit"])
+
+        counter.reset()
+        self.assertEqual({}, dict(counter.counts))
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.planning.planner import GridWorldPlanner
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestGridWorldPlanner(TestCase):
+
+    def setUp(self):
+
+        # three steps to a cell next to the lock then unlock
+        initial_state = GridWorldStateBuilder.create_state_with_spec(
+            shape=(3, 3), player_coords=(0, 0), key_coords=None, lock_coords=(2, 2), pit_start_coords=None,
+            pit_end_coords=None)
+        self.lock_only_model = TabularTransitionModel.compile(initial_state)
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.target_task_params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1),
+                                                     pit_start=(4, 2), pit_end=(4, 7))
+        self.target_task_model = TabularTransitionModel.compile(GridWorldBuilder.create(self.target_task_params)
+                                                                .initial_state)
+
+    def test_value_iteration_optimal_value(self):
+
+        undiscounted = GridWorldPlanner.value_iteration(self.lock_only_model, discount_factor=1)
+        discounted = GridWorldPlanner.value_iteration(self.lock_only_model, discount_factor=0.9)
+
+        self.assertTrue(undiscounted.converged)
+        self.assertAlmostEqual(-10 * 3 + 1000, undiscounted.V[TabularTransitionModel.INITIAL_STATE_ID])
+        self.assertAlmostEqual(-10 * (1 + 0.9 + 0.9 ** 2) + 0.9 ** 3 * 1000,
+                               discounted.V[TabularTransitionModel.INITIAL_STATE_ID])
+
+    def test_policy_iteration_should_match_value_iteration(self):
+
+        for model in [self.lock_only_model, self.target_task_model]:
+
+            value_iteration_result = GridWorldPlanner.value_iteration(model, discount_factor=0.95)
+            policy_iteration_result = GridWorldPlanner.policy_iteration(model, discount_factor=0.95)
+
+            self.assertTrue(policy_iteration_result.converged)
+            np.testing.assert_allclose(value_iteration_result.V, policy_iteration_result.V, atol=1e-6)
+            np.testing.assert_allclose(value_iteration_result.Q, policy_iteration_result.Q, atol=1e-6)
+
+    def test_optimal_policy_should_complete_target_task(self):
+
+        result = GridWorldPlanner.value_iteration(self.target_task_model, discount_factor=1)
+        env = GridWorldBuilder.create_tabular(self.target_task_params)
+
+        state_id = env.reset()
+        accum_reward = 0
+
+        for _ in range(100):
+            state_id, reward, done, _ = env.step(result.policy[state_id])
+            accum_reward += reward
+            if done:
+                break
+
+        self.assertTrue(done)
+        self.assertFalse(env.model.states[state_id].is_in_pit())
+        self.assertEqual(result.V[TabularTransitionModel.INITIAL_STATE_ID], accum_reward)
+
+    def test_given_invalid_discount_factor_should_throw_error(self):
+
+        self.assertRaises(ValueError, GridWorldPlanner.value_iteration, self.lock_only_model, discount_factor=1.5)
+        self.assertRaises(ValueError, GridWorldPlanner.policy_iteration, self.lock_only_model, discount_factor=1)
@@ -0,0 +1,185 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.replay.replay_buffer import ReplayBuffer, SumTree
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+
+class TestSumTree(TestCase):
+
+    def test_update_and_find(self):
+
+        tree = SumTree(5)
+        tree.update(np.asarray([0, 1, 2, 3, 4]), np.asarray([1.0, 2.0, 3.0, 0.0, 4.0]))
+
+        self.assertEqual(10.0, tree.total())
+        np.testing.assert_array_equal([0, 1, 1, 2, 2, 2, 4, 4, 4, 4],
+                                      tree.find(np.arange(10) + 0.5))
+
+        # repeated indices take the last priority
+        tree.update(np.asarray([4, 4, 0]), np.asarray([5.0, 1.0, 2.0]))
+        tree.set(3, 0.5)
+
+        self.assertEqual(8.5, tree.total())
+        np.testing.assert_array_equal([2.0, 0.5, 1.0], tree.priorities([0, 3, 4]))
+
+    def test_single_leaf(self):
+
+        tree = SumTree(1)
+        tree.set(0, 3.0)
+
+        self.assertEqual(3.0, tree.total())
+        np.testing.assert_array_equal([0, 0], tree.find([0.0, 2.9]))
+
+
+class TestReplayBuffer(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+    def test_should_store_encoded_transitions_of_an_episode(self):
+
+        env = GridWorldBuilder.create(self.params)
+        encoder = GridWorldStateEncoder(env.initial_state)
+        buffer = ReplayBuffer.for_state_ids(100, encoder.num_states)
+
+        self.assertEqual(np.uint16, buffer.states.dtype)
+        self.assertEqual(100 * (2 + 1 + 4 + 2 + 1), buffer.nbytes())
+
+        transitions = []
+        state = env.reset()
+
+        for action in [GridWorldAction.WEST, GridWorldAction.SOUTH, GridWorldAction.WEST]:
+            next_state, reward, done, _ = env.step(action)
+            transitions.append((encoder.encode(state), action, reward, encoder.encode(next_state), done))
+            buffer.add(*transitions[-1])
+            state = next_state
+
+        self.assertEqual(3, len(buffer))
+
+        batch = buffer.transitions(np.arange(3))
+
+        self.assertEqual(transitions, list(zip(batch.states.tolist(), batch.actions.tolist(), batch.rewards.tolist(),
+                                               batch.next_states.tolist(), batch.dones.tolist())))
+        np.testing.assert_array_equal(np.ones(3), batch.weights)
+
+    def test_should_store_distance_observations(self):
+
+        env = DistanceObservationWrapper(GridWorldBuilder.create(self.params))
+        buffer = ReplayBuffer.for_distance_observations(10)
+
+        observation = env.reset()
+        next_observation, reward, done, _ = env.step(GridWorldAction.EAST)
+        index = buffer.add(observation, GridWorldAction.EAST, reward, next_observation, done)
+
+        self.assertEqual((10, 17), buffer.states.shape)
+        np.testing.assert_allclose(observation, buffer.states[index], rtol=1e-6)
+        np.testing.assert_allclose(next_observation, buffer.next_states[index], rtol=1e-6)
+
+    def test_should_overwrite_oldest_transitions_when_full(self):
+
+        buffer = ReplayBuffer(4)
+
+        for i in range(6):
+            buffer.add(i, i, -i, i + 1, i == 5)
+
+        self.assertEqual(4, len(buffer))
+        self.assertEqual(2, buffer.position)
+        np.testing.assert_array_equal([4, 5, 2, 3], buffer.states)
+        np.testing.assert_array_equal([False, True, False, False], buffer.dones)
+
+    def test_add_batch_should_match_adding_one_by_one(self):
+
+        rng = np.random.default_rng(0)
+
+        for batch_sizes in [[3, 2], [7], [1, 6, 2, 9]]:
+            with self.subTest(batch_sizes=batch_sizes):
+
+                buffer = ReplayBuffer(5, (2,), np.float32, priority_exponent=0.5)
+                expected = ReplayBuffer(5, (2,), np.float32, priority_exponent=0.5)
+
+                for batch_size in batch_sizes:
+
+                    states = rng.random((batch_size, 2), dtype=np.float32)
+                    actions = rng.integers(0, 6, batch_size)
+                    rewards = rng.integers(-200, 1000, batch_size)
+                    dones = rng.random(batch_size) < 0.5
+
+                    indices = buffer.add_batch(states, actions, rewards, states + 1, dones)
+
+                    expected_indices = [expected.add(*transition)
+                                        for transition in zip(states, actions, rewards, states + 1, dones)]
+
+                    np.testing.assert_array_equal(expected_indices[-5:], indices)
+
+                for name in ["states", "actions", "rewards", "next_states", "dones"]:
+                    np.testing.assert_array_equal(getattr(expected, name), getattr(buffer, name))
+
+                self.assertEqual((expected.position, expected.size), (buffer.position, buffer.size))
+                self.assertEqual(expected._priorities.total(), buffer._priorities.total())
+
+    def test_uniform_sampling(self):
+
+        buffer = ReplayBuffer(10, seed=0)
+
+        self.assertRaises(ValueError, buffer.sample, 1)
+
+        for i in range(3):
+            buffer.add(i, 0, 10 * i, i, False)
+
+        batch = buffer.sample(3000)
+
+        np.testing.assert_array_equal(batch.indices, batch.states)
+        np.testing.assert_array_equal(10 * batch.indices, batch.rewards)
+        np.testing.assert_allclose([1 / 3] * 3, np.bincount(batch.indices) / 3000, atol=0.03)
+
+        self.assertRaises(ValueError, buffer.sample_prioritized, 1)
+        self.assertRaises(ValueError, buffer.update_priorities, [0], [1.0])
+
+    def test_prioritized_sampling_should_be_proportional_to_priority(self):
+
+        buffer = ReplayBuffer(8, priority_exponent=1.0, seed=0)
+
+        for i in range(4):
+            buffer.add(i, 0, 0, i, False)
+
+        # new transitions are sampled at the largest priority so far
+        self.assertEqual([1.0] * 4, buffer._priorities.priorities(np.arange(4)).tolist())
+
+        buffer.update_priorities(np.arange(4), np.asarray([1.0, -2.0, 3.0, 4.0]))
+        index = buffer.add(4, 0, 0, 4, False)
+
+        self.assertAlmostEqual(4.0, buffer._priorities.priorities([index])[0], places=5)
+
+        batch = buffer.sample_prioritized(14000, importance_exponent=1.0)
+        probabilities = np.asarray([1.0, 2.0, 3.0, 4.0, 4.0]) / 14.0
+
+        np.testing.assert_allclose(probabilities, np.bincount(batch.indices) / 14000, atol=0.01)
+
+        # (size * probability) ** -1 normalised by the largest, the weight of the lowest priority
+        np.testing.assert_allclose(probabilities[0] / probabilities[batch.indices], batch.weights, rtol=1e-5)
+
+    def test_memory_mapped_columns(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            buffer = ReplayBuffer.for_distance_observations(1000, directory=directory)
+            buffer.add_batch(np.ones((3, 17)), np.asarray([0, 1, 2]), np.asarray([-10, 500, 1000]),
+                             np.zeros((3, 17)), np.asarray([False, False, True]))
+            buffer.flush()
+
+            self.assertIsInstance(buffer.states, np.memmap)
+
+            np.testing.assert_array_equal([-10, 500, 1000], np.load(os.path.join(directory, "rewards.npy"))[:3])
+            np.testing.assert_array_equal(np.ones((3, 17)), np.load(os.path.join(directory, "states.npy"))[:3])
+
+            del buffer
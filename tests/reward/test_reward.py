@@ -3,6 +3,9 @@ from unittest import TestCase
 from clgridworld.action.action import GridWorldAction
 from clgridworld.dynamics.dynamics import GridWorldDynamics
 from clgridworld.reward.reward import GridWorldRewardFunction, GridWorldReward
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.validator import TerminalStateMask
+from clgridworld.tabular.transition_model import TabularTransitionModel
 from tests.state.grid_world_state_builder import GridWorldStateBuilder
 
 
@@ -74,3 +77,37 @@ class GridWorldRewardTest(TestCase):
         reward = GridWorldRewardFunction().calculate(curr_state, next_state)
 
         self.assertEqual(self.expected_reward.player_moved_into_pit, reward)
+
+    def test_given_player_moved_into_obstacle_layer_pit_should_return_correct_reward(self):
+
+        obstacles = ObstacleLayer.from_coords((10, 10), pits=[(0, 1)])
+
+        curr_state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0))
+        next_state = GridWorldDynamics(curr_state, obstacles).step(GridWorldAction.EAST)
+
+        reward = GridWorldRewardFunction(obstacles=obstacles).calculate(curr_state, next_state)
+
+        self.assertEqual(self.expected_reward.player_moved_into_pit, reward)
+        self.assertEqual(self.expected_reward.player_moved_into_empty_space,
+                         GridWorldRewardFunction().calculate(curr_state, next_state))
+
+    def test_terminal_state_mask_should_give_same_rewards_as_state_predicates(self):
+
+        obstacles = ObstacleLayer.from_coords((10, 10), pits=[(0, 1), (8, 8)], walls=[(2, 2)])
+        initial_state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0))
+
+        terminal_state_mask = TerminalStateMask(initial_state, obstacles)
+        reward_function = GridWorldRewardFunction(obstacles=obstacles)
+        masked_reward_function = GridWorldRewardFunction(obstacles=obstacles, terminal_state_mask=terminal_state_mask)
+
+        for state in TabularTransitionModel.compile(initial_state, obstacles=obstacles).states:
+
+            if terminal_state_mask.is_terminal_state(state):
+                continue
+
+            for action in GridWorldAction.NAMES:
+
+                next_state = GridWorldDynamics(state, obstacles).step(action)
+
+                self.assertEqual(reward_function.calculate(state, next_state),
+                                 masked_reward_function.calculate(state, next_state))
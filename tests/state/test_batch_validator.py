@@ -0,0 +1,104 @@
+import re
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.generator.task_sampler import TaskSampler
+from clgridworld.state.batch_validator import BatchLayoutValidator as Validator
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state_factory import GridWorldStateFactory
+
+# GridWorldStateFactory.create error messages, out of bounds pit coords are reported as lock coords
+_MESSAGE_REASONS = [
+    ("key or lock coords required", {Validator.MISSING_KEY_AND_LOCK}),
+    ("invalid pit coords", {Validator.UNPAIRED_PIT_COORDS}),
+    ("player coords .* not in grid_shape", {Validator.PLAYER_OUT_OF_BOUNDS}),
+    ("key coords .* not in grid_shape", {Validator.KEY_OUT_OF_BOUNDS}),
+    ("lock coords .* not in grid_shape", {Validator.LOCK_OUT_OF_BOUNDS, Validator.PIT_START_OUT_OF_BOUNDS,
+                                          Validator.PIT_END_OUT_OF_BOUNDS}),
+    ("player coords .* equal to key", {Validator.PLAYER_ON_KEY}),
+    ("player coords .* equal to lock", {Validator.PLAYER_ON_LOCK}),
+    ("key coords .* equal to lock", {Validator.KEY_ON_LOCK}),
+    ("player coords .* within pit", {Validator.PLAYER_IN_PIT}),
+    ("lock coords .* within pit", {Validator.LOCK_IN_PIT}),
+    ("key coords .* within pit", {Validator.KEY_IN_PIT}),
+    ("player coords .* overlap with pit beacon", {Validator.PLAYER_ON_BEACON}),
+    ("lock coords .* overlap with pit beacon", {Validator.LOCK_ON_BEACON}),
+    ("key coords .* overlap with pit beacon", {Validator.KEY_ON_BEACON}),
+    ("player coords .* overlap with obstacle", {Validator.PLAYER_ON_OBSTACLE}),
+    ("key coords .* overlap with obstacle", {Validator.KEY_ON_OBSTACLE}),
+    ("lock coords .* overlap with obstacle", {Validator.LOCK_ON_OBSTACLE}),
+]
+
+
+class TestBatchLayoutValidator(TestCase):
+
+    def test_should_match_state_factory_for_random_layouts(self):
+
+        shape = (4, 5)
+        num_layouts = 5000
+        obstacles = ObstacleLayer.from_coords(shape, walls=[(0, 4), (2, 2)], pits=[(3, 0)])
+        rng = np.random.RandomState(0)
+
+        def random_coords(absent_probability: float) -> list:
+            coords = rng.randint(0, shape, size=(num_layouts, 2))
+            # one coord of some rows moved out of bounds, never both to -1 which is ABSENT in the batch arrays
+            rows = np.flatnonzero(rng.random_sample(num_layouts) < 0.05)
+            coords[rows, rng.randint(0, 2, size=rows.size)] = rng.choice([-2, -1, 5, 6], size=rows.size)
+            return [None if rng.random_sample() < absent_probability else (int(row), int(col))
+                    for row, col in coords]
+
+        player = random_coords(0)
+        key = random_coords(0.3)
+        lock = random_coords(0.3)
+        pit_start = random_coords(0.2)
+        pit_end = [None if coords is None or rng.random_sample() < 0.1 else
+                   (coords[0] + int(rng.randint(0, 2)), coords[1] + int(rng.randint(0, 2))) for coords in pit_start]
+
+        result = GridWorldStateFactory.validate_batch(shape, *[Validator.coords_array(coords) for coords in
+                                                               [player, key, lock, pit_start, pit_end]], obstacles)
+
+        # every reason should be covered by the random layouts
+        self.assertEqual(set(Validator.NAMES), set(result.reasons))
+
+        for i in range(num_layouts):
+
+            try:
+                GridWorldStateFactory.create(shape, player[i], key[i], lock[i], pit_start[i], pit_end[i], obstacles)
+                expected_reasons = {Validator.VALID}
+            except ValueError as error:
+                expected_reasons = next(reasons for pattern, reasons in _MESSAGE_REASONS
+                                        if re.match(pattern, str(error)))
+
+            self.assertIn(result.reasons[i], expected_reasons)
+            self.assertEqual(result.reasons[i] == Validator.VALID, result.is_valid[i])
+
+    def test_sampled_layouts_should_be_valid(self):
+
+        batch = TaskSampler((10, 10), seed=0, key_probability=0.5, lock_probability=0.5, pit_probability=0.5) \
+            .sample(1000)
+
+        result = GridWorldStateFactory.validate_batch(batch.shape, batch.player, batch.key, batch.lock,
+                                                      batch.pit_start, batch.pit_end)
+
+        self.assertTrue(np.all(result.is_valid))
+
+    def test_per_layout_shapes(self):
+
+        shapes = np.array([[3, 3], [5, 5]])
+        player = np.array([[4, 4], [4, 4]])
+        lock = np.array([[0, 0], [0, 0]])
+        absent = Validator.coords_array([None, None])
+
+        result = GridWorldStateFactory.validate_batch(shapes, player, absent, lock, absent, absent)
+
+        np.testing.assert_array_equal([Validator.PLAYER_OUT_OF_BOUNDS, Validator.VALID], result.reasons)
+
+    def test_given_obstacle_layer_of_other_shape_should_throw_value_error(self):
+
+        player = np.array([[0, 0]])
+        lock = np.array([[0, 1]])
+        absent = Validator.coords_array([None])
+
+        self.assertRaises(ValueError, GridWorldStateFactory.validate_batch, (4, 5), player, absent, lock, absent,
+                          absent, ObstacleLayer((5, 5)))
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state_factory import GridWorldStateFactory
+
+
+class TestObstacleLayer(TestCase):
+
+    def test_lookups_should_match_masks(self):
+
+        # cell count not a multiple of 8 so the last packed byte is partially used
+        shape = (37, 53)
+        rng = np.random.RandomState(0)
+        walls = rng.random_sample(shape) < 0.2
+        pits = ~walls & (rng.random_sample(shape) < 0.1)
+
+        obstacles = ObstacleLayer(shape, walls, pits)
+
+        np.testing.assert_array_equal(walls, obstacles.wall_mask())
+        np.testing.assert_array_equal(pits, obstacles.pit_mask())
+
+        for coords in np.ndindex(*shape):
+            self.assertEqual(walls[coords], obstacles.is_wall(coords))
+            self.assertEqual(pits[coords], obstacles.is_pit(coords))
+
+    def test_memory_should_be_one_bit_per_cell_per_layer(self):
+
+        obstacles = ObstacleLayer((1000, 1000), walls=np.eye(1000, dtype=bool))
+
+        self.assertEqual(2 * 1000 * 1000 // 8, obstacles.nbytes)
+
+    def test_from_coords_equality_and_digest(self):
+
+        obstacles = ObstacleLayer.from_coords((3, 4), walls=[(0, 1), (2, 3)], pits=[(1, 1)])
+        same_obstacles = ObstacleLayer.from_coords((3, 4), walls=[(2, 3), (0, 1)], pits=[(1, 1)])
+        other_obstacles = ObstacleLayer.from_coords((3, 4), walls=[(0, 1)], pits=[(1, 1)])
+
+        self.assertTrue(obstacles.is_wall((0, 1)))
+        self.assertTrue(obstacles.is_pit((1, 1)))
+        self.assertFalse(obstacles.is_wall((1, 1)))
+
+        self.assertEqual(obstacles, same_obstacles)
+        self.assertEqual(hash(obstacles), hash(same_obstacles))
+        self.assertEqual(obstacles.digest(), same_obstacles.digest())
+        self.assertNotEqual(obstacles, other_obstacles)
+        self.assertNotEqual(obstacles.digest(), other_obstacles.digest())
+
+    def test_given_invalid_layer_should_throw_value_error(self):
+
+        self.assertRaises(ValueError, ObstacleLayer, (3, 3), np.zeros((3, 4), dtype=bool))
+        self.assertRaises(ValueError, ObstacleLayer.from_coords, (3, 3), [(1, 1)], [(1, 1)])
+
+    def test_state_factory_should_reject_objects_on_obstacles(self):
+
+        obstacles = ObstacleLayer.from_coords((5, 5), walls=[(0, 0)], pits=[(4, 4)])
+
+        GridWorldStateFactory.create((5, 5), (1, 1), (2, 2), (3, 3), obstacles=obstacles)
+
+        with self.assertRaises(ValueError):
+            GridWorldStateFactory.create((5, 5), (0, 0), (2, 2), (3, 3), obstacles=obstacles)
+
+        with self.assertRaises(ValueError):
+            GridWorldStateFactory.create((5, 5), (1, 1), (2, 2), (4, 4), obstacles=obstacles)
+
+        with self.assertRaises(ValueError):
+            GridWorldStateFactory.create((6, 5), (1, 1), (2, 2), (3, 3), obstacles=obstacles)
@@ -263,3 +263,22 @@ class TestGridWorldStateFactory(TestCase):
         self.assertEqual(lock_coords, state.lock, "lock coords not equal")
         self.assertEqual(pit_start_coords, state.pit_start, "pit start lock not equal")
         self.assertEqual(pit_end_coords, state.pit_end, "pit end lock not equal")
+
+    def test_copy_should_only_replace_given_fields(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec()
+
+        new_state = state.copy(player=(0, 0), key=None)
+
+        self.assertEqual((0, 0), new_state.player)
+        self.assertEqual(None, new_state.key)
+        self.assertEqual(state[3:], new_state[3:])
+
+    def test_targeted_updates_should_match_copy(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec()
+
+        self.assertEqual(state.copy(player=(0, 0)), state.with_player((0, 0)))
+        self.assertEqual(state.copy(key=None, has_key=1), state.with_key_picked_up())
+        self.assertEqual(state.copy(lock=None), state.with_lock_unlocked())
+        self.assertIsInstance(state.with_player((0, 0)), type(state))
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestGridWorldStateEncoder(TestCase):
+
+    def setUp(self):
+
+        self.initial_state = GridWorldStateBuilder.create_state_with_spec()
+        self.encoder = GridWorldStateEncoder(self.initial_state)
+        self.reachable_states = TabularTransitionModel.compile(self.initial_state).states
+
+    def test_encode_should_be_inverse_of_decode(self):
+
+        for state in self.reachable_states:
+            self.assertEqual(state, self.encoder.decode(self.encoder.encode(state)))
+
+    def test_reachable_states_should_have_unique_ids_in_range(self):
+
+        state_ids = [self.encoder.encode(state) for state in self.reachable_states]
+
+        self.assertEqual(len(self.reachable_states), len(set(state_ids)))
+        self.assertTrue(all(0 <= state_id < self.encoder.num_states for state_id in state_ids))
+
+    def test_initial_state_id(self):
+
+        # player (1, 4) in a 10 x 10 grid, no key, lock present
+        self.assertEqual(((1 * 10 + 4) * 2 + 0) * 2 + 1, self.encoder.encode(self.initial_state))
+
+    def test_batch_should_match_single_state_encoding(self):
+
+        batch_state = BatchGridWorldState.from_states(self.reachable_states)
+
+        state_ids = self.encoder.encode_batch(batch_state)
+
+        np.testing.assert_array_equal([self.encoder.encode(state) for state in self.reachable_states], state_ids)
+        self.assertEqual(self.reachable_states, self.encoder.decode_batch(state_ids).to_states())
+
+    def test_given_state_id_out_of_range_should_throw_error(self):
+
+        self.assertRaises(ValueError, self.encoder.decode, -1)
+        self.assertRaises(ValueError, self.encoder.decode, self.encoder.num_states)
+        self.assertRaises(ValueError, self.encoder.decode_batch, np.asarray([0, self.encoder.num_states]))
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.state.validator import TerminalStateValidator, ObstacleTerminalStateValidator, TerminalStateMask
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestTerminalStateMask(TestCase):
+
+    def test_should_match_terminal_state_validator_for_every_state(self):
+
+        initial_states = [
+            GridWorldStateBuilder.create_state_with_spec(),
+            GridWorldStateBuilder.create_state_with_spec(shape=(7, 6), player_coords=(0, 2), key_coords=None,
+                                                         lock_coords=(0, 1), pit_start_coords=(3, 2),
+                                                         pit_end_coords=(3, 5)),
+            GridWorldStateBuilder.create_state_with_spec(shape=(5, 5), player_coords=(4, 4), key_coords=(0, 0),
+                                                         lock_coords=None, pit_start_coords=None,
+                                                         pit_end_coords=None),
+        ]
+
+        for initial_state in initial_states:
+            with self.subTest(initial_state=initial_state):
+
+                mask = TerminalStateMask(initial_state)
+                encoder = GridWorldStateEncoder(initial_state)
+
+                for state_id in range(encoder.num_states):
+                    state = encoder.decode(state_id)
+                    self.assertEqual(TerminalStateValidator.is_terminal_state(state), mask.is_terminal_state(state))
+
+    def test_should_include_obstacle_layer_pits(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(0, 0)], pits=[(9, 0), (2, 8)])
+
+        mask = TerminalStateMask(initial_state, obstacles)
+        validator = ObstacleTerminalStateValidator(obstacles)
+        encoder = GridWorldStateEncoder(initial_state)
+
+        for state_id in range(encoder.num_states):
+            state = encoder.decode(state_id)
+            self.assertEqual(validator.is_terminal_state(state), mask.is_terminal_state(state))
+
+        self.assertTrue(mask.is_terminal_state(initial_state.copy(player=(9, 0))))
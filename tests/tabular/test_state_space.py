@@ -0,0 +1,173 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.tabular.state_space import ReachableStateSpace
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestReachableStateSpace(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+    def test_should_match_transition_model(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+
+        state_space = ReachableStateSpace.explore(initial_state)
+        model = TabularTransitionModel.compile(initial_state)
+
+        self.assertEqual(model.num_states, state_space.num_states)
+        np.testing.assert_array_equal(model.next_state, state_space.adjacency)
+        np.testing.assert_array_equal(model.done, state_space.done)
+
+        for state_id, state in enumerate(model.states):
+            self.assertEqual(state, state_space.state(state_id))
+            self.assertEqual(state_id, state_space.state_id(state))
+
+        np.testing.assert_array_equal(np.arange(model.num_states),
+                                      state_space.state_ids(BatchGridWorldState.from_states(model.states)))
+
+    def test_distances_should_be_breadth_first_depths(self):
+
+        state_space = GridWorldBuilder.create_state_space(self.params)
+
+        self.assertEqual(0, state_space.distances[ReachableStateSpace.INITIAL_STATE_ID])
+
+        for state_id in range(state_space.num_states):
+
+            if state_space.done[state_id]:
+                continue
+
+            next_distances = state_space.distances[state_space.adjacency[state_id]]
+            self.assertTrue(np.all(next_distances <= state_space.distances[state_id] + 1))
+
+        # every state other than the initial state is one step further than its closest predecessor
+        predecessor_distances = np.full(state_space.num_states, np.iinfo(np.int64).max)
+        not_done = ~state_space.done
+        np.minimum.at(predecessor_distances, state_space.adjacency[not_done].ravel(),
+                      np.repeat(state_space.distances[not_done], state_space.num_actions))
+
+        np.testing.assert_array_equal(state_space.distances[1:], predecessor_distances[1:] + 1)
+
+    def test_given_unreachable_state_should_throw_value_error(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0))
+        state_space = ReachableStateSpace.explore(initial_state)
+
+        unreachable_state = initial_state.copy(player=initial_state.nw_beacon)
+
+        self.assertRaises(ValueError, state_space.state_id, unreachable_state)
+        self.assertEqual(ReachableStateSpace.UNREACHABLE,
+                         state_space.state_ids(BatchGridWorldState.from_states([unreachable_state]))[0])
+
+    def test_save_and_load_should_memory_map_same_index(self):
+
+        state_space = GridWorldBuilder.create_state_space(self.params)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            directory = os.path.join(temp_dir, "state_space")
+            state_space.save(directory)
+            loaded_state_space = ReachableStateSpace.load(directory)
+
+            self.assertEqual(state_space.initial_state, loaded_state_space.initial_state)
+
+            for name in ["codes", "adjacency", "distances", "done", "code_order"]:
+                self.assertIsInstance(getattr(loaded_state_space, name), np.memmap)
+                np.testing.assert_array_equal(getattr(state_space, name), getattr(loaded_state_space, name))
+
+            del loaded_state_space
+
+    def test_loaded_state_space_should_look_up_ids_without_dense_id_map(self):
+
+        state_space = GridWorldBuilder.create_state_space(self.params)
+        encoder = GridWorldStateEncoder(state_space.initial_state)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            directory = os.path.join(temp_dir, "state_space")
+            state_space.save(directory)
+            loaded_state_space = ReachableStateSpace.load(directory)
+
+            for name, value in vars(loaded_state_space).items():
+                if isinstance(value, np.ndarray):
+                    self.assertLess(len(value), encoder.num_states, name)
+
+            state_ids = {code: state_id for state_id, code in enumerate(state_space.codes.tolist())}
+            expected = [state_ids.get(code, ReachableStateSpace.UNREACHABLE) for code in range(encoder.num_states)]
+            all_states = encoder.decode_batch(np.arange(encoder.num_states))
+
+            np.testing.assert_array_equal(expected, loaded_state_space.state_ids(all_states))
+
+            for state_id in range(0, state_space.num_states, 50):
+                self.assertEqual(state_id, loaded_state_space.state_id(loaded_state_space.state(state_id)))
+
+            del loaded_state_space
+
+    def test_builder_should_reuse_saved_index_per_params(self):
+
+        other_params = self.params._replace(player=(0, 0))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            explored = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+            loaded = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+            other = GridWorldBuilder.create_state_space(other_params, cache_dir=temp_dir)
+
+            self.assertNotIsInstance(explored.adjacency, np.memmap)
+            self.assertIsInstance(loaded.adjacency, np.memmap)
+            np.testing.assert_array_equal(explored.adjacency, loaded.adjacency)
+
+            self.assertEqual((0, 0), other.initial_state.player)
+            self.assertEqual(2, len(os.listdir(temp_dir)))
+
+            del loaded, other
+
+    def test_builder_should_rebuild_incomplete_index(self):
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            explored = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+            directory = os.path.join(temp_dir, GridWorldBuilder.state_space_name(self.params))
+            os.remove(os.path.join(directory, "code_order.npy"))
+
+            self.assertRaises(FileNotFoundError, ReachableStateSpace.load, directory)
+
+            rebuilt = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+            loaded = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+
+            self.assertNotIsInstance(rebuilt.code_order, np.memmap)
+            self.assertIsInstance(loaded.code_order, np.memmap)
+            np.testing.assert_array_equal(explored.code_order, loaded.code_order)
+
+            del loaded
+
+    def test_builder_should_accept_numpy_int_params(self):
+
+        numpy_params = InitialStateParams(*[None if value is None else tuple(np.asarray(value, dtype=np.int64))
+                                            for value in self.params])
+
+        self.assertIsInstance(numpy_params.player[0], np.int64)
+        self.assertEqual(GridWorldBuilder.state_space_name(self.params),
+                         GridWorldBuilder.state_space_name(numpy_params))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            GridWorldBuilder.create_state_space(numpy_params, cache_dir=temp_dir)
+            loaded = GridWorldBuilder.create_state_space(self.params, cache_dir=temp_dir)
+
+            self.assertIsInstance(loaded.adjacency, np.memmap)
+            self.assertEqual(1, len(os.listdir(temp_dir)))
+
+            del loaded
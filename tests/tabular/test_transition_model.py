@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.dynamics.dynamics import GridWorldDynamics
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.reward.reward import GridWorldRewardFunction
+from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestTabularTransitionModel(TestCase):
+
+    def test_tables_should_match_dynamics_and_reward_function(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        model = TabularTransitionModel.compile(initial_state)
+
+        self.assertEqual(initial_state, model.states[TabularTransitionModel.INITIAL_STATE_ID])
+        self.assertEqual((model.num_states, len(GridWorldAction.NAMES)), model.next_state.shape)
+
+        for state_id, state in enumerate(model.states):
+
+            self.assertEqual(state_id, model.state_id(state))
+            self.assertEqual(TerminalStateValidator.is_terminal_state(state), model.done[state_id])
+
+            if model.done[state_id]:
+                np.testing.assert_array_equal(state_id, model.next_state[state_id])
+                continue
+
+            for action in range(model.num_actions):
+                next_state = GridWorldDynamics(state).step(action)
+                self.assertEqual(next_state, model.states[model.next_state[state_id, action]])
+                self.assertEqual(GridWorldRewardFunction().calculate(state, next_state), model.reward[state_id, action])
+
+    def test_reachable_states_without_key(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec(
+            shape=(3, 3), player_coords=(0, 0), key_coords=None, lock_coords=(2, 2), pit_start_coords=None,
+            pit_end_coords=None)
+        model = TabularTransitionModel.compile(initial_state)
+
+        # 8 player positions with the lock, 2 positions next to the lock once unlocked
+        self.assertEqual(10, model.num_states)
+        self.assertEqual(2, np.count_nonzero(model.done))
+
+
+class TestTabularGridWorld(TestCase):
+
+    def test_step_should_match_grid_world(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env = GridWorldBuilder.create(params)
+        tabular_env = GridWorldBuilder.create_tabular(params)
+        random_state = np.random.RandomState(0)
+
+        state = env.reset()
+        state_id = tabular_env.reset()
+
+        for _ in range(1000):
+
+            action = random_state.randint(0, len(GridWorldAction.NAMES))
+
+            state, reward, done, _ = env.step(action)
+            state_id, tabular_reward, tabular_done, _ = tabular_env.step(action)
+
+            self.assertEqual(state, tabular_env.model.states[state_id])
+            self.assertEqual(reward, tabular_reward)
+            self.assertEqual(done, tabular_done)
+
+            if done:
+                state = env.reset()
+                state_id = tabular_env.reset()
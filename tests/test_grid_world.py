@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.obstacle_layer import ObstacleLayer
+
+
+class TestGridWorld(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+    def test_repeated_transition_should_hit_cache(self):
+
+        env = GridWorldBuilder.create(self.params)
+
+        env.step(GridWorldAction.EAST)
+        env.reset()
+        state, reward, done, _ = env.step(GridWorldAction.EAST)
+
+        info = env.cache_info()
+
+        self.assertEqual((1, 5), state.player)
+        self.assertEqual(-10, reward)
+        self.assertFalse(done)
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
+
+    def test_cache_should_not_grow_beyond_capacity(self):
+
+        env = GridWorldBuilder.create(self.params, cache_capacity=3)
+
+        for action in [GridWorldAction.EAST, GridWorldAction.EAST, GridWorldAction.SOUTH, GridWorldAction.WEST]:
+            env.step(action)
+
+        self.assertEqual(3, env.cache_info().size)
+
+    def test_copy_should_not_share_cache(self):
+
+        env = GridWorldBuilder.create(self.params, cache_capacity=100)
+        env.step(GridWorldAction.EAST)
+
+        new_env = env.copy()
+
+        self.assertEqual(0, new_env.cache_info().size)
+        self.assertEqual(100, new_env.cache_info().capacity)
+
+    def test_clear_cache(self):
+
+        env = GridWorldBuilder.create(self.params)
+        env.step(GridWorldAction.EAST)
+
+        env.clear_cache()
+
+        self.assertEqual(0, env.cache_info().size)
+
+    def test_obstacle_layer_on_large_grid(self):
+
+        shape = (1000, 1000)
+        walls = np.zeros(shape, dtype=bool)
+        walls[::2, 1:-1] = True
+        pits = np.zeros(shape, dtype=bool)
+        pits[1, 500] = True
+
+        params = InitialStateParams(shape=shape, player=(1, 1), key=(3, 0), lock=(999, 999),
+                                    obstacles=ObstacleLayer(shape, walls, pits))
+
+        env = GridWorldBuilder.create(params)
+        env.reset()
+
+        state, reward, done, _ = env.step(GridWorldAction.NORTH)
+
+        self.assertEqual((1, 1), state.player)
+        self.assertFalse(done)
+
+        for _ in range(498):
+            state, reward, done, _ = env.step(GridWorldAction.EAST)
+
+        self.assertEqual((1, 499), state.player)
+        self.assertFalse(done)
+
+        state, reward, done, _ = env.step(GridWorldAction.EAST)
+
+        self.assertEqual((1, 500), state.player)
+        self.assertEqual(-200, reward)
+        self.assertTrue(done)
+
+    def test_obstacle_layer_in_tabular_task_and_state_space_name(self):
+
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(1, 5)])
+        params = self.params._replace(obstacles=obstacles)
+
+        env = GridWorldBuilder.create_tabular(params)
+        env.reset()
+        state_id, _, _, _ = env.step(GridWorldAction.EAST)
+
+        self.assertEqual((1, 4), env.model.states[state_id].player)
+        self.assertNotEqual(GridWorldBuilder.state_space_name(self.params), GridWorldBuilder.state_space_name(params))
+        self.assertRaises(ValueError, GridWorldBuilder.create_batch, [params])
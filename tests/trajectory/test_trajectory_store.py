@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.trajectory.trajectory_store import TrajectoryWriter, TrajectoryReader, TrajectoryChunk
+
+
+def chunk(episode, step, state, action, reward, next_state, done) -> TrajectoryChunk:
+    return TrajectoryChunk(*(np.asarray(column) for column in [episode, step, state, action, reward, next_state,
+                                                               done]))
+
+
+class TestTrajectoryStore(TestCase):
+
+    def setUp(self):
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_directory.name, "trajectories")
+
+    def tearDown(self):
+        self.temp_directory.cleanup()
+
+    def test_should_write_memory_mapped_columnar_chunks(self):
+
+        writer = TrajectoryWriter(self.directory, state_dtype=np.uint16)
+        writer.write(chunk([0, 0], [0, 1], [61, 65], [1, 2], [-10, -200], [65, 69], [False, True]))
+        writer.write(chunk([], [], [], [], [], [], []))
+
+        self.assertEqual(1, writer.num_chunks)
+        self.assertEqual(1, writer.next_episode_id)
+        self.assertEqual(["chunk_00000000"], os.listdir(self.directory))
+
+        read_chunk = TrajectoryReader(self.directory).chunk(0)
+
+        self.assertIsInstance(read_chunk.state, np.memmap)
+        self.assertEqual(np.dtype(np.uint16), read_chunk.state.dtype)
+        self.assertEqual(np.dtype(np.uint8), read_chunk.action.dtype)
+        self.assertEqual([-10, -200], read_chunk.reward.tolist())
+        self.assertEqual([False, True], read_chunk.done.tolist())
+
+    def test_episodes_should_be_joined_across_chunks(self):
+
+        writer = TrajectoryWriter(self.directory)
+        writer.write(chunk([0, 0, 1], [0, 1, 0], [1, 2, 3], [0, 0, 0], [-10, -10, -10], [2, 3, 4],
+                           [False, True, False]))
+        writer.write(chunk([1], [1], [4], [0], [500], [5], [False]))
+        writer.write(chunk([1, 2], [2, 0], [5, 6], [0, 0], [1000, -10], [6, 7], [True, False]))
+
+        episodes = list(TrajectoryReader(self.directory).episodes())
+
+        self.assertEqual([0, 1, 2], [episode.episode_id for episode in episodes])
+        self.assertEqual([[1, 2], [3, 4, 5], [6]], [episode.states.tolist() for episode in episodes])
+        self.assertEqual([-20, 1490, -10], [episode.total_reward() for episode in episodes])
+        self.assertEqual([2, 3, 1], [episode.num_steps() for episode in episodes])
+
+        # a new writer appends after the existing chunks
+        writer = TrajectoryWriter(self.directory)
+
+        self.assertEqual((3, 3), (writer.num_chunks, writer.next_episode_id))
+
+    def test_reader_should_ignore_temporary_chunks(self):
+
+        os.makedirs(os.path.join(self.directory, "chunk_00000000.tmp-123"))
+
+        reader = TrajectoryReader(self.directory)
+
+        self.assertEqual(0, reader.num_chunks())
+        self.assertEqual([], list(reader.episodes()))
+        self.assertRaises(ValueError, reader.column, "player")
+        self.assertEqual(0, TrajectoryReader(os.path.join(self.directory, "missing")).num_chunks())
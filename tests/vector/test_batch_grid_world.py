@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.dynamics.dynamics import GridWorldDynamics
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.reward.reward import GridWorldRewardFunction
+from clgridworld.state.validator import TerminalStateValidator
+from clgridworld.vector.batch_grid_world import BatchGridWorld, BatchGridWorldState
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+class TestBatchGridWorld(TestCase):
+
+    def setUp(self):
+
+        self.params_list = [
+            #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+            InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                               pit_end=(4, 7)),
+            InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0)),
+            InitialStateParams(shape=(7, 7), player=(6, 5), lock=(0, 1), pit_start=(3, 2), pit_end=(3, 6)),
+            InitialStateParams(shape=(3, 4), player=(0, 0), key=(0, 1), lock=(1, 0)),
+            InitialStateParams(shape=(7, 6), player=(0, 2), lock=(0, 1), pit_start=(3, 2), pit_end=(3, 5)),
+        ]
+
+    def test_state_round_trip(self):
+
+        states = [GridWorldStateBuilder.create_state_with_spec(),
+                  GridWorldStateBuilder.create_state_with_spec(key_coords=None, pit_start_coords=None,
+                                                               pit_end_coords=None)]
+
+        batch_state = BatchGridWorldState.from_states(states)
+
+        self.assertEqual(2, batch_state.num_states())
+        self.assertEqual(states, batch_state.to_states())
+
+    def test_step_should_match_dynamics_and_reward_function(self):
+
+        env = GridWorldBuilder.create_batch(self.params_list)
+        random_state = np.random.RandomState(0)
+
+        curr_states = env.reset().to_states()
+
+        for _ in range(2000):
+
+            actions = random_state.randint(0, len(GridWorldAction.NAMES), size=env.num_envs)
+            next_batch_state, rewards, dones, info = env.step(actions)
+
+            terminal_states = info["terminal_states"].to_states()
+            next_states = next_batch_state.to_states()
+
+            for i in range(env.num_envs):
+
+                expected_state = GridWorldDynamics(curr_states[i]).step(actions[i])
+                expected_reward = GridWorldRewardFunction().calculate(curr_states[i], expected_state)
+                expected_done = TerminalStateValidator.is_terminal_state(expected_state)
+
+                self.assertEqual(expected_state, terminal_states[i])
+                self.assertEqual(expected_reward, rewards[i])
+                self.assertEqual(expected_done, dones[i])
+
+            curr_states = next_states
+
+    def test_finished_worlds_should_be_reset(self):
+
+        params = InitialStateParams(shape=(5, 5), player=(0, 0), key=(0, 1))
+        env = GridWorldBuilder.create_batch([params, params])
+
+        state, rewards, dones, info = env.step(np.asarray([GridWorldAction.PICK_UP_KEY, GridWorldAction.SOUTH]))
+
+        np.testing.assert_array_equal([True, False], dones)
+        np.testing.assert_array_equal([500, -10], rewards)
+        self.assertEqual(env.initial_state.state(0), state.state(0))
+        self.assertEqual((1, 0), state.state(1).player)
+        self.assertTrue(info["terminal_states"].state(0).has_key)
+
+    def test_given_terminal_state_should_throw_terminal_state_error(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(player_coords=(0, 0), key_coords=(0, 1), lock_coords=None)
+        terminal_state = GridWorldDynamics(state).step(GridWorldAction.PICK_UP_KEY)
+
+        env = BatchGridWorld([terminal_state])
+
+        self.assertRaises(Exception, env.step, np.asarray([GridWorldAction.NORTH]))
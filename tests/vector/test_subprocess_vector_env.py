@@ -0,0 +1,152 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.vector.subprocess_vector_env import SubprocessVectorEnv
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+
+class InitialStateOnlyObservationWrapper(DistanceObservationWrapper):
+
+    def observation(self, observation):
+
+        if observation != self.env.initial_state:
+            raise ValueError("stepped away from the initial state")
+
+        return super(InitialStateOnlyObservationWrapper, self).observation(observation)
+
+
+class TestSubprocessVectorEnv(TestCase):
+
+    def setUp(self):
+
+        self.params_list = [
+            #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+            InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                               pit_end=(4, 7)),
+            InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0)),
+            InitialStateParams(shape=(7, 7), player=(6, 5), lock=(0, 1), pit_start=(3, 2), pit_end=(3, 6)),
+            InitialStateParams(shape=(3, 4), player=(0, 0), key=(0, 1), lock=(1, 0)),
+            InitialStateParams(shape=(7, 6), player=(0, 2), lock=(0, 1), pit_start=(3, 2), pit_end=(3, 5)),
+        ]
+
+    def step_serially(self, envs, actions):
+        """Steps each env, resetting it when done, and returns the results stacked as the vector env does."""
+
+        results = []
+
+        for env, action in zip(envs, actions):
+
+            observation, reward, done, _ = env.step(int(action))
+            terminal_observation = observation
+
+            if done:
+                observation = env.reset()
+
+            results.append((observation, reward, done, terminal_observation))
+
+        observations, rewards, dones, terminal_observations = (np.asarray(column) for column in zip(*results))
+
+        return observations, rewards, dones, terminal_observations
+
+    def test_should_match_serial_envs_with_auto_reset(self):
+
+        rng = np.random.RandomState(0)
+
+        for num_workers in [1, 2, 5]:
+            with self.subTest(num_workers=num_workers):
+
+                envs = [DistanceObservationWrapper(GridWorldBuilder.create(params)) for params in self.params_list]
+
+                with SubprocessVectorEnv(self.params_list, num_workers=num_workers) as vector_env:
+
+                    self.assertEqual(min(num_workers, 5), vector_env.num_workers)
+                    np.testing.assert_array_equal(np.asarray([env.reset() for env in envs]), vector_env.reset())
+
+                    num_dones = 0
+
+                    for _ in range(200):
+
+                        actions = rng.randint(len(GridWorldAction.NAMES), size=len(envs))
+                        observations, rewards, dones, info = vector_env.step(actions)
+
+                        expected = self.step_serially(envs, actions)
+
+                        np.testing.assert_array_equal(expected[0], observations)
+                        np.testing.assert_array_equal(expected[1], rewards)
+                        np.testing.assert_array_equal(expected[2], dones)
+                        np.testing.assert_array_equal(expected[3][dones], info["terminal_observations"][dones])
+
+                        num_dones += dones.sum()
+
+                    self.assertGreater(num_dones, 0)
+
+    def test_step_async_should_return_results_on_wait(self):
+
+        # state ids are only comparable between tasks of the same grid shape
+        params_list = [self.params_list[0]._replace(player=player) for player in [(1, 4), (8, 8), (0, 0)]]
+        envs = [GridWorldBuilder.create(params) for params in params_list]
+        encoders = [GridWorldStateEncoder(env.initial_state) for env in envs]
+
+        with SubprocessVectorEnv(params_list, num_workers=2, observation_wrapper=None) as vector_env:
+
+            observations = vector_env.reset()
+
+            self.assertEqual(np.int64, observations.dtype)
+            self.assertEqual([encoder.encode(env.reset()) for env, encoder in zip(envs, encoders)],
+                             observations.tolist())
+
+            actions = np.full(len(envs), GridWorldAction.NORTH)
+            vector_env.step_async(actions)
+
+            self.assertRaises(ValueError, vector_env.step_async, actions)
+            self.assertRaises(ValueError, vector_env.reset)
+
+            observations, _, _, _ = vector_env.step_wait()
+
+            self.assertEqual([encoder.encode(env.step(GridWorldAction.NORTH)[0])
+                              for env, encoder in zip(envs, encoders)], observations.tolist())
+            self.assertRaises(ValueError, vector_env.step_wait)
+            self.assertRaises(ValueError, vector_env.step, actions[:2])
+
+        self.assertTrue(vector_env.closed)
+        self.assertRaises(ValueError, vector_env.reset)
+
+    def test_given_worker_error_should_raise_error(self):
+
+        with SubprocessVectorEnv(self.params_list[:2], num_workers=2,
+                                 observation_wrapper=InitialStateOnlyObservationWrapper) as vector_env:
+
+            vector_env.reset()
+
+            with self.assertRaisesRegex(RuntimeError, "stepped away from the initial state"):
+                vector_env.step(np.asarray([GridWorldAction.NORTH, GridWorldAction.NORTH]))
+
+            # workers keep running after an error
+            vector_env.reset()
+
+    def test_given_state_ids_of_different_grid_shapes_should_throw_error(self):
+
+        self.assertRaises(ValueError, SubprocessVectorEnv, self.params_list[:2], 1, None)
+
+        params_list = [self.params_list[1], self.params_list[1]._replace(player=(2, 2))]
+
+        with SubprocessVectorEnv(params_list, num_workers=1, observation_wrapper=None) as vector_env:
+
+            self.assertEqual(5 * 5 * 4, vector_env.observation_space.n)
+            self.assertEqual([(4 * 5 + 4) * 4, (2 * 5 + 2) * 4], vector_env.reset().tolist())
+
+    def test_given_dead_worker_should_raise_error(self):
+
+        with SubprocessVectorEnv(self.params_list, num_workers=2) as vector_env:
+
+            vector_env.reset()
+
+            vector_env._processes[1].terminate()
+            vector_env._processes[1].join()
+
+            with self.assertRaisesRegex(RuntimeError, "worker 1 exited"):
+                vector_env.step(np.zeros(len(self.params_list), dtype=np.int64))
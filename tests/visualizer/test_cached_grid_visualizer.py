@@ -0,0 +1,81 @@
+import io
+from unittest import TestCase
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.visualizer.cached_grid_visualizer import CachedGridVisualizer
+from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+def expected_frame(state, obstacles=None) -> str:
+    has_key = "true" if state.has_key else "false"
+    return str(GridStateVisualizer(state, obstacles).grid) + "\nhas_key: " + has_key + "\n"
+
+
+class TestCachedGridVisualizer(TestCase):
+
+    def test_frames_should_match_grid_state_visualizer_for_every_reachable_state(self):
+
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(0, 0), (2, 3)], pits=[(9, 9), (1, 6)])
+
+        tasks = [
+            (GridWorldStateBuilder.create_state_with_spec(), None),
+            (GridWorldStateBuilder.create_state_with_spec(), obstacles),
+            (GridWorldStateBuilder.create_state_with_spec(shape=(4, 6), player_coords=(0, 2), key_coords=None,
+                                                          lock_coords=(0, 1), pit_start_coords=(2, 2),
+                                                          pit_end_coords=(3, 5)), None),
+        ]
+
+        for initial_state, obstacles in tasks:
+            with self.subTest(initial_state=initial_state, obstacles=obstacles):
+
+                visualizer = CachedGridVisualizer(initial_state, obstacles)
+
+                # frames rendered one after the other so the cells patched for the previous frame are restored
+                for state in TabularTransitionModel.compile(initial_state, obstacles=obstacles).states:
+                    self.assertEqual(expected_frame(state, obstacles), visualizer.frame(state))
+
+    def test_human_mode_should_write_frames_in_bulk(self):
+
+        stream = io.StringIO()
+        state = GridWorldStateBuilder.create_state_with_spec()
+        visualizer = CachedGridVisualizer(state, stream=stream, frames_per_write=3)
+
+        visualizer.render(state)
+        visualizer.render(state)
+
+        self.assertEqual("", stream.getvalue())
+
+        visualizer.render(state)
+
+        self.assertEqual(3 * expected_frame(state), stream.getvalue())
+
+        visualizer.render(state)
+        visualizer.flush()
+
+        self.assertEqual(4 * expected_frame(state), stream.getvalue())
+        self.assertRaises(ValueError, visualizer.render, state, 'rgb')
+
+    def test_env_render_modes(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+
+        stream = io.StringIO()
+        env = GridWorldBuilder.create(params)
+        env.visualizer.writer.stream = stream
+        env.visualizer.writer.frames_per_write = 10
+
+        env.reset()
+        state, _, _, _ = env.step(GridWorldAction.EAST)
+
+        self.assertEqual(expected_frame(state), env.render(mode='ansi'))
+
+        env.render()
+        self.assertEqual("", stream.getvalue())
+
+        env.close()
+        self.assertEqual(expected_frame(state), stream.getvalue())
@@ -2,6 +2,7 @@ from unittest import TestCase
 
 import numpy as np
 
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
 from tests.state.grid_world_state_builder import GridWorldStateBuilder
 
@@ -151,3 +152,15 @@ class TestGridWorldGridState(TestCase):
 
         grid[4, 6] = GridStateVisualizer.EMPTY
         self.assertFalse(np.any(grid == GridStateVisualizer.BEACON), "additional beacons should not be on grid")
+
+    def test_obstacle_layer(self):
+
+        obstacles = ObstacleLayer.from_coords((10, 10), walls=[(0, 0), (9, 9)], pits=[(2, 2)])
+
+        state = GridWorldStateBuilder.create_state_with_spec()
+        grid = GridStateVisualizer(state, obstacles).grid
+
+        self.assertEqual(GridStateVisualizer.WALL, grid[0, 0])
+        self.assertEqual(GridStateVisualizer.WALL, grid[9, 9])
+        self.assertEqual(GridStateVisualizer.PIT, grid[2, 2])
+        self.assertEqual(GridStateVisualizer.EMPTY, GridStateVisualizer(state).grid[0, 0])
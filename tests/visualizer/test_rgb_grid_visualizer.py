@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.obstacle_layer import ObstacleLayer
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.vector.batch_grid_world import BatchGridWorldState
+from clgridworld.visualizer.grid_state_visualizer import GridStateVisualizer
+from clgridworld.visualizer import rgb_grid_visualizer
+from clgridworld.visualizer.rgb_grid_visualizer import RgbGridVisualizer, tile_table, tiles_to_images
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
+
+
+def expected_image(state, obstacles=None, tile_size=rgb_grid_visualizer.DEFAULT_TILE_SIZE) -> np.ndarray:
+    codes = RgbGridVisualizer.tile_codes(GridStateVisualizer(state, obstacles).grid)
+    return tiles_to_images(codes, tile_table(tile_size))
+
+
+class TestRgbGridVisualizer(TestCase):
+
+    def setUp(self):
+
+        self.obstacles = ObstacleLayer.from_coords((10, 10), walls=[(0, 0), (2, 3)], pits=[(9, 9), (1, 6)])
+
+        self.initial_states = [
+            GridWorldStateBuilder.create_state_with_spec(),
+            GridWorldStateBuilder.create_state_with_spec(player_coords=(9, 0), key_coords=None, lock_coords=(0, 9),
+                                                         pit_start_coords=(5, 5), pit_end_coords=(6, 8)),
+            GridWorldStateBuilder.create_state_with_spec(player_coords=(3, 3), key_coords=(8, 8), lock_coords=None,
+                                                         pit_start_coords=None, pit_end_coords=None),
+        ]
+
+    def test_tile_table(self):
+
+        tiles = tile_table(8)
+
+        self.assertEqual((7, 8, 8, 3), tiles.shape)
+        self.assertEqual(np.uint8, tiles.dtype)
+        self.assertFalse(tiles.flags.writeable)
+        self.assertIs(tiles, tile_table(8))
+
+        for code, (color, _) in rgb_grid_visualizer.TILE_STYLES.items():
+            self.assertEqual(color, tuple(tiles[code, 4, 4]))
+
+        self.assertEqual(rgb_grid_visualizer.GRID_LINE_COLOR, tuple(tiles[rgb_grid_visualizer.PLAYER, 7, 7]))
+        self.assertEqual((7, 1, 1, 3), tile_table(1).shape)
+        self.assertRaises(ValueError, tile_table, 0)
+
+    def test_images_should_match_grid_state_visualizer_for_every_reachable_state(self):
+
+        for initial_state in self.initial_states:
+            for obstacles in [None, self.obstacles]:
+                with self.subTest(initial_state=initial_state, obstacles=obstacles):
+
+                    visualizer = RgbGridVisualizer(initial_state, obstacles)
+                    out = np.empty((80, 80, 3), dtype=np.uint8)
+
+                    for state in TabularTransitionModel.compile(initial_state, obstacles=obstacles).states:
+                        np.testing.assert_array_equal(expected_image(state, obstacles), visualizer.image(state))
+                        self.assertIs(out, visualizer.image(state, out))
+                        np.testing.assert_array_equal(expected_image(state, obstacles), out)
+
+    def test_batch_images_should_match_images_of_each_state(self):
+
+        states = [state for initial_state in self.initial_states
+                  for state in TabularTransitionModel.compile(initial_state, obstacles=self.obstacles).states]
+        batch_state = BatchGridWorldState.from_states(states)
+
+        for tile_size in [1, 4]:
+            with self.subTest(tile_size=tile_size):
+
+                out = np.zeros((len(states), 10 * tile_size, 10 * tile_size, 3), dtype=np.uint8)
+                images = RgbGridVisualizer.batch_images(batch_state, self.obstacles, tile_size, out=out)
+
+                self.assertIs(out, images)
+
+                for state, image in zip(states, images):
+                    np.testing.assert_array_equal(expected_image(state, self.obstacles, tile_size), image)
+
+    def test_batch_images_should_reject_mixed_shapes_and_wrong_out_arrays(self):
+
+        batch_state = BatchGridWorldState.from_states(self.initial_states[:2])
+
+        self.assertRaises(ValueError, RgbGridVisualizer.batch_images, batch_state,
+                          out=np.empty((2, 80, 80, 3), dtype=np.float32))
+        self.assertRaises(ValueError, RgbGridVisualizer.batch_images, batch_state,
+                          out=np.empty((3, 80, 80, 3), dtype=np.uint8))
+        self.assertRaises(ValueError, RgbGridVisualizer.batch_images, batch_state,
+                          out=np.empty((2, 80, 80, 6), dtype=np.uint8)[..., :3])
+
+        small_state = GridWorldStateBuilder.create_state_with_spec(shape=(4, 6), player_coords=(0, 2), key_coords=None,
+                                                                   lock_coords=(0, 1), pit_start_coords=(2, 2),
+                                                                   pit_end_coords=(3, 5))
+        mixed_batch_state = BatchGridWorldState.from_states([self.initial_states[0], small_state])
+
+        self.assertRaises(ValueError, RgbGridVisualizer.batch_images, mixed_batch_state)
+
+    def test_env_rgb_array_mode(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+
+        state, _, _, _ = GridWorldBuilder.create(params).step(GridWorldAction.EAST)
+
+        for env in [GridWorldBuilder.create(params), GridWorldBuilder.create_tabular(params)]:
+            with self.subTest(env=env):
+
+                env.reset()
+                env.step(GridWorldAction.EAST)
+
+                self.assertIn('rgb_array', env.metadata['render.modes'])
+
+                image = env.render(mode='rgb_array')
+
+                self.assertEqual((80, 80, 3), image.shape)
+                np.testing.assert_array_equal(expected_image(state), image)
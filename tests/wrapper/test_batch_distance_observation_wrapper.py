@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import InitialStateParams, GridWorldBuilder
+from clgridworld.wrapper.batch_distance_observation_wrapper import BatchDistanceObservationWrapper
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+
+
+class TestBatchDistanceObservation(TestCase):
+
+    def setUp(self):
+
+        self.params_list = [
+            #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+            InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                               pit_end=(4, 7)),
+            InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0)),
+            InitialStateParams(shape=(7, 7), player=(6, 5), lock=(0, 1), pit_start=(3, 2), pit_end=(3, 6)),
+            InitialStateParams(shape=(20, 20), player=(0, 0), key=(10, 1), lock=(5, 5), pit_start=(17, 0),
+                               pit_end=(19, 3)),
+        ]
+
+    def test_reachable_observations_should_match_observation_exactly(self):
+
+        for params in self.params_list:
+            with self.subTest(params=params):
+
+                env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+
+                states, observations = env_wrapper.reachable_observations()
+
+                self.assertEqual((len(states), 17), observations.shape)
+
+                for state, observation in zip(states, observations):
+                    np.testing.assert_array_equal(env_wrapper.observation(state), observation)
+
+    def test_batch_env_should_return_distance_observations(self):
+
+        env = BatchDistanceObservationWrapper(GridWorldBuilder.create_batch(self.params_list))
+        env_wrappers = [DistanceObservationWrapper(GridWorldBuilder.create(params)) for params in self.params_list]
+        random_state = np.random.RandomState(0)
+
+        observations = env.reset()
+
+        for _ in range(100):
+
+            states = env.env.curr_state.to_states()
+
+            for i in range(env.num_envs):
+                np.testing.assert_array_equal(env_wrappers[i].observation(states[i]), observations[i])
+
+            actions = random_state.randint(0, len(GridWorldAction.NAMES), size=env.num_envs)
+            observations, _, _, _ = env.step(actions)
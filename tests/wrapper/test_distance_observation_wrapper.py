@@ -3,7 +3,9 @@ from unittest import TestCase
 import numpy as np
 
 from clgridworld.action.action import GridWorldAction
+from clgridworld.generator.task_sampler import TaskSampler
 from clgridworld.grid_world_builder import InitialStateParams, GridWorldBuilder
+from clgridworld.state.obstacle_layer import ObstacleLayer
 from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
 
 
@@ -32,3 +34,115 @@ class TestDistanceObservationWrapper(TestCase):
         env_wrapper = DistanceObservationWrapper(env)
 
         state = env_wrapper.step(GridWorldAction.SOUTH)
+
+    def test_distance_field_should_be_built_lazily_and_shared_between_wrappers(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+        other_env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params._replace(player=(8, 8))))
+
+        self.assertIsNone(env_wrapper._distance_field)
+
+        env_wrapper.prewarm_cache()
+        self.assertIsNone(env_wrapper._distance_field)
+
+        env_wrapper.clear_cache()
+        env_wrapper.reset()
+        other_env_wrapper.reset()
+
+        self.assertIsNotNone(env_wrapper._distance_field)
+        self.assertIs(env_wrapper._distance_field, other_env_wrapper._distance_field)
+
+    def test_states_of_other_tasks_should_be_observed_from_the_state_alone(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+
+        for other_params in TaskSampler((10, 10), seed=0, key_probability=0.5).sample(20).to_params():
+
+            other_env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(other_params))
+            other_state = other_env_wrapper.env.reset()
+
+            for _ in range(3):
+                np.testing.assert_array_equal(other_env_wrapper.observation(other_state),
+                                              env_wrapper.observation(other_state))
+                other_state, _, done, _ = other_env_wrapper.env.step(GridWorldAction.EAST)
+
+                if done:
+                    break
+
+    def test_observation_should_be_read_only(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+
+        state = env_wrapper.reset()
+
+        with self.assertRaises(ValueError):
+            state[0] = 0
+
+    def test_repeated_observation_should_hit_cache(self):
+
+        params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                    pit_end=(4, 7))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params), cache_capacity=1)
+
+        env_wrapper.reset()
+        env_wrapper.reset()
+        env_wrapper.step(GridWorldAction.EAST)
+
+        info = env_wrapper.cache_info()
+
+        self.assertEqual(1, info.hits)
+        self.assertEqual(2, info.misses)
+        self.assertEqual(1, info.size)
+
+    def test_prewarm_cache_should_cache_reachable_observations(self):
+
+        params = InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params))
+
+        num_cached = env_wrapper.prewarm_cache()
+        env_wrapper.reset()
+        env_wrapper.step(GridWorldAction.NORTH)
+
+        self.assertEqual(num_cached, env_wrapper.cache_info().size)
+        self.assertEqual(2, env_wrapper.cache_info().hits)
+        self.assertEqual(0, env_wrapper.cache_info().misses)
+
+    def test_prewarm_cache_should_not_exceed_capacity(self):
+
+        params = InitialStateParams(shape=(5, 5), player=(4, 4), key=(0, 0))
+        env_wrapper = DistanceObservationWrapper(GridWorldBuilder.create(params), cache_capacity=10)
+
+        self.assertEqual(10, env_wrapper.prewarm_cache())
+        self.assertEqual(10, env_wrapper.cache_info().size)
+
+    def test_look_ahead_should_respect_obstacle_layer(self):
+
+        shape = (5, 5)
+        obstacles = ObstacleLayer.from_coords(shape, walls=[(0, 1)], pits=[(1, 0)])
+        params = InitialStateParams(shape=shape, player=(0, 0), key=(4, 4), lock=(4, 0), obstacles=obstacles)
+        env = GridWorldBuilder.create(params)
+        env_wrapper = DistanceObservationWrapper(env)
+
+        observation = env_wrapper.reset()
+        open_observation = DistanceObservationWrapper(GridWorldBuilder.create(params._replace(obstacles=None))).reset()
+
+        # east is walled off so stepping east stays in place, as the env's own step does
+        state = env.initial_state
+        self.assertEqual(state.player, env.dynamics.step(state, GridWorldAction.EAST).player)
+        self.assertEqual(state.player, env_wrapper._dynamics.step(state, GridWorldAction.EAST).player)
+        self.assertEqual(observation[0], observation[1])
+        self.assertNotEqual(open_observation[0], open_observation[1])
+
+        # south steps into a pit of the layer
+        self.assertEqual([0, 0, 1, 0], observation[12:16].tolist())
+        self.assertEqual([0, 0, 0, 0], open_observation[12:16].tolist())
+
+        states, observations = env_wrapper.reachable_observations()
+        np.testing.assert_array_equal(observation, observations[states.index(state)])
+        self.assertNotIn((0, 1), [reachable_state.player for reachable_state in states])
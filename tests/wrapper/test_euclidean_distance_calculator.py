@@ -1,6 +1,10 @@
 from unittest import TestCase
 
-from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator
+import numpy as np
+
+from clgridworld.tabular.transition_model import TabularTransitionModel
+from clgridworld.wrapper.euclidean_distance_calculator import EuclideanDistanceCalculator, EuclideanDistanceField
+from tests.state.grid_world_state_builder import GridWorldStateBuilder
 
 
 class TestEuclideanDistanceCalculator(TestCase):
@@ -13,4 +17,76 @@ class TestEuclideanDistanceCalculator(TestCase):
         actual = EuclideanDistanceCalculator.distance(starting_point, ending_point)
 
         expected = 14.14
-        self.assertAlmostEqual(expected, actual, places=2)
\ No newline at end of file
+        self.assertAlmostEqual(expected, actual, places=2)
+
+    def test_distance_should_match_norm_exactly(self):
+
+        for point in [(0, 0), (3, 4), (9, 1), (1, 9), (7, 7)]:
+            with self.subTest(point=point):
+                expected = np.linalg.norm(np.asarray(point) - np.asarray((2, 5)))
+                self.assertEqual(expected, EuclideanDistanceCalculator.distance(point, (2, 5)))
+
+    def test_distances_from_should_match_single_player_distances(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec()
+        players = np.asarray([(0, 0), (1, 4), (9, 9), (6, 5)])
+
+        distances = EuclideanDistanceCalculator(state).distances_from(players)
+
+        for player, player_distances in zip(players, distances):
+            calculator = EuclideanDistanceCalculator(state.copy(player=tuple(player)))
+            expected = [calculator.distance_to_key(), calculator.distance_to_lock(),
+                        calculator.distance_to_closest_beacon()]
+            np.testing.assert_array_equal(expected, player_distances)
+
+    def test_distances_from_without_key_and_pit(self):
+
+        state = GridWorldStateBuilder.create_state_with_spec(key_coords=None, pit_start_coords=None,
+                                                             pit_end_coords=None)
+
+        distances = EuclideanDistanceCalculator(state).distances_from(np.asarray([(4, 5)]))
+
+        np.testing.assert_array_equal([[0, 5, 0]], distances)
+
+
+class TestEuclideanDistanceField(TestCase):
+
+    def test_distances_should_match_calculator_for_reachable_states(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        distance_field = EuclideanDistanceField(initial_state)
+
+        for state in TabularTransitionModel.compile(initial_state).states:
+
+            calculator = EuclideanDistanceCalculator(state)
+            distances = distance_field.distances(state)
+
+            self.assertEqual(calculator.distance_to_key(), distances.key)
+            self.assertEqual(calculator.distance_to_lock(), distances.lock)
+            self.assertEqual(calculator.distance_to_closest_beacon(), distances.closest_beacon)
+
+    def test_distances_from_should_match_single_state_distances(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        distance_field = EuclideanDistanceField(initial_state)
+        players = np.asarray([(0, 0), (1, 4), (9, 9)])
+        key_is_present = np.asarray([True, False, True])
+        lock_is_present = np.asarray([True, True, False])
+
+        distances = distance_field.distances_from(players, key_is_present, lock_is_present)
+
+        for i in range(players.shape[0]):
+            state = initial_state.copy(player=tuple(players[i]),
+                                       key=initial_state.key if key_is_present[i] else None,
+                                       lock=initial_state.lock if lock_is_present[i] else None)
+            np.testing.assert_array_equal(distance_field.distances(state), distances[i])
+
+    def test_shared_should_return_same_field_for_tasks_with_same_items(self):
+
+        initial_state = GridWorldStateBuilder.create_state_with_spec()
+        distance_field = EuclideanDistanceField.shared(initial_state)
+
+        self.assertIs(distance_field, EuclideanDistanceField.shared(initial_state.copy(player=(0, 0))))
+        self.assertIsNot(distance_field, EuclideanDistanceField.shared(initial_state.copy(key=(0, 0))))
+        np.testing.assert_array_equal(EuclideanDistanceField(initial_state).key_distances,
+                                      distance_field.key_distances)
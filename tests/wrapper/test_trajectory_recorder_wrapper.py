@@ -0,0 +1,130 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from clgridworld.action.action import GridWorldAction
+from clgridworld.grid_world_builder import GridWorldBuilder, InitialStateParams
+from clgridworld.state.state_encoder import GridWorldStateEncoder
+from clgridworld.trajectory.trajectory_store import TrajectoryReader
+from clgridworld.wrapper.distance_observation_wrapper import DistanceObservationWrapper
+from clgridworld.wrapper.trajectory_recorder_wrapper import TrajectoryRecorderWrapper
+
+
+class TestTrajectoryRecorderWrapper(TestCase):
+
+    def setUp(self):
+
+        #  target task spec in 'Autonomous Task Sequencing... Narvekar et al 2017'
+        self.params = InitialStateParams(shape=(10, 10), player=(1, 4), key=(7, 5), lock=(1, 1), pit_start=(4, 2),
+                                         pit_end=(4, 7))
+
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_directory.name, "trajectories")
+
+    def tearDown(self):
+        self.temp_directory.cleanup()
+
+    def run_episodes(self, env, encoder, num_episodes, max_steps, rng):
+        """Steps env with random actions and returns the (state id, action, reward, next state id, done) records of
+        each episode."""
+
+        episodes = []
+
+        for _ in range(num_episodes):
+
+            state = env.reset()
+            records = []
+
+            for _ in range(max_steps):
+
+                action = int(rng.randint(len(GridWorldAction.NAMES)))
+                next_state, reward, done, _ = env.step(action)
+                records.append((encoder.encode(state), action, reward, encoder.encode(next_state), done))
+                state = next_state
+
+                if done:
+                    break
+
+            episodes.append(records)
+
+        return episodes
+
+    @staticmethod
+    def recorded_episodes(directory):
+        return [list(zip(episode.states.tolist(), episode.actions.tolist(), episode.rewards.tolist(),
+                         episode.next_states.tolist(), episode.dones.tolist()))
+                for episode in TrajectoryReader(directory).episodes()]
+
+    def test_should_record_every_step_across_chunks(self):
+
+        rng = np.random.RandomState(0)
+
+        for chunk_size in [3, 7, 1000]:
+            with self.subTest(chunk_size=chunk_size):
+
+                directory = os.path.join(self.temp_directory.name, "chunk_size_%d" % chunk_size)
+                env = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), directory, chunk_size)
+                encoder = GridWorldStateEncoder(env.initial_state)
+
+                expected_episodes = self.run_episodes(env, encoder, num_episodes=20, max_steps=30, rng=rng)
+                env.close()
+
+                self.assertEqual(expected_episodes, self.recorded_episodes(directory))
+
+                reader = TrajectoryReader(directory)
+                num_steps = sum(len(records) for records in expected_episodes)
+
+                self.assertEqual(-(-num_steps // chunk_size), reader.num_chunks())
+                self.assertEqual(num_steps, reader.num_steps())
+
+                steps = reader.column("step")
+                episode_ids = reader.column("episode")
+
+                for episode_id, records in enumerate(expected_episodes):
+                    np.testing.assert_array_equal(np.arange(len(records)), steps[episode_ids == episode_id])
+
+    def test_should_append_episodes_to_an_existing_directory(self):
+
+        rng = np.random.RandomState(1)
+
+        env = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), self.directory, chunk_size=5)
+        encoder = GridWorldStateEncoder(env.initial_state)
+        expected_episodes = self.run_episodes(env, encoder, num_episodes=3, max_steps=12, rng=rng)
+        env.close()
+
+        env = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), self.directory, chunk_size=5)
+        self.assertEqual(3, env.writer.next_episode_id)
+
+        # resetting without stepping records nothing
+        env.reset()
+        expected_episodes += self.run_episodes(env, encoder, num_episodes=2, max_steps=12, rng=rng)
+        env.close()
+
+        episode_ids = [episode.episode_id for episode in TrajectoryReader(self.directory).episodes()]
+        self.assertEqual([0, 1, 2, 4, 5], episode_ids)
+        self.assertEqual(expected_episodes, self.recorded_episodes(self.directory))
+
+    def test_should_record_under_observation_wrappers(self):
+
+        env = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), self.directory)
+        env = DistanceObservationWrapper(env)
+
+        env.reset()
+        observation, _, _, _ = env.step(GridWorldAction.EAST)
+        env.close()
+
+        self.assertEqual((17,), observation.shape)
+
+        episode = next(TrajectoryReader(self.directory).episodes())
+
+        # player (1, 4) -> (1, 5), no key, lock present
+        self.assertEqual([(1 * 10 + 4) * 4 + 1], episode.states.tolist())
+        self.assertEqual([(1 * 10 + 5) * 4 + 1], episode.next_states.tolist())
+        self.assertEqual(np.uint16, episode.states.dtype)
+
+    def test_given_step_before_reset_should_throw_error(self):
+
+        env = TrajectoryRecorderWrapper(GridWorldBuilder.create(self.params), self.directory)
+        self.assertRaises(ValueError, env.step, GridWorldAction.EAST)